@@ -0,0 +1,258 @@
+"""
+Batch command line runner: the RHIS evolution and the representative data of
+many files, written as long tables.
+
+    python -m rhis_ts data/*.csv stations.parquet --index DATA --parse-dates \
+        --group-by PONTO --stat mean --workers 4 --output-dir out --format parquet
+
+Each input (and each group of it) is read, evaluated and written before the next
+one, so only one file is in memory at a time. Two tables are written per input:
+
+    <stem>.curves.<format>
+        One row per p-value: group, parameter, direction, position, time, p_value.
+    <stem>.repr.<format>
+        One row per parameter with its representative interval: group, parameter,
+        direction, start, stop (positions, stop excluded), start_time, stop_time, n.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from rhis_ts.evol.rhis import Rhis
+from rhis_ts.utils.data import slice_init
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from pandas import DataFrame
+
+READERS = {
+    '.csv': pd.read_csv,
+    '.parquet': pd.read_parquet,
+    '.pq': pd.read_parquet,
+    '.xlsx': pd.read_excel,
+    '.xls': pd.read_excel,
+}
+FORMATS = ('parquet', 'csv')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='rhis-ts',
+        description='Apply the RHIS evolution to the columns of CSV, Parquet and Excel files.')
+    parser.add_argument('inputs', nargs='+', help='Input files or glob patterns (e.g., "data/**/*.csv").')
+    parser.add_argument('-c', '--cols', nargs='+', help='The columns to analyze (default: every numeric column).')
+    parser.add_argument('--index', help='The column used as the time index (default: the row order).')
+    parser.add_argument('--parse-dates', action='store_true', help='Convert the index column to datetimes.')
+    parser.add_argument('--group-by', help='A column whose values split each file into series analyzed separately.')
+    parser.add_argument('--groups', nargs='+', help='Only these values of the group-by column.')
+    parser.add_argument('--stat', default='mean', choices=['min', 'mean', 'med', 'max'],
+                        help='The statistic of the RHIS p-values (default: mean).')
+    parser.add_argument('--direction', default='ba', choices=['ba', 'fo'],
+                        help='Backward or forward evolution (default: ba).')
+    parser.add_argument('--alpha', type=float, default=0.05, help='The significance level (default: 0.05).')
+    parser.add_argument('--workers', type=int, default=None, help='The columns evaluated concurrently.')
+    parser.add_argument('--executor', choices=['thread', 'process'], default=None,
+                        help='Threads or processes for the workers (default: from the length of the series).')
+    parser.add_argument('--exact', action='store_true', help='Exact p-values for the small slices without ties.')
+    parser.add_argument('-o', '--output-dir', default='.', help='The directory of the output tables (default: .).')
+    parser.add_argument('-f', '--format', default='parquet', choices=FORMATS, help='The output format (default: parquet).')
+
+    return parser
+
+
+def expand_inputs(patterns: Sequence[str]) -> list[Path]:
+    """The files matched by each pattern (or the path itself), in order and without repetitions."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(Path(match) for match in matches)
+
+    return list(dict.fromkeys(paths))
+
+
+def read_table(path: Path) -> DataFrame:
+    """Read a CSV, Parquet or Excel file, by its suffix."""
+    reader = READERS.get(path.suffix.lower())
+    if reader is None:
+        msg = f"The format of '{path}' is not supported. Use one of these: {', '.join(READERS)}."
+        raise ValueError(msg)
+
+    return reader(path)
+
+
+def _series_frames(df: DataFrame, args: argparse.Namespace, path: Path) -> list[tuple[str|None, DataFrame]]:
+    """
+    The (group, dataframe) of each series of a file, with the time index and
+    the selected columns. The columns without any value and the series
+    shorter than their first slice are skipped (and logged).
+    """
+    if args.index is not None:
+        if args.parse_dates:
+            df[args.index] = pd.to_datetime(df[args.index])
+        df = df.set_index(args.index)
+
+    if args.group_by is None:
+        groups = [(None, df)]
+    else:
+        groups = [(str(key), group.drop(columns=args.group_by)) for key, group in df.groupby(args.group_by, sort=False)]
+        if args.groups is not None:
+            groups = [(key, group) for key, group in groups if key in args.groups]
+
+    frames = []
+    for key, group in groups:
+        cols = args.cols if args.cols is not None else list(group.select_dtypes(include='number').columns)
+        missing = [col for col in cols if col not in group.columns]
+        if missing:
+            msg = f"The columns {missing} are not in the file."
+            raise ValueError(msg)
+        label = path if key is None else f'{path} ({args.group_by}={key})'
+        values = group[cols].apply(pd.to_numeric, errors='coerce')
+        empty = [col for col in cols if values[col].isna().all()]
+        if empty:
+            logger.warning(f"{label}: the columns {empty} have no values and are skipped.")
+            values = values.drop(columns=empty)
+        # The tests do not take missing values, so the rows with any are dropped
+        values = values.dropna()
+        if values.shape[1] == 0:
+            logger.warning(f"{label}: skipped, no column to analyze.")
+            continue
+        if len(values) < slice_init(len(values)):
+            logger.warning(
+                f"{label}: skipped, {len(values)} rows without missing values are fewer than "
+                f"the first slice ({slice_init(len(values))}).")
+            continue
+        frames.append((key, values))
+
+    return frames
+
+
+def run_series(df: DataFrame, args: argparse.Namespace) -> tuple[DataFrame, DataFrame]:
+    """
+    Apply Rhis.evol and add_repr_cols_to_df to the columns of one series.
+
+    Return
+    ------
+        The long tables of the p-values and of the representative intervals.
+    """
+    rhis = Rhis(df.copy())
+    evol_df = rhis.evol(
+        stat=args.stat, alpha=args.alpha, direction=args.direction,
+        workers=args.workers, executor=args.executor, exact='auto' if args.exact else False)
+    if evol_df is None:
+        msg = 'The evolution was not run; see the logged error.'
+        raise ValueError(msg)
+    result = rhis.add_repr_cols_to_df(backwards=args.direction == 'ba')
+    if isinstance(result, Exception):
+        raise result
+
+    # One block of rows per curve, in the order of the columns
+    n, n_curves = evol_df.shape
+    curves = pd.DataFrame({
+        'parameter': np.repeat(evol_df.columns.get_level_values(0), n),
+        'direction': np.repeat(evol_df.columns.get_level_values(1), n),
+        'position': np.tile(np.arange(n), n_curves),
+        'time': np.tile(df.index.to_numpy(), n_curves),
+        'p_value': evol_df.to_numpy(dtype=float).T.ravel(),
+        })
+
+    index = df.index
+    intervals = pd.DataFrame([
+        {
+            'parameter': col,
+            'direction': args.direction,
+            'start': start,
+            'stop': stop,
+            'start_time': index[start] if stop > start else None,
+            'stop_time': index[stop - 1] if stop > start else None,
+            'n': stop - start,
+        }
+        for col, (start, stop) in rhis.repr_spans.items()
+        ])
+
+    return curves, intervals
+
+
+def write_table(df: DataFrame, path: Path, fmt: str):
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, index=False)
+
+
+def run_file(path: Path, args: argparse.Namespace) -> tuple[int, int]:
+    """
+    Evaluate every series of a file and write its tables.
+
+    Return
+    ------
+        The number of series and of points evaluated.
+    """
+    curves, intervals = [], []
+    n_series = n_points = 0
+    for key, df in _series_frames(read_table(path), args, path):
+        series_curves, series_intervals = run_series(df, args)
+        series_curves.insert(0, 'group', key)
+        series_intervals.insert(0, 'group', key)
+        curves.append(series_curves)
+        intervals.append(series_intervals)
+        n_series += df.shape[1]
+        n_points += df.size
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if curves:
+        write_table(pd.concat(curves, ignore_index=True), output_dir / f'{path.stem}.curves.{args.format}', args.format)
+        write_table(pd.concat(intervals, ignore_index=True), output_dir / f'{path.stem}.repr.{args.format}', args.format)
+
+    return n_series, n_points
+
+
+def main(argv: Sequence[str]|None=None) -> int:
+    """
+    Run the batch over the inputs of the command line (or argv).
+
+    Return
+    ------
+        0 if every file was processed, 1 otherwise (the failures are logged and
+        the other files are still processed).
+    """
+    args = build_parser().parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        logger.error("No input file matches the given patterns.")
+        return 1
+
+    failed = 0
+    total_series = total_points = 0
+    start = time.perf_counter()
+    for k, path in enumerate(paths, start=1):
+        file_start = time.perf_counter()
+        try:
+            n_series, n_points = run_file(path, args)
+        # Any failure of one input is logged, and the other inputs are still processed
+        except Exception as exc:  # noqa: BLE001
+            failed += 1
+            logger.error(f"[{k}/{len(paths)}] {path}: {exc}")
+            continue
+        elapsed = time.perf_counter() - file_start
+        total_series += n_series
+        total_points += n_points
+        logger.info(
+            f"[{k}/{len(paths)}] {path}: {n_series} series, {n_points} points in {elapsed:.2f} s "
+            f"({n_points / max(elapsed, 1e-9):.0f} points/s)")
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Done: {len(paths) - failed}/{len(paths)} files, {total_series} series, {total_points} points "
+        f"in {elapsed:.2f} s ({total_points / max(elapsed, 1e-9):.0f} points/s)")
+
+    return 1 if failed else 0
@@ -1,5 +1,20 @@
 from __future__ import annotations
 
-from rhis_ts.evol.methods.raw_evol import rhis_evol_raw
-from rhis_ts.evol.methods.repr_slice import repr_slice_idxs
-from rhis_ts.evol.methods.standard_evol import rhis_standard_evol
+from rhis_ts.evol.methods.online_evol import RhisIncremental
+from rhis_ts.evol.methods.raw_evol import rhis_evol_raw, rhis_window_raw
+from rhis_ts.evol.methods.repr_slice import (
+    repr_slice_idxs,
+    repr_slice_idxs_from_curve,
+    repr_slice_idxs_from_run,
+    repr_slice_idxs_lazy,
+    trailing_rejected,
+)
+from rhis_ts.evol.methods.standard_evol import (
+    STAT_FUNCS,
+    Curve,
+    pad_curve,
+    rhis_standard_evol,
+    rhis_standard_evol_both,
+    rhis_standard_from_raw,
+    rhis_standard_window,
+)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from rhis_ts.stats.hypothesis.homogeneity import MannWhitneyIncremental, mann_whitney_p_values
+from rhis_ts.stats.hypothesis.independence import WaldWolfowitzIncremental
+from rhis_ts.stats.hypothesis.randomness import WallisMooreIncremental, wallismoore_p_values
+from rhis_ts.stats.hypothesis.stationarity import MannKendallIncremental, mann_kendall_p_values
+from rhis_ts.stats.utils.order_stats import ValueCounter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class RhisIncremental:
+    """
+    Running state of the four RHIS tests for a series that grows one
+    observation at a time (forward evolution).
+
+    Randomness and independence are updated in O(1), homogeneity and
+    stationarity by bisection over the values seen so far, so the history is
+    never re-tested. The p-values match rhis_evol_raw for the same prefixes.
+
+    Parameters
+    ----------
+        sli_init
+            The number of elements of the first prefix with p-values.
+        exact
+            If 'auto' (or True), the small prefixes without ties get exact
+            p-values, as in rhis_evol_raw.
+    """
+
+    def __init__(self, sli_init: int,*, exact: bool|str=False):
+        self.sli_init = sli_init
+        self.exact = exact
+        self.n = 0
+        self.first = None
+        self.constant = True
+        self.r = WallisMooreIncremental()
+        self.h = MannWhitneyIncremental(ValueCounter(), ValueCounter())
+        self.i = WaldWolfowitzIncremental()
+        self.s = MannKendallIncremental(ValueCounter())
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, sli_init: int,*, exact: bool|str=False) -> RhisIncremental:
+        """
+        The state after appending the given values, computed at once
+        (O(n log n) with NumPy) instead of one observation at a time.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        state = cls(sli_init, exact=exact)
+        state.n = len(values)
+        if state.n:
+            state.first = float(values[0])
+            state.constant = bool(np.all(values == values[0]))
+        state.r = WallisMooreIncremental.from_values(values)
+        state.h = MannWhitneyIncremental.from_values(values)
+        state.i = WaldWolfowitzIncremental.from_values(values)
+        state.s = MannKendallIncremental.from_values(values)
+        return state
+
+    def append(self, value: float) -> dict[float] | None:
+        """
+        Add an observation to the end of the series.
+
+        Return
+        ------
+            A dict with the p-values (not rounded, as in rhis_evol_raw) of each
+            hypothesis for the series so far, or None if it has fewer than
+            sli_init elements.
+        """
+        value = float(value)
+        if self.n == 0:
+            self.first = value
+        self.constant = self.constant and value == self.first
+        self.n += 1
+
+        for state in (self.r, self.h, self.i, self.s):
+            state.append(value)
+
+        if self.n < self.sli_init:
+            return None
+
+        return {hyp: float(p) for hyp, p in self.p_values().items()}
+
+    def extend(self, values: Iterable[float]) -> list[dict[float] | None]:
+        """Add many observations, returning the p-values after each one."""
+        return [self.append(value) for value in values]
+
+    def p_values(self) -> dict[float]:
+        """The p-values (not rounded) of each hypothesis for the series so far."""
+        n = float(self.n)
+        n1 = self.h.first.total
+        p_h = mann_whitney_p_values(self.h.u_first, n1, n - n1, self.h.ties_sum, exact=self.exact)
+        p_r = wallismoore_p_values(self.r.statistic, n, exact=self.exact, zero_diffs=self.r.zero_diffs)
+
+        return {
+            'R': 0. if self.constant else p_r,
+            'H': 1. if self.constant else p_h,
+            'I': self.i.p_value(constant=self.constant),
+            'S': mann_kendall_p_values(np.float64(self.s.statistic), n, self.s.ties_factor, exact=self.exact),
+        }
@@ -2,22 +2,53 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from rhis_ts.stats.utils.rhis import calculate_rhis
-from rhis_ts.utils.data import slices_to_evol
+from rhis_ts.stats.hypothesis import (
+    mann_kendall_evol,
+    mann_kendall_window,
+    mann_whitney_evol,
+    mann_whitney_window,
+    wald_wolfowitz_evol,
+    wald_wolfowitz_window,
+    wallismoore_evol,
+    wallismoore_window,
+)
+from rhis_ts.utils.profiling import stage
 
 if TYPE_CHECKING:
     import numpy as np
 
 
-def rhis_evol_raw(ts: np.ndarray, alpha: float, sli_init: int) -> dict[list[float]]:
-    slices = slices_to_evol(ts, sli_init)
-    evol = {'R': [], 'H': [], 'I': [], 'S': []}
+def rhis_evol_raw(ts: np.ndarray, alpha: float, sli_init: int, ranks: np.ndarray|None=None,*,  # noqa: ARG001
+                  exact: bool|str=False) -> dict[np.ndarray]:
+    """
+    The p-values of every hypothesis for every slice, not rounded, so the
+    strongly rejected slices (p-values below 5e-5) are still ordered when a
+    stat combines them; the single tests report 4 decimals.
+    """
+    # Every hypothesis is computed for all slices at once instead of re-testing every slice
+    ps = {}
+    with stage('R'):
+        ps['R'] = wallismoore_evol(ts, sli_init, exact=exact).p_value
+    with stage('H'):
+        ps['H'] = mann_whitney_evol(ts, sli_init, ranks=ranks, exact=exact)
+    with stage('I'):
+        ps['I'] = wald_wolfowitz_evol(ts, sli_init)
+    with stage('S'):
+        ps['S'] = mann_kendall_evol(ts, sli_init, ranks=ranks, exact=exact)
 
-    for sli in slices:
-        r, h, i, s = calculate_rhis(sli, alpha, min=False)
-        evol['R'].append(r)
-        evol['H'].append(h)
-        evol['I'].append(i)
-        evol['S'].append(s)
+    return ps
 
-    return evol
+
+def rhis_window_raw(ts: np.ndarray, window: int) -> dict[np.ndarray]:
+    # Each window adds the newest observation and removes the oldest one instead of re-testing it
+    ps = {}
+    with stage('R'):
+        ps['R'] = wallismoore_window(ts, window).p_value
+    with stage('H'):
+        ps['H'] = mann_whitney_window(ts, window)
+    with stage('I'):
+        ps['I'] = wald_wolfowitz_window(ts, window)
+    with stage('S'):
+        ps['S'] = mann_kendall_window(ts, window)
+
+    return ps
@@ -3,11 +3,22 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import numpy as np
+
+from rhis_ts.evol.methods.raw_evol import rhis_evol_raw
+from rhis_ts.evol.methods.standard_evol import STAT_FUNCS, Curve
 from rhis_ts.evol.utils.ba_fo import idx_of_last_not_rejected
+from rhis_ts.stats.hypothesis import mann_whitney_evol, wald_wolfowitz_evol, wallismoore_evol
+from rhis_ts.stats.hypothesis.stationarity import mann_kendall_p_values
+from rhis_ts.stats.utils.order_stats import count_inversions
+from rhis_ts.stats.utils.ranks import rank_ties
 from rhis_ts.utils.arrays import nans_nums_from_array
 
 if TYPE_CHECKING:
-    import numpy as np
+    from collections.abc import Iterator
+
+# Slices tested one by one before the rest of the curve is computed at once
+REPR_PROBES = 4
 
 
 def repr_slice_idxs(ps: np.ndarray[float], alpha: float, sli_init: int, direction: str) -> tuple[int]:
@@ -19,3 +30,135 @@ def repr_slice_idxs(ps: np.ndarray[float], alpha: float, sli_init: int, directio
 
     return idx_of_last_not_rejected(alpha, ps_nums, direction, sli_init), ps_last
 
+
+def repr_slice_idxs_from_curve(curve: Curve, alpha: float, sli_init: int, direction: str) -> tuple[int]:
+    """repr_slice_idxs of a curve stored without its NaN padding (see Curve)."""
+    ps_last = len(curve.values) + sli_init - 1
+    if curve.offset == 0 and len(curve.values) and curve.values[0] >= alpha:
+        return (0, ps_last)
+
+    return idx_of_last_not_rejected(alpha, curve.values, direction, sli_init), ps_last
+
+
+def trailing_rejected(ps: np.ndarray, alpha: float) -> int:
+    """The number of p-values at the end of ps that are rejected (lower than or equal to alpha)."""
+    not_rejected = np.flatnonzero(~(np.asarray(ps) <= alpha))
+    return len(ps) if not len(not_rejected) else len(ps) - 1 - int(not_rejected[-1])
+
+
+def repr_slice_idxs_from_run(run: int, length: int, sli_init: int) -> tuple[int]:
+    """
+    repr_slice_idxs_from_curve of a forward curve with length p-values, the
+    last run of them rejected (see trailing_rejected). A stream keeps run up
+    to date in O(1) per p-value, so the boundary is never searched again.
+    """
+    idx = min(run, length - 1)
+    start = length - idx + sli_init - 1 if idx > 0 else 0
+
+    return start, length + sli_init - 1
+
+
+def _iter_slice_p_values(ts: np.ndarray, probes: int, stat: str,*, exact: bool|str=False) -> Iterator[float]:
+    """
+    Yield the stat of the RHIS p-values of the prefixes of ts with n, n - 1, ...
+    elements, equal to their points of the evolution curve.
+
+    The Mann-Kendall S and ties factor of the complete series are updated in
+    O(n) for each removed last element, instead of sorting every prefix again.
+    """
+    n = len(ts)
+    rt = rank_ties(ts, indexes=False)
+    t = rt.ties_groups_count.astype(np.int64)
+    test_s = n * (n - 1) // 2 - int(np.sum(t * (t - 1) // 2)) - 2 * count_inversions(rt.groups)
+    ties_factor = int(np.sum(t * (t - 1) * (2 * t + 5)))
+
+    for k in range(probes):
+        m = n - k
+        if k > 0:
+            last, others = ts[m], ts[:m]
+            less = int(np.count_nonzero(others < last))
+            equal = int(np.count_nonzero(others == last))
+            test_s -= less - (m - less - equal)
+            # t(t - 1)(2t + 5) shrinks by 6t(t + 2) when a tie group goes from t + 1 to t
+            ties_factor -= 6 * equal * (equal + 2)
+
+        # The evolution of the prefix from its own length is its single point, not rounded
+        prefix = ts[:m]
+        ps = [
+            wallismoore_evol(prefix, m, exact=exact).p_value[0],
+            mann_whitney_evol(prefix, m, exact=exact)[0],
+            wald_wolfowitz_evol(prefix, m)[0],
+            float(mann_kendall_p_values(test_s, m, ties_factor, exact=exact)),
+        ]
+        yield float(STAT_FUNCS[stat](ps))
+
+
+def _repr_bounds(k: int, n: int, direction: str) -> tuple[int]:
+    """The (start, end) of repr_slice_idxs when the k-th longest slice is the first not rejected."""
+    if direction == 'fo' and k > 0:
+        return n - k, n
+    return k, n
+
+
+def repr_slice_idxs_lazy(  # noqa: PLR0913
+        ts: np.ndarray,
+        alpha: float,
+        sli_init: int,
+        stat: str,
+        direction: str,*,
+        exact: bool|str=False,
+        probes: int=REPR_PROBES,
+        ) -> tuple[int]:
+    """
+    Find the same (start, end) as repr_slice_idxs over the stat evolution of a
+    series, without computing the whole evolution first.
+
+    The slices are scanned from the longest (the far end of the curve) and the
+    search stops at the first one that is not rejected. The first probes
+    slices are tested one by one, each at the cost of a single call of the
+    tests (Mann-Kendall is updated from the previous slice). If all of them are rejected, the curve of the remaining (shorter)
+    slices is computed at once by the vectorized engines.
+
+    Parameters
+    ----------
+        ts
+            The time series, in the original order.
+        alpha
+            The significance level.
+        sli_init
+            The number of elements of the shortest slice.
+        stat
+            One of ['min', 'mean', 'med', 'max'].
+        direction
+            'ba' (slices growing from the end) or 'fo' (from the start).
+        exact
+            If 'auto' (or True), the small slices get exact p-values.
+        probes
+            The maximum number of slices tested one by one.
+
+    Return
+    ------
+        A tuple with the start and the end of the representative slice.
+    """
+    ts = np.asarray(ts, dtype=float)
+    n = len(ts)
+    n_slices = n - sli_init + 1
+    if n_slices <= 0:
+        return 0, n
+
+    # The k-th longest slice is the prefix with n - k elements of the series in the direction of the growth
+    ts_bafo = ts[::-1] if direction == 'ba' else ts
+    for k, p in enumerate(_iter_slice_p_values(ts_bafo, min(probes, n_slices), stat, exact=exact)):
+        if k == 0 and direction == 'ba' and p >= alpha:
+            return 0, n
+        if p > alpha:
+            return _repr_bounds(k, n, direction)
+    if probes >= n_slices:
+        return _repr_bounds(n_slices - 1, n, direction)
+
+    raw = rhis_evol_raw(ts_bafo[:n - probes], alpha, sli_init, exact=exact)
+    ps = STAT_FUNCS[stat](list(raw.values()), axis=0)[::-1]
+    not_rejected = np.flatnonzero(ps > alpha)
+    k = probes + (not_rejected[0] if len(not_rejected) else len(ps) - 1)
+
+    return _repr_bounds(int(k), n, direction)
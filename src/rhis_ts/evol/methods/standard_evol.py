@@ -1,22 +1,103 @@
 from __future__ import annotations
 
+from collections import namedtuple
+
 import numpy as np
 
-from rhis_ts.evol.methods import rhis_evol_raw
+from rhis_ts.evol.methods.raw_evol import rhis_evol_raw, rhis_window_raw
+from rhis_ts.stats.utils.ranks import rank_ties
+from rhis_ts.utils.profiling import stage
+
+STAT_FUNCS = {'min': np.min, 'mean': np.mean, 'med': np.median, 'max': np.max}
+
+# The p-values of a curve without its NaN padding: values[i] is at position offset + i of the series
+Curve = namedtuple('Curve', ['offset', 'values'])  # noqa: PYI024
+
+
+def pad_curve(curve: Curve, n: int) -> np.ndarray:
+    """The curve at the positions of a series with n elements, with NaN where it has no p-value."""
+    full = np.full(n, np.nan)
+    full[curve.offset:curve.offset + len(curve.values)] = curve.values
+    return full
+
+
+def _place_curves(evol: dict[np.ndarray], offset: int, n: int, stat: str|None,*, compact: bool) \
+    -> np.ndarray | Curve | dict[np.ndarray | Curve]:
+    with stage('place'):
+        if stat is not None:
+            evol = {None: STAT_FUNCS[stat](list(evol.values()), axis=0, keepdims=True).ravel()}
+        placed = {hyp: Curve(offset, ps) if compact else pad_curve(Curve(offset, ps), n) for hyp, ps in evol.items()}
+
+    return placed[None] if stat is not None else placed
+
+
+def rhis_standard_evol(  # noqa: PLR0913
+        ts: np.ndarray,
+        alpha: float,
+        sli_init: int,
+        stat: str|None,*,
+        backwards: bool=False,
+        ranks: np.ndarray|None=None,
+        exact: bool|str=False,
+        compact: bool=False,
+        ) -> np.ndarray | Curve | dict[np.ndarray | Curve]:
+    evol = rhis_evol_raw(ts, alpha, sli_init, ranks, exact=exact)
+
+    return rhis_standard_from_raw(evol, len(ts), sli_init, stat, backwards=backwards, compact=compact)
+
+
+def rhis_standard_from_raw(  # noqa: PLR0913
+        evol: dict[np.ndarray],
+        n: int,
+        sli_init: int,
+        stat: str|None,*,
+        backwards: bool=False,
+        compact: bool=False,
+        ) -> np.ndarray | Curve | dict[np.ndarray | Curve]:
+    """
+    Place the raw p-values of each slice (from rhis_evol_raw) at the positions
+    of a series with n elements, and apply stat to them, if given.
+
+    With compact, each curve is returned as a Curve, without the NaN padding.
+    """
+    # The first sli_init - 1 positions (the last ones if backwards) have no slice to be tested
+    if backwards:
+        evol = {hyp: ps[::-1] for hyp, ps in evol.items()}
+
+    return _place_curves(evol, 0 if backwards else sli_init - 1, n, stat, compact=compact)
+
 
+def rhis_standard_evol_both(  # noqa: PLR0913
+        ts: np.ndarray,
+        alpha: float,
+        sli_init: int,
+        stat: str|None,*,
+        exact: bool|str=False,
+        compact: bool=False,
+        ) -> dict[np.ndarray | Curve | dict[np.ndarray | Curve]]:
+    """
+    Generate the backward ('ba') and forward ('fo') evolution of a series (in
+    the original order) together.
 
-def rhis_standard_evol(ts: np.ndarray, alpha: float, sli_init: int, stat: str|None,*, backwards: bool=False) \
-    -> list[float] | dict[list[float]]:
-    evol = rhis_evol_raw(ts, alpha, sli_init)
-    fill = np.full(sli_init - 1, np.nan)
+    The series is sorted and ranked once, and the backward evolution reuses
+    the ranks reversed.
+    """
+    ranks = rank_ties(ts, indexes=False).groups
 
-    for hyp, ps in evol.items():
-        evol[hyp] = np.append(ps[::-1], fill) if backwards else np.append(fill, ps)
+    return {
+        'ba': rhis_standard_evol(
+            ts[::-1], alpha, sli_init, stat, backwards=True, ranks=ranks[::-1], exact=exact, compact=compact),
+        'fo': rhis_standard_evol(ts, alpha, sli_init, stat, backwards=False, ranks=ranks, exact=exact, compact=compact),
+    }
 
-    if stat is None:
-        return evol
 
-    stat_funcs = {'min': np.min, 'mean': np.mean, 'med': np.median, 'max': np.max}
-    evol = stat_funcs[stat](list(evol.values()), axis=0, keepdims=True).ravel()
+def rhis_standard_window(ts: np.ndarray, window: int, stat: str|None,*, compact: bool=False) \
+    -> np.ndarray | Curve | dict[np.ndarray | Curve]:
+    """
+    Generate the evolution of the RHIS tests over a sliding window ('wi'). Each
+    position holds the p-values of the window that ends there, so the first
+    window - 1 positions have none.
+    """
+    evol = rhis_window_raw(ts, window)
 
-    return evol
+    return _place_curves(evol, window - 1, len(ts), stat, compact=compact)
@@ -0,0 +1,58 @@
+"""
+Decimation of long series for plotting: only the minimum and the maximum of
+the points that fall on each pixel column of the figure are drawn, which looks
+the same as drawing every point.
+"""
+from __future__ import annotations
+
+import numpy as np
+from matplotlib import rcParams
+
+
+def pixel_width(figsize: tuple[float]|None=None, dpi: float|None=None) -> int:
+    """The width in pixels of a figure with figsize (or the default one)."""
+    width = (figsize if figsize is not None else rcParams['figure.figsize'])[0]
+    return int(width * (dpi if dpi is not None else rcParams['figure.dpi']))
+
+
+def minmax_idxs(values: np.ndarray, bins: int|None) -> np.ndarray:
+    """
+    The positions of the minimum and the maximum of each of bins consecutive
+    blocks of values (NaN ignored), and of the first and last values and the
+    first and last non-NaN ones. If bins is None or there are no more than two
+    values per bin, every position.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if bins is None or n <= 2 * bins:
+        return np.arange(n)
+
+    size = -(-n // bins)
+    blocks = np.full(size * bins, np.nan)
+    blocks[:n] = values
+    blocks = blocks.reshape(bins, size)
+    finite = ~np.isnan(blocks)
+    has_values = finite.any(axis=1)
+    starts = np.arange(bins) * size
+    lows = np.where(finite, blocks, np.inf).argmin(axis=1) + starts
+    highs = np.where(finite, blocks, -np.inf).argmax(axis=1) + starts
+
+    finite_idxs = np.flatnonzero(~np.isnan(values))
+    ends = [0, n - 1] if not finite_idxs.size else [0, n - 1, finite_idxs[0], finite_idxs[-1]]
+
+    return np.unique(np.concatenate([lows[has_values], highs[has_values], ends]))
+
+
+def alpha_crossings(ps: np.ndarray, alpha: float) -> np.ndarray:
+    """The positions on both sides of each crossing of alpha by a p-value curve."""
+    ps = np.asarray(ps, dtype=float)
+    rejected = ps <= alpha
+    valid = ~np.isnan(ps)
+    crossings = np.flatnonzero((rejected[1:] != rejected[:-1]) & valid[1:] & valid[:-1])
+
+    return np.concatenate([crossings, crossings + 1])
+
+
+def decimate_idxs(values: np.ndarray, bins: int|None, keep: np.ndarray|list[int]=()) -> np.ndarray:
+    """The positions of minmax_idxs plus the ones in keep, which are always drawn, sorted."""
+    return np.union1d(minmax_idxs(values, bins), np.asarray(keep, dtype=np.int64))
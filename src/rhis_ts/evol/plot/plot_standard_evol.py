@@ -4,9 +4,27 @@ from typing import TYPE_CHECKING
 
 import matplotlib.pyplot as plt
 
+from rhis_ts.evol.plot.decimate import alpha_crossings, decimate_idxs
+
 if TYPE_CHECKING:
+    import numpy as np
     from matplotlib.axes import Axes
-    from pandas import DataFrame
+    from pandas import DataFrame, Series
+
+
+def decimate_series(series: Series, bins: int|None, keep: list[int]|np.ndarray=()) -> Series:
+    """The points of series drawn with bins pixel columns (see decimate_idxs), or all of them if bins is None."""
+    if bins is None:
+        return series
+    return series.iloc[decimate_idxs(series.to_numpy(dtype=float), bins, keep)]
+
+
+def decimate_curve(series: Series, bins: int|None, alpha: float|None) -> Series:
+    """A p-value curve decimated as decimate_series, keeping both sides of every crossing of alpha."""
+    if bins is None:
+        return series
+    keep = alpha_crossings(series.to_numpy(dtype=float), alpha) if alpha is not None else ()
+    return decimate_series(series, bins, keep)
 
 
 def plot_rhis_evol(  # noqa: PLR0913
@@ -19,7 +37,15 @@ def plot_rhis_evol(  # noqa: PLR0913
         rhis_params: dict[str|int]|None=None,
         rhis_stat_params: dict[str|int]|None=None,*,
         rhis: bool=False,
+        ax: Axes|None=None,
+        bins: int|None=None,
+        alpha: float|None=None,
         ) -> Axes:
+    """
+    Plot the p-value curves of a column. With bins (the pixel width of the
+    figure), only the minimum and maximum p-values of each pixel column and
+    both sides of every crossing of alpha are drawn.
+    """
     if rhis_params is None:
         rhis_params = {}
     if rhis_stat_params is None:
@@ -28,14 +54,16 @@ def plot_rhis_evol(  # noqa: PLR0913
         hypos = ['R', 'H', 'I', 'S']
         colors_default = {'R': 'm', 'H': 'c', 'I': 'r', 'S': 'b'}
         for i in range(len(hypos)):
-            ax = evol_df_rhis[(col_name, direction, hypos[i])].plot(
+            ax = decimate_curve(evol_df_rhis[(col_name, direction, hypos[i])], bins, alpha).plot(
+                ax=ax,
                 figsize=figsize,
                 color=rhis_params.get('colors', colors_default)[hypos[i]],
                 alpha=rhis_params.get('alpha', 0.4),
                 linestyle=rhis_params.get('linestyle', '-'),
                 linewidth=rhis_params.get('linewidth', 1))
     else:
-        ax = evol_df[(col_name, direction)].plot(
+        ax = decimate_curve(evol_df[(col_name, direction)], bins, alpha).plot(
+            ax=ax,
             figsize=figsize,
             color=rhis_stat_params.get('color', 'b'),
             alpha=rhis_stat_params.get('alpha', 1),
@@ -54,16 +82,25 @@ def plot_data(  # noqa: PLR0913
         ylabel: str|None=None,
         data_params: dict[str|int]|None=None,
         repr_params: dict[str|int]|None=None,*,
-        show_repr: bool=True
+        show_repr: bool=True,
+        repr_span: tuple[int]|None=None,
+        bins: int|None=None
         ) -> Axes:
+    """
+    Scatter the data of a column and its representative data on a twin axis of
+    evol_ax. With bins, both are decimated as the p-value curves, keeping the
+    boundaries of the representative period.
+    """
     if data_params is None:
         data_params = {}
     if repr_params is None:
         repr_params = {}
     data_ax = evol_ax.twinx()
+    repr_bounds = [repr_span[0], repr_span[1] - 1] if repr_span is not None and repr_span[1] > repr_span[0] else []
+    data = decimate_series(orig_df[col_name], bins, repr_bounds)
     data_ax.scatter(
-        x=orig_df.index,
-        y=orig_df[col_name],
+        x=data.index,
+        y=data,
         label=col_name,
         marker=data_params.get('marker', 'o'),
         color=data_params.get('color', 'none'),
@@ -72,9 +109,12 @@ def plot_data(  # noqa: PLR0913
         alpha=data_params.get('alpha', 1),
         s=data_params.get('s', 70))
     if show_repr:
+        # Only the representative positions are drawn, if known, instead of the NaN padded column
+        repr_df = orig_df[col_name + '_repr'] if repr_span is None else orig_df[col_name].iloc[repr_span[0]:repr_span[1]]
+        repr_df = decimate_series(repr_df, bins)
         data_ax.scatter(
-            x=orig_df.index,
-            y=orig_df[col_name + '_repr'],
+            x=repr_df.index,
+            y=repr_df,
             label=col_name + '_repr',
             marker=repr_params.get('marker', 'o'),
             color=repr_params.get('color', 'none'),
@@ -87,14 +127,14 @@ def plot_data(  # noqa: PLR0913
     return data_ax
 
 
-def finalize_plot(  # noqa: PLR0913
+def decorate_plot(
         evol_ax: Axes,
         data_ax: Axes,
         alpha: float,
         figtitle: str|None=None,
         alpha_line_params: dict[str|int]|None=None,
-        savefig_path: str|None=None
         ):
+    """Add the alpha line, the labels, the legend and the title, without showing or saving the figure."""
     if alpha_line_params is None:
         alpha_line_params = {}
 
@@ -116,8 +156,22 @@ def finalize_plot(  # noqa: PLR0913
     data_ax.legend(lines1 + lines2, labels1 + labels2)
 
     if figtitle:
-        plt.title(figtitle, loc='left', fontsize=11)
-    plt.tight_layout()
+        data_ax.set_title(figtitle, loc='left', fontsize=11)
+    evol_ax.figure.tight_layout()
+
+
+def finalize_plot(  # noqa: PLR0913
+        evol_ax: Axes,
+        data_ax: Axes,
+        alpha: float,
+        figtitle: str|None=None,
+        alpha_line_params: dict[str|int]|None=None,
+        savefig_path: str|None=None
+        ):
+    decorate_plot(evol_ax, data_ax, alpha, figtitle, alpha_line_params)
+    fig = evol_ax.figure
     if savefig_path is not None:
-        plt.savefig(savefig_path)
+        fig.savefig(savefig_path)
     plt.show()
+    # Closed once shown, so the figures of many columns are not kept by pyplot
+    plt.close(fig)
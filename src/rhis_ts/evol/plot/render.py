@@ -0,0 +1,119 @@
+"""
+Headless rendering of the plots of many columns straight to files, with the
+Agg backend and without pyplot, so no GUI is needed and no figure is kept.
+"""
+from __future__ import annotations
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from rhis_ts.evol.plot.decimate import pixel_width
+from rhis_ts.evol.plot.plot_standard_evol import decorate_plot, plot_data, plot_rhis_evol
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# The data of the plot of one column: evol_df, evol_df_rhis and orig_df hold only its columns
+ColPlot = namedtuple('ColPlot', ['col', 'evol_df', 'evol_df_rhis', 'orig_df', 'repr_span', 'path'])  # noqa: PYI024
+
+
+def new_figure(figsize: tuple[int]|None=None) -> Figure:
+    """A figure drawn by the Agg canvas, not registered with pyplot."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def draw_col(fig: Figure, plot: ColPlot, options: dict):
+    """
+    Draw the plot of one column on fig, cleared first, so one figure is reused
+    for every column.
+
+    Parameters
+    ----------
+        fig
+            The figure.
+        plot
+            The data of the column.
+        options
+            The options of Rhis.plot: direction, alpha, rhis, show_repr, decimate and
+            its kwargs (xlabel, ylabel, figtitle and the params dicts).
+    """
+    fig.clear()
+    bins = pixel_width(fig.get_size_inches(), fig.dpi) if options.get('decimate', True) else None
+    evol_ax = plot_rhis_evol(
+        plot.col,
+        plot.evol_df,
+        plot.evol_df_rhis,
+        options['direction'],
+        None,
+        options.get('xlabel'),
+        options.get('rhis_params'),
+        options.get('rhis_stat_params'),
+        rhis=options.get('rhis', False),
+        ax=fig.add_subplot(),
+        bins=bins,
+        alpha=options['alpha']
+        )
+    data_ax = plot_data(
+        evol_ax,
+        plot.col,
+        plot.orig_df,
+        options.get('ylabel'),
+        options.get('data_params'),
+        options.get('repr_params'),
+        show_repr=options.get('show_repr', True),
+        repr_span=plot.repr_span,
+        bins=bins
+        )
+    decorate_plot(evol_ax, data_ax, options['alpha'], options.get('figtitle'), options.get('alpha_line_params'))
+
+
+def render_files(plots: Sequence[ColPlot], options: dict) -> list[str]:
+    """Render each plot to its path (the format from the suffix), reusing one figure."""
+    fig = new_figure(options.get('figsize'))
+    for plot in plots:
+        draw_col(fig, plot, options)
+        fig.savefig(plot.path)
+    fig.clear()
+
+    return [plot.path for plot in plots]
+
+
+def render_pdf(plots: Sequence[ColPlot], options: dict, path: str) -> str:
+    """Render the plots as the pages of one PDF, in order, reusing one figure."""
+    fig = new_figure(options.get('figsize'))
+    with PdfPages(path) as pdf:
+        for plot in plots:
+            draw_col(fig, plot, options)
+            pdf.savefig(fig)
+    fig.clear()
+
+    return path
+
+
+def render_parallel(plots: Sequence[ColPlot], options: dict, workers: int|None) -> list[str]:
+    """
+    Render each plot to its path in a pool of processes. Each process receives
+    an equal share of the columns and reuses one figure for all of them. If
+    workers is None or 1, the plots are rendered in this process.
+
+    Return
+    ------
+        The paths of the files, in the order of the plots.
+    """
+    plots = list(plots)
+    if workers is None or workers <= 1 or len(plots) <= 1:
+        return render_files(plots, options)
+
+    workers = min(workers, len(plots))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # The results are consumed so the errors of the workers are raised here
+        list(pool.map(render_files, [plots[k::workers] for k in range(workers)], [options] * workers))
+
+    return [plot.path for plot in plots]
@@ -1,28 +1,46 @@
 from __future__ import annotations
 
+from contextlib import nullcontext
 from typing import TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 from pandas import DataFrame
 
 from rhis_ts.evol.exc import EvolDirectionError, EvolNotRunInDirectionError, EvolRunMissingError, PlotEvolError
-from rhis_ts.evol.methods import repr_slice_idxs, rhis_standard_evol
-from rhis_ts.evol.plot.plot_standard_evol import finalize_plot, plot_data, plot_rhis_evol
-from rhis_ts.evol.utils.dataframe import build_init_evol_df, insert_repr_in_df_from_idx
+from rhis_ts.evol.methods import (
+    STAT_FUNCS,
+    Curve,
+    RhisIncremental,
+    repr_slice_idxs_from_curve,
+    repr_slice_idxs_from_run,
+    repr_slice_idxs_lazy,
+    trailing_rejected,
+)
+from rhis_ts.evol.utils.cache import cached_col_evol
+from rhis_ts.evol.utils.cube import HYPS, EvolCube, evol_keys
+from rhis_ts.evol.utils.dataframe import insert_repr_in_df_from_idx
+from rhis_ts.evol.utils.parallel import col_evol, cols_evol_parallel, series_evol_parallel
 from rhis_ts.evol.validators import validate_evol_params, validate_plot_params
 from rhis_ts.utils.data import slice_init
+from rhis_ts.utils.profiling import Profiler, active_profiler, profile_column, stage
 
 if TYPE_CHECKING:
-    from pandas import Series
+    from pandas import Index, Series
+
+    from rhis_ts.evol.utils.cache import EvolCache
 
 
 class Rhis:
-    def __init__(self, df):
+    def __init__(self, df, cache: EvolCache|None=None):
         self.alpha = 0.05
         self.rhis = None
         self.stat = None
         self.backwards = True
+        self.direction = 'ba'
+        self.window = None
+        self.exact = False
 
         if (not isinstance(df, pd.DataFrame)
             or isinstance(df.index, pd.MultiIndex)
@@ -33,17 +51,183 @@ class Rhis:
 
         self.orig_df = df
 
-        self.evol_df = None
-        self.evol_df_rhis = None
+        # The p-values are kept in cubes; the dataframes are only built when accessed
+        self.evol_cube = None
+        self.evol_df_stat = None
+        self.evol_cube_rhis = None
         self.slice_init = slice_init(len(self.orig_df))
+        self._streams = {}
+        # The rejected p-values at the end of the forward curve of each column with representative data
+        self._repr_runs = {}
+        # The (start, stop) positions of the representative data of each column
+        self.repr_spans = {}
+        # The direction ('ba' or 'fo') of the curve of each span
+        self.repr_directions = {}
+        # Opt-in persistent cache of the raw p-values of the evolution of each column
+        self.cache = cache
+        self.profile_report = None
+
+
+    @property
+    def orig_df(self) -> DataFrame:
+        """
+        The original dataframe. The rows added by append and their
+        representative data are only written to it when it is accessed.
+        """
+        if self._appended:
+            self._orig_df = pd.concat([self._orig_df, *self._appended])
+            self._appended = []
+        while self._stale_repr:
+            col = self._stale_repr.pop()
+            insert_repr_in_df_from_idx(self._orig_df, self.repr_spans[col], col)
+        return self._orig_df
+
+
+    @orig_df.setter
+    def orig_df(self, df: DataFrame):
+        self._orig_df = df
+        self._appended = []
+        self._stale_repr = set()
+
+
+    @property
+    def evol_df(self) -> DataFrame|None:
+        """The stat evolution of each column, as (col, direction) columns."""
+        return None if self.evol_cube is None else self.evol_cube.frame
+
+
+    @property
+    def evol_df_rhis(self) -> DataFrame|None:
+        """The RHIS evolution of each column, as (col, direction, hyp) columns."""
+        return None if self.evol_cube_rhis is None else self.evol_cube_rhis.frame
+
+
+    @classmethod
+    def from_long_frame(cls,  # noqa: C901, PLR0913
+            df: DataFrame,
+            by: str,
+            time: str,
+            values: list[str],*,
+            stat: str|None=None,
+            alpha: float=0.05,
+            direction: str='ba',
+            workers: int|None=None,
+            executor: str|None=None,
+            exact: bool|str=False,
+            ) -> DataFrame:
+        """
+        Generate the RHIS evolution of every group x parameter series of a long
+        table (one row per observation, e.g., with the station in 'by') in one
+        scheduled job.
+
+        Each series is sorted by 'time', its NaNs are dropped, and all of them
+        are evaluated together by series_evol_parallel, the longest first. The
+        series shorter than their first slice are not evaluated: a warning names
+        them and their rows have NaN p-values.
+
+        Parameters
+        ----------
+            df
+                A pandas.DataFrame in long format.
+            by
+                The name of the column with the group of each row (e.g., 'PONTO').
+            time
+                The name of the column with the time of each row (e.g., 'DATA').
+            values
+                The names of the columns with the parameters to be analyzed.
+            stat
+                One of ['min', 'med', 'mean', 'max', None], as in Rhis.evol.
+            alpha
+                The significance level.
+            direction
+                One of ['ba', 'fo', 'both'].
+            workers
+                The maximum number of series evaluated concurrently. If None or 1,
+                the series are evaluated sequentially.
+            executor
+                One of ['thread', 'process', None], as in Rhis.evol.
+            exact
+                One of [False, 'auto'], as in Rhis.evol.
+
+        Return
+        ------
+            DataFrame indexed by (by, 'parameter', time), with one column per
+            direction (or per direction and hypothesis, if stat is None).
+        """
+        missing = [col for col in (by, time, *values) if col not in df.columns]
+        if missing:
+            msg = f"The columns {missing} are not in the dataframe."
+            logger.debug(msg)
+            raise ValueError(msg)
+        if direction not in ('ba', 'fo', 'both'):
+            msg = (
+                f"The value '{direction}' is invalid. The parameter 'direction' "
+                f"should be one of these: 'ba', 'fo', or 'both'.")
+            logger.debug(msg)
+            raise ValueError(msg)
+
+        logger.info("Processing RHIS evolution by group...")
+        keys, times, series = [], [], []
+        for group, group_df in df.sort_values(time, kind='stable').groupby(by, sort=True):
+            for value in values:
+                ts = group_df[[time, value]].dropna()
+                if ts.empty:
+                    continue
+                keys.append((group, value))
+                times.append(ts[time].to_numpy())
+                series.append(ts[value].to_numpy(dtype=float))
+
+        sli_inits = [slice_init(len(ts)) for ts in series]
+        evaluated = [k for k, ts in enumerate(series) if len(ts) >= sli_inits[k]]
+        for k in sorted(set(range(len(series))) - set(evaluated)):
+            logger.warning(
+                f"The series of {by}={keys[k][0]!r}, parameter {keys[k][1]!r} has {len(series[k])} "
+                f"observations, fewer than its first slice ({sli_inits[k]}); its p-values are NaN.")
+
+        directions = ('ba', 'fo') if direction == 'both' else (direction,)
+        evols = [
+            {bafo: dict.fromkeys(HYPS, np.full(len(ts), np.nan)) if stat is None else np.full(len(ts), np.nan)
+             for bafo in directions}
+            for ts in series
+            ]
+        evaluated_evols = series_evol_parallel(
+            [series[k] for k in evaluated], alpha, [sli_inits[k] for k in evaluated], stat,
+            direction=direction, workers=workers, executor=executor, exact=exact)
+        for k, evol in zip(evaluated, evaluated_evols):
+            evols[k] = evol
+
+        columns = {}
+        for bafo in directions:
+            if stat is None:
+                for hyp in HYPS:
+                    columns[(bafo, hyp)] = np.concatenate([evol[bafo][hyp] for evol in evols])
+            else:
+                columns[bafo] = np.concatenate([evol[bafo] for evol in evols])
+
+        lengths = [len(ts) for ts in series]
+        index = pd.MultiIndex.from_arrays(
+            [np.repeat([key[0] for key in keys], lengths),
+             np.repeat([key[1] for key in keys], lengths),
+             np.concatenate(times)],
+            names=[by, 'parameter', time])
+
+        logger.info("RHIS evolution by group successfully complete.")
+        return DataFrame(columns, index=index)
 
 
     @validate_evol_params
-    def evol(self,
+    def evol(self,  # noqa: PLR0913
             cols: tuple[str]|None=None,
             stat: str|None=None,
             alpha: float=0.05,*,
-            backwards: bool=True
+            backwards: bool=True,
+            direction: str|None=None,
+            window: int|None=None,
+            workers: int|None=None,
+            executor: str|None=None,
+            dtype: str='float64',
+            exact: bool|str=False,
+            profile: bool=False,
             ) -> DataFrame:
         """
         Generate a dataframe (self.evol_df or self.evol_df_rhis) with the series from
@@ -61,6 +245,41 @@ class Rhis:
                 is used, and self.evol_df is created.
             alpha
                 The significance level.
+            backwards
+                If True, the tests are applied to the slices growing from the end of the
+                series ('ba'); otherwise, from the start ('fo').
+            direction
+                One of ['ba', 'fo', 'both', None]. If given, it overrides 'backwards'.
+                With 'both', the two directions are filled together, sharing the ranks
+                of each series.
+            window
+                If given, the tests are applied to every window with this number of
+                consecutive elements ('wi'), each p-value placed at the end of its window,
+                instead of to the growing slices. It overrides 'backwards' and 'direction'.
+            workers
+                The maximum number of columns evaluated concurrently. If None or 1,
+                the columns are evaluated sequentially.
+            executor
+                One of ['thread', 'process', None]. If None, threads are used for
+                short series and processes for long ones. Processes receive the
+                columns through shared memory.
+            dtype
+                One of ['float64', 'float32']. The type of the stored p-values.
+            exact
+                One of [False, 'auto']. With 'auto', the slices without ties and with
+                up to 40 elements (20 per half for homogeneity) get p-values from the
+                exact null distributions of the randomness, homogeneity and
+                stationarity tests instead of the normal approximations. The
+                windows always use the normal approximations.
+            profile
+                If True, the wall time, the calls and the peak memory of each stage
+                (per column and per hypothesis) are recorded, logged and stored in
+                self.profile_report (see rhis_ts.utils.profiling.Profiler, which can
+                also wrap any number of calls).
+
+        If the instance has a cache (an EvolCache), the raw p-values of each column
+        are served from it or stored in it, and the columns are evaluated
+        sequentially. The window mode is not cached.
 
         Return
         ------
@@ -70,46 +289,112 @@ class Rhis:
         msg = f"Processing {mode} evolution..."
         logger.info(msg)
 
+        if window is not None:
+            direction = 'wi'
+        elif direction is None:
+            direction = 'ba' if backwards else 'fo'
         self.stat = stat
         self.alpha = alpha
-        self.backwards = backwards
-
-        evol_cols = cols if cols is not None else self.orig_df.columns
-        if self.evol_df_rhis is None and stat is None:
-            init_df = build_init_evol_df(evol_cols, self.orig_df.index, stat, backwards=backwards)
-            self.evol_df_rhis = init_df
-        if self.evol_df is None and stat is not None:
-            init_df = build_init_evol_df(evol_cols, self.orig_df.index, stat, backwards=backwards)
-            self.evol_df = init_df
-
-        for col in evol_cols:
-            ts = self.orig_df[col]
-            self._ts_evol(ts, alpha)
-        evol_df = self.evol_df[evol_cols] if self.evol_df is not None else self.evol_df_rhis[evol_cols]
+        self.direction = direction
+        self.window = window
+        self.exact = exact
+        self.backwards = direction not in ('fo', 'wi')
+        if stat is not None:
+            self.evol_df_stat = stat
+        # The running states would no longer match the recomputed columns
+        self._streams = {}
+        self._repr_runs = {}
+
+        evol_cols = list(cols if cols is not None else self.orig_df.columns)
+        directions = ('ba', 'fo') if direction == 'both' else (direction,)
+        cube = self._prepare_cube(evol_cols, evol_keys(directions, stat), dtype)
+
+        with Profiler() if profile else nullcontext() as prof:
+            evol_df = self._evol_cols(evol_cols, cube, alpha, workers=workers, executor=executor)
+        if prof is not None:
+            self.profile_report = prof.report()
+            prof.log()
 
         logger.info("RHIS evolution successfully complete.")
         return evol_df
 
 
+    def _evol_cols(self,
+            evol_cols: list[str],
+            cube: EvolCube,
+            alpha: float,*,
+            workers: int|None,
+            executor: str|None,
+            ) -> DataFrame:
+        direction, exact = self.direction, self.exact
+        if workers is not None and workers > 1 and active_profiler() is not None:
+            # The profiler is not seen by the threads and processes of the pool
+            logger.warning("The columns are evaluated sequentially while profiling.")
+            workers = None
+
+        if self.cache is not None and direction != 'wi':
+            # The cache is read and written by this process only, so the columns are evaluated sequentially
+            for col in evol_cols:
+                with profile_column(col):
+                    with stage('evol'):
+                        evol = cached_col_evol(
+                            self.cache, self.orig_df[col].to_numpy(dtype=float), self.slice_init, self.stat,
+                            direction=direction, exact=exact, compact=True)
+                    with stage('assembly'):
+                        self._insert_evol(col, evol)
+        elif workers is None or workers <= 1:
+            for col in evol_cols:
+                with profile_column(col):
+                    self._ts_evol(self.orig_df[col], alpha)
+        else:
+            arr = self.orig_df[list(evol_cols)].to_numpy(dtype=float)
+            evols = cols_evol_parallel(
+                arr, alpha, self.slice_init, self.stat,
+                direction=direction, workers=workers, executor=executor, window=self.window, exact=exact, compact=True)
+            # Inserted in the order of the columns, whatever the order the workers finish
+            for col, evol in zip(evol_cols, evols):
+                self._insert_evol(col, evol)
+        with stage('frame'):
+            return cube.to_frame(evol_cols)
+
+
+    def _prepare_cube(self, cols: list[str], keys: list[tuple[str]], dtype: str) -> EvolCube:
+        # Allocated once for all the columns, instead of growing a dataframe column by column
+        cube = self.evol_cube_rhis if self.stat is None else self.evol_cube
+        if cube is None:
+            cube = EvolCube(cols, keys, self.orig_df.index, dtype)
+        else:
+            cube.ensure(cols, keys, dtype)
+        if self.stat is None:
+            self.evol_cube_rhis = cube
+        else:
+            self.evol_cube = cube
+
+        return cube
+
+
     def _ts_evol(self, ts: Series, alpha: float=0.05):
-        ts_arr = ts.to_numpy()
-        if self.backwards:
-            ts_arr = ts_arr[::-1]
+        with stage('evol'):
+            evol = col_evol(
+                ts.to_numpy(), alpha, self.slice_init, self.stat,
+                direction=self.direction, window=self.window, exact=self.exact, compact=True)
+        with stage('assembly'):
+            self._insert_evol(ts.name, evol)
 
-        evol = rhis_standard_evol(ts_arr, alpha, self.slice_init, self.stat, backwards=self.backwards)
 
-        direction = 'ba' if self.backwards else 'fo'
-        if self.stat is None:
-            for hyp, ps in evol.items():
-                self.evol_df_rhis[(ts.name, direction, hyp)] = ps
-        else:
-            self.evol_df[(ts.name, direction)] = evol
+    def _insert_evol(self, col: str, evol: dict[np.ndarray | dict[np.ndarray]]):
+        for direction, direction_evol in evol.items():
+            if self.stat is None:
+                for hyp, ps in direction_evol.items():
+                    self.evol_cube_rhis[(col, direction, hyp)] = ps
+            else:
+                self.evol_cube[(col, direction)] = direction_evol
 
 
     def add_repr_cols_to_df(self,*, backwards: bool=True) -> DataFrame:
         logger.info("Adding representative data...")
         try:
-            if self.evol_df is None:
+            if self.evol_cube is None:
                 msg = 'Please, run the evolution process before adding representative data.'
                 raise EvolRunMissingError(msg)
             if not isinstance(backwards, bool):
@@ -120,16 +405,11 @@ class Rhis:
 
             orig_cols = self.orig_df.columns
             for orig_col in orig_cols:
-                evol_df_cols = self.evol_df.columns
-                filtered_evol_df = self.evol_df[[col for col in evol_df_cols if col[0] == orig_col]]
-
-                if (orig_col, direction) not in filtered_evol_df.columns:
+                if (orig_col, direction) not in self.evol_cube:
                     direction_name = 'backwards' if backwards else 'forwards'
                     msg = f"Please, run the evolution process in the {direction_name} direction."
                     raise EvolNotRunInDirectionError(msg)
-                evol_bafo = filtered_evol_df[(orig_col, direction)].to_numpy()
-                cut_idxs = repr_slice_idxs(evol_bafo, self.alpha, self.slice_init, direction)
-                insert_repr_in_df_from_idx(self.orig_df, cut_idxs, orig_col)
+                self._insert_repr(orig_col, direction)
         except (EvolDirectionError, EvolNotRunInDirectionError, EvolRunMissingError, ValueError) as exc:
             logger.exception(exc)
             return exc
@@ -138,30 +418,280 @@ class Rhis:
         return self.orig_df
 
 
+    def find_repr(self,
+            cols: tuple[str]|None=None,
+            alpha: float=0.05,
+            direction: str='ba',*,
+            stat: str='min',
+            exact: bool|str=False,
+            ) -> DataFrame:
+        """
+        Add the representative data of each column to the original dataframe
+        (self.orig_df), as add_repr_cols_to_df, without running the evolution
+        first.
+
+        The slices are tested from the longest one and the search stops at the
+        first slice that is not rejected (see repr_slice_idxs_lazy), so a
+        boundary close to the start of the scan costs a few single tests instead
+        of the whole evolution.
+
+        Parameters
+        ----------
+            cols
+                An Iterable with the names of the columns. If None, every column.
+            alpha
+                The significance level.
+            direction
+                One of ['ba', 'fo'].
+            stat
+                One of ['min', 'mean', 'med', 'max']. The statistic applied to the
+                RHIS p-values of each slice.
+            exact
+                One of [False, 'auto'], as in Rhis.evol.
+
+        Return
+        ------
+            The original dataframe with the '_repr' columns.
+        """
+        logger.info("Finding representative data...")
+        try:
+            if direction not in ('ba', 'fo'):
+                msg = f"The value '{direction}' is invalid. The parameter 'direction' should be 'ba' or 'fo'."
+                raise EvolDirectionError(msg)
+            if stat not in STAT_FUNCS:
+                msg = (
+                    f"The value '{stat}' is invalid. The parameter 'stat' "
+                    f"should be one of these: 'min', 'max', 'mean', or 'med'.")
+                raise ValueError(msg)
+            repr_cols = list(cols if cols is not None else self.orig_df.columns)
+            missing = [col for col in repr_cols if col not in self.orig_df.columns]
+            if missing:
+                msg = f"The columns {missing} are not in the dataframe."
+                raise ValueError(msg)
+        except (EvolDirectionError, ValueError) as exc:
+            logger.exception(exc)
+            return exc
+
+        for col in repr_cols:
+            ts = self.orig_df[col].to_numpy(dtype=float)
+            self.repr_spans[col] = repr_slice_idxs_lazy(ts, alpha, self.slice_init, stat, direction, exact=exact)
+            self.repr_directions[col] = direction
+            self._repr_runs.pop(col, None)
+            insert_repr_in_df_from_idx(self.orig_df, self.repr_spans[col], col)
+
+        logger.info("Representative data successfully added.")
+        return self.orig_df
+
+
+    def _insert_repr(self, col: str, direction: str):
+        offset, ps = self.evol_cube.curve((col, direction))
+        curve = Curve(offset, ps.astype(float))
+        self.repr_spans[col] = repr_slice_idxs_from_curve(curve, self.alpha, self.slice_init, direction)
+        self.repr_directions[col] = direction
+        self._repr_runs.pop(col, None)
+        insert_repr_in_df_from_idx(self.orig_df, self.repr_spans[col], col)
+
+
+    def _update_repr(self, col: str, new: int):
+        """Move the representative data of col to the end of its forward curve, after new p-values."""
+        _, ps = self.evol_cube.curve((col, 'fo'))
+        run = self._repr_runs.get(col)
+        if run is None:
+            run = trailing_rejected(ps, self.alpha)
+        else:
+            new_ps = ps[len(ps) - min(new, len(ps)):]
+            new_run = trailing_rejected(new_ps, self.alpha)
+            run = run + new_run if new_run == len(new_ps) else new_run
+        self._repr_runs[col] = run
+        self.repr_spans[col] = repr_slice_idxs_from_run(run, len(ps), self.slice_init)
+        self._stale_repr.add(col)
+
+
+    def _update_slice_init(self, n_rows: int):
+        """Update slice_init for the new number of rows, dropping the p-values of the slices now too short."""
+        new_slice_init = slice_init(n_rows)
+        if new_slice_init == self.slice_init:
+            return
+        # The p-value of a slice does not depend on slice_init, so the curves only lose their first slices
+        self.slice_init = new_slice_init
+        for cube in (self.evol_cube_rhis, self.evol_cube):
+            if cube is not None:
+                cube.drop_before(new_slice_init - 1)
+        for stream in self._streams.values():
+            stream.sli_init = new_slice_init
+        self._repr_runs = {}
+
+
+    def _drop_repr(self, col: str):
+        """Remove the representative data of col, which append cannot move."""
+        del self.repr_spans[col]
+        self.repr_directions.pop(col, None)
+        self._repr_runs.pop(col, None)
+        self._stale_repr.discard(col)
+        self._orig_df = self._orig_df.drop(columns=col + '_repr', errors='ignore')
+
+
+    def append(self, rows: DataFrame) -> Exception|None:  # noqa: C901
+        """
+        Add observations to the end of the original dataframe (self.orig_df) and
+        update the forward evolution and the representative data incrementally.
+
+        The first call builds a RhisIncremental state from the history of each
+        column at once. After that, each new observation costs O(log n) per column
+        instead of re-running the evolution: the p-values are added to the cube,
+        which grows geometrically, and the forward representative boundary is moved
+        by the number of rejected p-values at the end of the curve. The rows and the
+        representative data are only written to self.orig_df, and the frames
+        (self.evol_df, self.evol_df_rhis) are only built, when they are accessed.
+        The backward and sliding window evolutions are not kept up to date, so
+        their columns are dropped, as well as the representative data that is not
+        forward or has no forward stat curve to move it (the spans and the '_repr'
+        columns). When the data grows past the length
+        where slice_init changes (see rhis_ts.utils.data.slice_init), slice_init
+        is updated and the p-values of the shorter slices are dropped, as in a new
+        evolution of the complete data.
+
+        Parameters
+        ----------
+            rows
+                A DataFrame with the new observations of every column in the evolution.
+
+        Return
+        ------
+            None, or the exception if the rows could not be appended.
+        """
+        logger.info("Appending data...")
+        try:
+            if self.evol_cube is None and self.evol_cube_rhis is None:
+                msg = 'Please, run the evolution process before appending data.'
+                raise EvolRunMissingError(msg)
+            if not isinstance(rows, pd.DataFrame) or isinstance(rows.index, pd.MultiIndex):
+                msg = "The parameter 'rows' must be a non-MultiIndex pandas.DataFrame."
+                raise ValueError(msg)
+
+            cubes = [cube for cube in (self.evol_cube_rhis, self.evol_cube) if cube is not None]
+            evol_cols = list(dict.fromkeys(
+                col for cube in cubes if any(key[0] == 'fo' for key in cube.keys) for col in cube.cols))
+            if not evol_cols:
+                msg = "Please, run the evolution process in the forwards direction before appending data."
+                raise EvolNotRunInDirectionError(msg)
+            missing = [col for col in evol_cols if col not in rows.columns]
+            if missing:
+                msg = f"The columns {missing} are in the evolution but not in 'rows'."
+                raise ValueError(msg)
+        except (EvolNotRunInDirectionError, EvolRunMissingError, ValueError) as exc:
+            logger.exception(exc)
+            return exc
+
+        new_ps = {}
+        for col in evol_cols:
+            if col not in self._streams:
+                self._streams[col] = RhisIncremental.from_values(
+                    self.orig_df[col].to_numpy(dtype=float), self.slice_init, exact=self.exact)
+            new_ps[col] = self._streams[col].extend(rows[col].to_numpy(dtype=float))
+
+        n_rows = len(self._orig_df) + sum(len(appended) for appended in self._appended) + len(rows)
+        self._appended.append(rows)
+        if self.evol_cube_rhis is not None:
+            self.evol_cube_rhis = self._append_evol(self.evol_cube_rhis, rows.index, new_ps, None)
+        if self.evol_cube is not None:
+            self.evol_cube = self._append_evol(self.evol_cube, rows.index, new_ps, self.evol_df_stat)
+
+        self._update_slice_init(n_rows)
+        for col in list(self.repr_spans):
+            if self.evol_cube is not None and self.repr_directions.get(col) == 'fo' and col in self.evol_cube.cols:
+                self._update_repr(col, len(rows))
+            else:
+                self._drop_repr(col)
+
+        logger.info("Data successfully appended.")
+        return None
+
+
+    @staticmethod
+    def _append_evol(cube: EvolCube, index: Index, new_ps: dict, stat: str|None) -> EvolCube:
+        if any(key[0] != 'fo' for key in cube.keys):
+            cube = cube.select_keys([key for key in cube.keys if key[0] == 'fo'])
+        new_data = np.full((len(cube.cols), len(cube.keys), len(index)), np.nan)
+        for i, col in enumerate(cube.cols):
+            for j, key in enumerate(cube.keys):
+                # RHIS keys are ('fo', hyp); stat keys are ('fo',)
+                new_data[i, j] = [
+                    np.nan if ps is None else ps[key[1]] if stat is None else STAT_FUNCS[stat](list(ps.values()))
+                    for ps in new_ps[col]
+                    ]
+        cube.append(index, new_data)
+
+        return cube
+
+
     @validate_plot_params
-    def plot(
+    def plot(  # noqa: PLR0913
             self,
             col_name: str|None=None,
             save_dir_path: str | None=None,
             save_format: str | None='png',*,
             rhis: bool=False,
             show_repr: bool=True,
+            backwards: bool|None=None,
+            headless: bool=False,
+            workers: int|None=None,
+            pdf_path: str|None=None,
+            decimate: bool=True,
             **kwargs
             ):
+        """
+        Plot the evolution of each column (or of col_name) with its data and its
+        representative data, saving each figure to save_dir_path.
+
+        With headless, the figures are drawn by the Agg backend without pyplot,
+        so nothing is shown, and each one is written straight to its file. One
+        figure is reused for all the columns, so the memory does not grow with
+        their number. With workers, the columns are rendered by that many
+        processes. With pdf_path, every column is a page of one PDF instead
+        (rendered by one process).
+
+        With decimate, only the minimum and maximum of the points that fall on
+        each pixel column of the figure are drawn (the data, the representative
+        data and the p-values), plus the boundaries of the representative period
+        and both sides of every crossing of alpha, so long series are drawn in
+        about the same time as short ones.
+
+        The keyword arguments (figsize, xlabel, ylabel, figtitle and the params
+        dicts) are the same in every mode.
+        """
         try:
-            if self.evol_df is None:
+            if self.evol_cube is None:
                 msg = "Please, before trying to plot, run the evolution process by calling the 'evol' method."
                 raise PlotEvolError(msg)
 
             cols = [col_name,]
 
             if col_name is None:
-                cols = {col for col, _ in self.evol_df.columns}
+                cols = self.evol_cube.cols
             elif col_name not in self.orig_df.columns.values:
                 msg = f"The name '{col_name}' is not in the columns of the dataframe."
                 raise ValueError(msg)
 
-            direction = 'ba' if self.backwards else 'fo'
+            if backwards is not None:
+                direction = 'ba' if backwards else 'fo'
+            elif self.direction == 'wi':
+                direction = 'wi'
+            else:
+                direction = 'ba' if self.backwards else 'fo'
+
+            if headless or workers is not None or pdf_path is not None:
+                options = {
+                    **kwargs, 'direction': direction, 'alpha': self.alpha,
+                    'rhis': rhis, 'show_repr': show_repr, 'decimate': decimate}
+                self._render(cols, direction, options, save_dir_path, save_format, workers=workers, pdf_path=pdf_path)
+                return
+
+            # matplotlib is only imported when something is plotted
+            from rhis_ts.evol.plot.decimate import pixel_width  # noqa: PLC0415
+            from rhis_ts.evol.plot.plot_standard_evol import finalize_plot, plot_data, plot_rhis_evol  # noqa: PLC0415
+
+            bins = pixel_width(kwargs.get('figsize')) if decimate else None
             for col in cols:
                 evol_ax = plot_rhis_evol(
                     col,
@@ -172,7 +702,9 @@ class Rhis:
                     kwargs.get('xlabel'),
                     kwargs.get('rhis_params'),
                     kwargs.get('rhis_stat_params'),
-                    rhis=rhis
+                    rhis=rhis,
+                    bins=bins,
+                    alpha=self.alpha
                     )
                 data_ax = plot_data(
                     evol_ax,
@@ -181,23 +713,63 @@ class Rhis:
                     kwargs.get('ylabel'),
                     kwargs.get('data_params'),
                     kwargs.get('repr_params'),
-                    show_repr=show_repr
+                    show_repr=show_repr,
+                    repr_span=self.repr_spans.get(col),
+                    bins=bins
                     )
-                filename = 'rhis_evol_' + col.lower().strip() + '.' + save_format
-                filename_clean = filename.replace(' ', '_').replace('(', '').replace(')', '').replace('/', '_')
-                col_save_path = filename if save_dir_path is None else f'{save_dir_path}{filename_clean}'
                 finalize_plot(
                     evol_ax,
                     data_ax,
                     self.alpha,
                     kwargs.get('figtitle'),
                     kwargs.get('alpha_line_params'),
-                    col_save_path
+                    self._plot_path(col, save_dir_path, save_format)
                     )
 
         except (PlotEvolError, ValueError) as exc:
             logger.exception(exc)
 
+
+    @staticmethod
+    def _plot_path(col: str, save_dir_path: str|None, save_format: str) -> str:
+        filename = 'rhis_evol_' + col.lower().strip() + '.' + save_format
+        filename_clean = filename.replace(' ', '_').replace('(', '').replace(')', '').replace('/', '_')
+        return filename if save_dir_path is None else f'{save_dir_path}{filename_clean}'
+
+
+    def _render(  # noqa: PLR0913
+            self,
+            cols: list[str],
+            direction: str,
+            options: dict,
+            save_dir_path: str|None,
+            save_format: str,*,
+            workers: int|None,
+            pdf_path: str|None,
+            ):
+        from rhis_ts.evol.plot.render import ColPlot, render_parallel, render_pdf  # noqa: PLC0415
+
+        evol_df = self.evol_df
+        evol_df_rhis = self.evol_df_rhis if options['rhis'] else None
+        plots = []
+        for col in cols:
+            # Only the columns of each plot are sent to the workers
+            repr_cols = [col] + ([col + '_repr'] if col + '_repr' in self.orig_df.columns else [])
+            plots.append(ColPlot(
+                col,
+                evol_df[[(col, direction)]],
+                None if evol_df_rhis is None else evol_df_rhis[[(col, direction, hyp) for hyp in ('R', 'H', 'I', 'S')]],
+                self.orig_df[repr_cols],
+                self.repr_spans.get(col),
+                self._plot_path(col, save_dir_path, save_format)
+                ))
+
+        if pdf_path is not None:
+            render_pdf(plots, options, pdf_path)
+        else:
+            render_parallel(plots, options, workers)
+
+
 if __name__ == '__main__':
 
     df = pd.read_csv('./data/MarchMilwaukeeChloride.csv')
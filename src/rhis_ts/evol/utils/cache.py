@@ -0,0 +1,228 @@
+"""Persistent on-disk cache of the raw RHIS evolution of each series."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from loguru import logger
+
+from rhis_ts import __version__
+from rhis_ts.evol.methods import RhisIncremental, rhis_evol_raw, rhis_standard_from_raw
+
+if TYPE_CHECKING:
+    from rhis_ts.evol.methods import Curve
+
+# Bumped whenever the p-values of the evolution engines change, so stale entries are never served
+ENGINE_VERSION = f'{__version__}-2'
+HYPS = ('R', 'H', 'I', 'S')
+# A tail at most 1 / STREAM_TAIL_RATIO of its cached prefix is streamed through RhisIncremental,
+# a longer one is evaluated by the vectorized engine over the whole series
+STREAM_TAIL_RATIO = 10
+# The file names of the entries: their keys, SHA-256 hexdigests
+ENTRY_NAME = re.compile('[0-9a-f]{64}')
+
+
+def fingerprint(values: np.ndarray) -> str:
+    """The SHA-256 of the values of a series, as float64."""
+    arr = np.ascontiguousarray(values, dtype=np.float64)
+    return hashlib.sha256(arr.tobytes()).hexdigest()
+
+
+class EvolCache:
+    """
+    Least recently used (LRU) cache of the raw p-values (one curve per
+    hypothesis) of the backward and forward evolution of series, stored as
+    npz files in a directory.
+
+    Entries are keyed by the fingerprint of the values, sli_init, direction,
+    the use of exact p-values and ENGINE_VERSION, so any stat and alpha are served from the same entry.
+    A forward entry is also reused when the series is only extended: the
+    p-values of the old prefixes do not change, and only the slices of the
+    new tail are computed.
+
+    Parameters
+    ----------
+        directory
+            The directory of the cache. It is created, if missing.
+        max_bytes
+            The maximum size of the stored curves. The least recently used
+            entries are removed beyond it.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int=256 * 2**20):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._index_path = self.directory / 'index.json'
+        self._index = self._load_index()
+
+    def _load_index(self) -> dict:
+        stale = None
+        if self._index_path.exists():
+            try:
+                with open(self._index_path) as f:
+                    index = json.load(f)
+                if index.get('version') == ENGINE_VERSION:
+                    return index
+                stale = [key for key in index['entries'] if ENTRY_NAME.fullmatch(str(key))]
+            except (OSError, ValueError, KeyError, AttributeError, TypeError) as exc:
+                logger.warning(f"The cache index is unreadable and will be rebuilt: {exc}")
+        if stale is None:
+            # Without an index, only the files named as entries can be the cache's own
+            stale = [path.stem for path in self.directory.glob('*.npz') if ENTRY_NAME.fullmatch(path.stem)]
+        for key in stale:
+            (self.directory / f'{key}.npz').unlink(missing_ok=True)
+        return {'version': ENGINE_VERSION, 'tick': 0, 'entries': {}}
+
+    def _save_index(self):
+        tmp_path = self._index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+
+    @staticmethod
+    def _key(fp: str, sli_init: int, direction: str,*, exact: bool) -> str:
+        return hashlib.sha256(f'{fp}-{sli_init}-{direction}-{exact}-{ENGINE_VERSION}'.encode()).hexdigest()
+
+    def _touch(self, key: str):
+        self._index['tick'] += 1
+        self._index['entries'][key]['used'] = self._index['tick']
+
+    def _read(self, key: str) -> dict[np.ndarray] | None:
+        try:
+            with np.load(self.directory / f'{key}.npz') as npz:
+                return {hyp: npz[hyp] for hyp in HYPS}
+        except (OSError, KeyError, ValueError):
+            del self._index['entries'][key]
+            return None
+
+    def get(self, values: np.ndarray, sli_init: int, direction: str,*, exact: bool=False) -> dict[np.ndarray] | None:
+        """
+        The raw p-values of each hypothesis (as in rhis_evol_raw) of a series
+        in the original order, for 'ba' or 'fo', or None if not cached.
+        """
+        key = self._key(fingerprint(values), sli_init, direction, exact=bool(exact))
+        if key not in self._index['entries']:
+            return None
+        raw = self._read(key)
+        if raw is not None:
+            self._touch(key)
+        self._save_index()
+
+        return raw
+
+    def get_prefix(self, values: np.ndarray, sli_init: int,*, exact: bool=False) -> dict[np.ndarray] | None:
+        """
+        The raw forward p-values of the longest cached series that is a
+        prefix of values (shorter than it), from its slice with sli_init
+        elements, or None if there is none.
+        """
+        # The p-values of each slice do not depend on sli_init, so entries that start earlier also serve
+        candidates = sorted(
+            {(entry['n'], entry['sli_init']) for entry in self._index['entries'].values()
+             if entry['direction'] == 'fo' and entry.get('exact', False) == bool(exact)
+             and entry['sli_init'] <= sli_init and entry['n'] < len(values)},
+            reverse=True)
+        for n, entry_sli_init in candidates:
+            raw = self.get(values[:n], entry_sli_init, 'fo', exact=exact)
+            if raw is not None:
+                return {hyp: ps[sli_init - entry_sli_init:] for hyp, ps in raw.items()}
+
+        return None
+
+    def put(self, values: np.ndarray, sli_init: int, direction: str, raw: dict[np.ndarray],*, exact: bool=False):
+        """Store the raw p-values of a series and evict the least recently used entries."""
+        key = self._key(fingerprint(values), sli_init, direction, exact=bool(exact))
+        path = self.directory / f'{key}.npz'
+        np.savez(path, **{hyp: np.asarray(raw[hyp], dtype=np.float64) for hyp in HYPS})
+
+        self._index['entries'][key] = {
+            'n': len(values),
+            'sli_init': sli_init,
+            'direction': direction,
+            'exact': bool(exact),
+            'size': path.stat().st_size,
+        }
+        self._touch(key)
+        self._evict()
+        self._save_index()
+
+    def _evict(self):
+        entries = self._index['entries']
+        total = sum(entry['size'] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]['used']):
+            if total <= self.max_bytes:
+                break
+            total -= entries[key]['size']
+            (self.directory / f'{key}.npz').unlink(missing_ok=True)
+            del entries[key]
+
+    def clear(self):
+        """Remove every entry."""
+        for key in self._index['entries']:
+            (self.directory / f'{key}.npz').unlink(missing_ok=True)
+        self._index['entries'] = {}
+        self._save_index()
+
+
+def cached_raw_evol(cache: EvolCache, ts: np.ndarray, sli_init: int, direction: str,*, exact: bool|str=False) \
+    -> dict[np.ndarray]:
+    """
+    The raw p-values of each hypothesis of a series (in the original order)
+    in one direction ('ba' or 'fo'), from the cache or computed and stored.
+    A forward evolution whose series extends a cached one only computes the
+    slices longer than the cached series: for a short tail, the running state
+    of the tests is built from the cached series at once and only the tail
+    is streamed through it.
+    """
+    raw = cache.get(ts, sli_init, direction, exact=exact)
+    if raw is not None:
+        return raw
+
+    if direction == 'ba':
+        raw = rhis_evol_raw(ts[::-1], 0.05, sli_init, exact=exact)
+    else:
+        prefix_raw = cache.get_prefix(ts, sli_init, exact=exact)
+        if prefix_raw is None:
+            raw = rhis_evol_raw(ts, 0.05, sli_init, exact=exact)
+        else:
+            n_prefix = len(prefix_raw['R']) + sli_init - 1
+            if (len(ts) - n_prefix) * STREAM_TAIL_RATIO <= n_prefix:
+                state = RhisIncremental.from_values(ts[:n_prefix], sli_init, exact=exact)
+                tail = state.extend(ts[n_prefix:])
+                tail_raw = {hyp: np.array([ps[hyp] for ps in tail]) for hyp in HYPS}
+            else:
+                tail_raw = rhis_evol_raw(ts, 0.05, max(n_prefix + 1, sli_init), exact=exact)
+            raw = {hyp: np.concatenate([prefix_raw[hyp], tail_raw[hyp]]) for hyp in HYPS}
+    cache.put(ts, sli_init, direction, raw, exact=exact)
+
+    return raw
+
+
+def cached_col_evol(  # noqa: PLR0913
+        cache: EvolCache,
+        col: np.ndarray,
+        sli_init: int,
+        stat: str|None,*,
+        direction: str,
+        exact: bool|str=False,
+        compact: bool=False,
+        ) -> dict[np.ndarray | Curve | dict[np.ndarray | Curve]]:
+    """
+    Evaluate the RHIS evolution of a series (in the original order), as
+    col_evol, serving the raw p-values of each direction from the cache.
+    """
+    directions = ('ba', 'fo') if direction == 'both' else (direction,)
+    col = np.asarray(col, dtype=np.float64)
+
+    return {
+        bafo: rhis_standard_from_raw(
+            cached_raw_evol(cache, col, sli_init, bafo, exact=exact), len(col), sli_init, stat,
+            backwards=bafo == 'ba', compact=compact)
+        for bafo in directions
+    }
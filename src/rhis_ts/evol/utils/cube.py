@@ -0,0 +1,215 @@
+"""Contiguous storage of the evolution of many columns, each curve from its first p-value."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from rhis_ts.evol.methods import Curve
+
+if TYPE_CHECKING:
+    from pandas import DataFrame, Index
+
+HYPS = ('R', 'H', 'I', 'S')
+
+
+def evol_keys(directions: tuple[str], stat: str|None) -> list[tuple[str]]:
+    """The keys of the curves of each column: (direction, hyp), or (direction,) with a stat."""
+    if stat is None:
+        return [(direction, hyp) for direction in directions for hyp in HYPS]
+    return [(direction,) for direction in directions]
+
+
+class EvolCube:
+    """
+    The evolution of many columns in one contiguous array, with shape
+    (columns x curves x width). The curves of each column are its (direction,
+    hyp) pairs for the RHIS evolution, or its directions for a stat evolution.
+
+    Each curve is stored from its first p-value, as in Curve: its p-values
+    start at data[col, curve, 0] and are at the positions offsets[col, curve]
+    to offsets[col, curve] + lengths[col, curve] of the series. The array is
+    dense, so the shorter curves are padded with NaN up to its width, the one
+    of the longest curve (or more, after append, which grows it
+    geometrically). Only the leading NaN of each curve (e.g., the sli_init - 1
+    positions before its first slice) are not stored; the padding to the
+    length of the series is only materialized when a curve is read by
+    __getitem__ or the DataFrame is built.
+
+    A curve is accessed by the same tuple as its MultiIndex column, e.g.,
+    cube[(col, 'ba', 'R')] or cube[(col, 'ba')]. The DataFrame (frame) is only
+    built when it is accessed and is kept until the data changes.
+
+    Parameters
+    ----------
+        cols
+            The names of the columns.
+        keys
+            The keys of the curves of each column (see evol_keys).
+        index
+            The index of the original dataframe.
+        dtype
+            np.float64 or np.float32.
+    """
+
+    def __init__(self, cols: list[str], keys: list[tuple[str]], index: Index, dtype: type=np.float64):
+        self.cols = list(cols)
+        self.keys = list(keys)
+        self.index = index
+        shape = (len(self.cols), len(self.keys))
+        self.data = np.empty((*shape, 0), dtype=dtype)
+        self.offsets = np.zeros(shape, dtype=np.int64)
+        self.lengths = np.zeros(shape, dtype=np.int64)
+        self._frame = None
+
+    @property
+    def index(self) -> Index:
+        """The index of the series, with the appended ones joined on first access."""
+        if self._index_tail:
+            self._index = self._index.append(self._index_tail)
+            self._index_tail = []
+        return self._index
+
+    @index.setter
+    def index(self, index: Index):
+        self._index = index
+        self._index_tail = []
+        self._n = len(index)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.data.dtype
+
+    @property
+    def columns(self) -> pd.MultiIndex:
+        return pd.MultiIndex.from_tuples([(col, *key) for col in self.cols for key in self.keys])
+
+    def _loc(self, item: tuple) -> tuple[int, int]:
+        return self.cols.index(item[0]), self.keys.index(tuple(item[1:]))
+
+    def __contains__(self, item: tuple) -> bool:
+        return item[0] in self.cols and tuple(item[1:]) in self.keys
+
+    def curve(self, item: tuple) -> Curve:
+        """The curve without its padding (the values are a view of the data)."""
+        i, j = self._loc(item)
+        return Curve(int(self.offsets[i, j]), self.data[i, j, :self.lengths[i, j]])
+
+    def __getitem__(self, item: tuple) -> np.ndarray:
+        """The curve at every position of the series, with NaN where it has no p-value."""
+        offset, values = self.curve(item)
+        full = np.full(self._n, np.nan, dtype=self.dtype)
+        full[offset:offset + len(values)] = values
+        return full
+
+    def __setitem__(self, item: tuple, values: np.ndarray | Curve):
+        """Store a Curve, or an array with a value for every position of the series."""
+        offset, values = values if isinstance(values, Curve) else (0, values)
+        i, j = self._loc(item)
+        length = len(values)
+        self._widen(length)
+        self.data[i, j, :length] = values
+        self.data[i, j, length:] = np.nan
+        self.offsets[i, j] = offset
+        self.lengths[i, j] = length
+        self._frame = None
+
+    def _widen(self, width: int,*, grow: bool=False):
+        if width <= self.data.shape[2]:
+            return
+        if grow:
+            # At least doubled, so a curve extended point by point is copied O(log n) times
+            width = max(width, 2 * self.data.shape[2])
+        data = np.full((*self.data.shape[:2], width), np.nan, dtype=self.dtype)
+        data[:, :, :self.data.shape[2]] = self.data
+        self.data = data
+
+    def ensure(self, cols: list[str], keys: list[tuple[str]], dtype: type|None=None):
+        """
+        Add the missing columns and keys (with empty curves) and cast to dtype,
+        if given, reallocating the array once.
+        """
+        new_cols = [col for col in cols if col not in self.cols]
+        new_keys = [key for key in keys if key not in self.keys]
+        dtype = self.dtype if dtype is None else np.dtype(dtype)
+        if not new_cols and not new_keys and dtype == self.dtype:
+            return
+
+        shape = (len(self.cols) + len(new_cols), len(self.keys) + len(new_keys))
+        data = np.full((*shape, self.data.shape[2]), np.nan, dtype=dtype)
+        data[:len(self.cols), :len(self.keys)] = self.data
+        offsets = np.zeros(shape, dtype=np.int64)
+        offsets[:len(self.cols), :len(self.keys)] = self.offsets
+        lengths = np.zeros(shape, dtype=np.int64)
+        lengths[:len(self.cols), :len(self.keys)] = self.lengths
+        self.data, self.offsets, self.lengths = data, offsets, lengths
+        self.cols += new_cols
+        self.keys += new_keys
+        self._frame = None
+
+    def select_keys(self, keys: list[tuple[str]]) -> EvolCube:
+        """A new cube with only the given keys (the ones in this cube)."""
+        keys = [key for key in self.keys if key in keys]
+        idxs = [self.keys.index(key) for key in keys]
+        cube = EvolCube(self.cols, keys, self.index, self.dtype)
+        cube.data = np.ascontiguousarray(self.data[:, idxs])
+        cube.offsets = self.offsets[:, idxs]
+        cube.lengths = self.lengths[:, idxs]
+        return cube
+
+    def drop_before(self, position: int):
+        """Remove the p-values at the positions before the given one from every curve."""
+        cuts = np.clip(position - self.offsets, 0, self.lengths)
+        for i, j in zip(*np.nonzero(cuts)):
+            cut, length = cuts[i, j], self.lengths[i, j]
+            self.data[i, j, :length - cut] = self.data[i, j, cut:length]
+            self.data[i, j, length - cut:length] = np.nan
+        self.offsets = self.offsets + cuts
+        self.lengths = self.lengths - cuts
+        self._frame = None
+
+    def append(self, index: Index, data: np.ndarray):
+        """
+        Add the p-values of new positions, with shape (columns x curves x
+        len(index)) and NaN where there is none yet. Every curve must end at
+        the last position of the series (as the forward ones), or be empty.
+        """
+        n, m = self._n, len(index)
+        if np.any((self.lengths > 0) & (self.offsets + self.lengths != n)):
+            msg = 'Only the curves that end at the last position of the series can be extended.'
+            raise ValueError(msg)
+
+        data = np.asarray(data, dtype=self.dtype)
+        # An empty curve starts at its first new p-value
+        has_ps = ~np.isnan(data)
+        starts = np.where(self.lengths > 0, 0, np.where(has_ps.any(axis=2), has_ps.argmax(axis=2), m))
+        lengths = self.lengths + m - starts
+        self._widen(int(lengths.max(initial=0)), grow=True)
+        for i, j in zip(*np.nonzero(lengths > self.lengths)):
+            self.data[i, j, self.lengths[i, j]:lengths[i, j]] = data[i, j, starts[i, j]:]
+        self.offsets = np.where(self.lengths > 0, self.offsets, n + starts)
+        self.lengths = lengths
+        # Joined to the index when it is read, instead of copying it on every append
+        self._index_tail.append(index)
+        self._n += m
+        self._frame = None
+
+    def to_frame(self, cols: list[str]|None=None) -> DataFrame:
+        """The MultiIndex DataFrame of the given columns (all, if None), with the NaN padding."""
+        cols = self.cols if cols is None else list(cols)
+        idxs = [self.cols.index(col) for col in cols]
+        n_keys = len(self.keys)
+        full = np.full((len(cols) * n_keys, len(self.index)), np.nan, dtype=self.dtype)
+        for row, (i, j) in enumerate((i, j) for i in idxs for j in range(n_keys)):
+            offset, length = self.offsets[i, j], self.lengths[i, j]
+            full[row, offset:offset + length] = self.data[i, j, :length]
+        columns = pd.MultiIndex.from_tuples([(col, *key) for col in cols for key in self.keys])
+
+        return pd.DataFrame(full.T, index=self.index, columns=columns)
+
+    @property
+    def frame(self) -> DataFrame:
+        if self._frame is None:
+            self._frame = self.to_frame()
+        return self._frame
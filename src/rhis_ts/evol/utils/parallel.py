@@ -0,0 +1,225 @@
+"""Methods for evaluating the evolution of many columns concurrently."""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from rhis_ts.evol.methods import rhis_standard_evol, rhis_standard_evol_both, rhis_standard_window
+
+if TYPE_CHECKING:
+    from rhis_ts.evol.methods import Curve
+
+# Below this length the evolution of a column is too short to pay for starting processes
+PROCESS_MIN_LENGTH = 10000
+
+
+def choose_executor(n: int) -> str:
+    """
+    Choose between threads and processes from the length of the series.
+
+    Parameters
+    ----------
+        n
+            The number of elements of each series.
+
+    Return
+    ------
+        'thread' for short series, 'process' for long ones.
+    """
+    return 'process' if n >= PROCESS_MIN_LENGTH else 'thread'
+
+
+def col_evol(  # noqa: PLR0913
+        col: np.ndarray,
+        alpha: float,
+        sli_init: int,
+        stat: str|None,*,
+        direction: str,
+        window: int|None=None,
+        exact: bool|str=False,
+        compact: bool=False,
+        ) -> dict[np.ndarray | Curve | dict[np.ndarray | Curve]]:
+    """
+    Evaluate the RHIS evolution of a series (in the original order) in one
+    direction ('ba' or 'fo'), in both ('both'), or over a sliding window ('wi').
+    With exact, the small slices get exact p-values (not the windows). With
+    compact, the curves are Curve records, without the NaN padding.
+
+    Return
+    ------
+        A dict with the evolution of each direction ('ba', 'fo' or 'wi').
+    """
+    if direction == 'wi':
+        return {direction: rhis_standard_window(col, window, stat, compact=compact)}
+    if direction == 'both':
+        return rhis_standard_evol_both(col, alpha, sli_init, stat, exact=exact, compact=compact)
+
+    backwards = direction == 'ba'
+    ts_arr = col[::-1] if backwards else col
+    return {direction: rhis_standard_evol(
+        ts_arr, alpha, sli_init, stat, backwards=backwards, exact=exact, compact=compact)}
+
+
+def _shared_series_evol(  # noqa: PLR0913
+        shm_name: str,
+        bounds: tuple[int, int, int],
+        alpha: float,
+        sli_init: int,
+        stat: str|None,*,
+        direction: str,
+        window: int|None,
+        exact: bool|str,
+        compact: bool,
+        ) -> dict[np.ndarray | Curve | dict[np.ndarray | Curve]]:
+    size, start, end = bounds
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        buffer = np.ndarray((size,), dtype=np.float64, buffer=shm.buf)
+        series = buffer[start:end]
+        series.flags.writeable = False
+        evol = col_evol(
+            series, alpha, sli_init, stat, direction=direction, window=window, exact=exact, compact=compact)
+        del buffer, series
+    finally:
+        shm.close()
+
+    return evol
+
+
+def series_evol_parallel(  # noqa: PLR0913
+        series: list[np.ndarray],
+        alpha: float,
+        sli_inits: list[int],
+        stat: str|None,*,
+        direction: str,
+        workers: int|None,
+        executor: str|None=None,
+        window: int|None=None,
+        exact: bool|str=False,
+        compact: bool=False,
+        ) -> list[dict[np.ndarray | Curve | dict[np.ndarray | Curve]]]:
+    """
+    Evaluate the RHIS evolution of many series, of any lengths, concurrently.
+
+    The series are scheduled from the longest to the shortest, so the pool
+    is load-balanced by length. With processes, the series are copied once,
+    one after the other, to a shared memory block and each worker receives
+    only its name and the bounds of its series, so the data is not pickled.
+
+    Parameters
+    ----------
+        series
+            A list with 1D arrays, each with a time series in the original order.
+        alpha
+            The significance level.
+        sli_inits
+            The number of elements of the first slice of each series.
+        stat
+            One of ['min', 'mean', 'med', 'max', None].
+        direction
+            'ba', 'fo', 'both' or 'wi'.
+        workers
+            The maximum number of threads or processes. If None or 1, the series
+            are evaluated sequentially.
+        executor
+            'thread', 'process' or None, to choose from the length of the longest series.
+        window
+            The number of elements of each window, if direction is 'wi'.
+        exact
+            If 'auto' (or True), the small slices without ties get exact p-values.
+        compact
+            If True, the curves are Curve records, without the NaN padding.
+
+    Return
+    ------
+        A list with the evolution of each series, by direction, in the order of
+        the series.
+    """
+    series = [np.asarray(ts, dtype=np.float64) for ts in series]
+    lengths = [len(ts) for ts in series]
+    order = sorted(range(len(series)), key=lambda k: lengths[k], reverse=True)
+
+    if workers is None or workers <= 1:
+        return [
+            col_evol(ts, alpha, sli_init, stat, direction=direction, window=window, exact=exact, compact=compact)
+            for ts, sli_init in zip(series, sli_inits)
+            ]
+
+    executor = executor if executor is not None else choose_executor(max(lengths, default=0))
+    results = [None] * len(series)
+
+    if executor == 'thread':
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                k: pool.submit(
+                    col_evol, series[k], alpha, sli_inits[k], stat,
+                    direction=direction, window=window, exact=exact, compact=compact)
+                for k in order
+                }
+            for k, future in futures.items():
+                results[k] = future.result()
+        return results
+
+    ends = np.cumsum(lengths)
+    size = int(ends[-1]) if len(ends) else 0
+    shm = shared_memory.SharedMemory(create=True, size=max(size * 8, 1))
+    try:
+        buffer = np.ndarray((size,), dtype=np.float64, buffer=shm.buf)
+        if size:
+            buffer[:] = np.concatenate(series)
+        del buffer
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                k: pool.submit(
+                    _shared_series_evol, shm.name, (size, int(ends[k]) - lengths[k], int(ends[k])),
+                    alpha, sli_inits[k], stat, direction=direction, window=window, exact=exact, compact=compact)
+                for k in order
+                }
+            for k, future in futures.items():
+                results[k] = future.result()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return results
+
+
+def cols_evol_parallel(  # noqa: PLR0913
+        arr: np.ndarray,
+        alpha: float,
+        sli_init: int,
+        stat: str|None,*,
+        direction: str,
+        workers: int,
+        executor: str|None=None,
+        window: int|None=None,
+        exact: bool|str=False,
+        compact: bool=False,
+        ) -> list[dict[np.ndarray | Curve | dict[np.ndarray | Curve]]]:
+    """
+    Evaluate the RHIS evolution of every column of a 2D array concurrently,
+    with series_evol_parallel.
+
+    Parameters
+    ----------
+        arr
+            A 2D array with one time series per column, in the original order.
+        sli_init
+            The number of elements of the first slice.
+
+        The other parameters are the same as in series_evol_parallel.
+
+    Return
+    ------
+        A list with the evolution of each column, by direction, in the order of
+        the columns.
+    """
+    arr = np.asarray(arr, dtype=np.float64)
+    cols = [arr[:, j] for j in range(arr.shape[1])]
+
+    return series_evol_parallel(
+        cols, alpha, [sli_init] * len(cols), stat,
+        direction=direction, workers=workers, executor=executor, window=window, exact=exact, compact=compact)
@@ -45,6 +45,7 @@ def validate_plot_params(func):  # noqa: C901
                     'marker': str,
                     's': int,
                 },
+                'backwards': bool,
                 'rhis': bool,
                 'rhis_params': {
                     'alpha': float,
@@ -59,6 +60,10 @@ def validate_plot_params(func):  # noqa: C901
                     'linewidth': float,
                 },
                 'show_repr': bool,
+                'headless': bool,
+                'workers': int,
+                'pdf_path': str,
+                'decimate': bool,
                 'xlabel': str,
                 'ylabel': str,
             }
@@ -68,6 +73,8 @@ def validate_plot_params(func):  # noqa: C901
                         'tif', 'bmp', 'ps', 'raw',)
 
             for kw, val in kwargs.items():
+                if val is None and kw in ('backwards', 'workers', 'pdf_path'):
+                    continue
                 if isinstance(arg_types[kw], type):
                     if not isinstance(val, arg_types[kw]):
                         bool_type = arg_types[kw].__name__
@@ -123,7 +130,7 @@ def validate_plot_params(func):  # noqa: C901
 
 def validate_evol_params(func):  # noqa: C901
     @wraps(func)
-    def _validate_evol_params(*args, **kwargs):
+    def _validate_evol_params(*args, **kwargs):  # noqa: C901, PLR0912
         try:
             noself_args = args[1:]
             if noself_args:
@@ -136,9 +143,19 @@ def validate_evol_params(func):  # noqa: C901
                 'stat': ('min', 'max', 'mean', 'med',),
                 'alpha': float,
                 'backwards': bool,
+                'direction': ('ba', 'fo', 'both',),
+                'window': int,
+                'workers': int,
+                'executor': ('thread', 'process',),
+                'dtype': ('float64', 'float32',),
+                'exact': (False, True, 'auto',),
+                'profile': bool,
             }
 
             for kw, val in kwargs.items():
+                if kw in ('cols', 'stat', 'direction', 'window', 'workers', 'executor') and val is None:
+                    continue
+
                 if isinstance(arg_types[kw], tuple):
                     if kw == 'stat' and val not in arg_types[kw]:
                         msg = (
@@ -146,7 +163,32 @@ def validate_evol_params(func):  # noqa: C901
                             f"should be one of these: 'min', 'max', 'mean', or 'med'.")
                         raise ValueError(msg)
 
-                    elif kw != 'stat' and not isinstance(val, tuple) or not all(isinstance(col, str) for col in val):
+                    elif kw == 'executor' and val not in arg_types[kw]:
+                        msg = (
+                            f"The value '{val}' is invalid. The parameter 'executor' "
+                            f"should be one of these: 'thread' or 'process'.")
+                        raise ValueError(msg)
+
+                    elif kw == 'exact' and not any(val is option for option in (False, True)) and val != 'auto':
+                        msg = (
+                            f"The value '{val}' is invalid. The parameter 'exact' "
+                            f"should be one of these: False, True, or 'auto'.")
+                        raise ValueError(msg)
+
+                    elif kw == 'dtype' and val not in arg_types[kw]:
+                        msg = (
+                            f"The value '{val}' is invalid. The parameter 'dtype' "
+                            f"should be one of these: 'float64' or 'float32'.")
+                        raise ValueError(msg)
+
+                    elif kw == 'direction' and val not in arg_types[kw]:
+                        msg = (
+                            f"The value '{val}' is invalid. The parameter 'direction' "
+                            f"should be one of these: 'ba', 'fo', or 'both'.")
+                        raise ValueError(msg)
+
+                    elif (kw not in ('stat', 'executor', 'direction', 'dtype', 'exact')
+                          and (not isinstance(val, tuple) or not all(isinstance(col, str) for col in val))):
                         msg = f"The value '{val}' is invalid. The parameter '{kw}' should be a tuple of strings."
                         raise ValueError(msg)
 
@@ -159,6 +201,19 @@ def validate_evol_params(func):  # noqa: C901
                             f"a {arg_types[kw].__name__} between 0 and 1.")
                     raise ValueError(msg)
 
+                elif kw == 'workers' and val < 1:
+                    msg = f"The value '{val}' is invalid. The parameter '{kw}' should be a positive int."
+                    raise ValueError(msg)
+
+                elif kw == 'window' and val < 3:  # noqa: PLR2004
+                    msg = f"The value '{val}' is invalid. The parameter '{kw}' should be an int of at least 3."
+                    raise ValueError(msg)
+
+                elif kw == 'window' and val > len(args[0].orig_df):
+                    msg = (f"The value '{val}' is invalid. The parameter '{kw}' should not be greater than "
+                           f"the number of rows of the dataframe ({len(args[0].orig_df)}).")
+                    raise ValueError(msg)
+
         except (Exception, ValueError) as exc:
             logger.exception(exc)
             return
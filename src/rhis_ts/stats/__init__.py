@@ -0,0 +1,21 @@
+"""
+The hypothesis tests of the RHIS analysis, importable without pandas,
+matplotlib or scipy (which is only imported for arrays of p-values).
+"""
+from __future__ import annotations
+
+from rhis_ts.stats.hypothesis import (
+    mann_kendall,
+    mann_kendall_evol,
+    mann_kendall_window,
+    mann_whitney,
+    mann_whitney_evol,
+    mann_whitney_window,
+    runs_test,
+    wald_wolfowitz,
+    wald_wolfowitz_evol,
+    wald_wolfowitz_window,
+    wallismoore,
+    wallismoore_evol,
+    wallismoore_window,
+)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from rhis_ts.stats.hypothesis.homogeneity import mann_whitney
-from rhis_ts.stats.hypothesis.independence import wald_wolfowitz
-from rhis_ts.stats.hypothesis.randomness import runs_test, wallismoore
-from rhis_ts.stats.hypothesis.stationarity import mann_kendall
+from rhis_ts.stats.hypothesis.homogeneity import mann_whitney, mann_whitney_evol, mann_whitney_window
+from rhis_ts.stats.hypothesis.independence import wald_wolfowitz, wald_wolfowitz_evol, wald_wolfowitz_window
+from rhis_ts.stats.hypothesis.randomness import runs_test, wallismoore, wallismoore_evol, wallismoore_window
+from rhis_ts.stats.hypothesis.stationarity import mann_kendall, mann_kendall_evol, mann_kendall_window
@@ -4,10 +4,14 @@ from collections import namedtuple
 from typing import TYPE_CHECKING
 
 import numpy as np
-import scipy.stats as sts
 
-from rhis_ts.stats.utils.ranks import ranks_ties_corrected
+from rhis_ts.stats.utils.exact import MW_MAX_N, mann_whitney_exact
+from rhis_ts.stats.utils.order_stats import RankCounter, ValueCounter
+from rhis_ts.stats.utils.p_value import normal_sf
+from rhis_ts.stats.utils.ranks import rank_ties
+from rhis_ts.utils.arrays import constant_windows
 from rhis_ts.utils.data import break_list_in_equal_parts
+from rhis_ts.utils.profiling import profiled
 
 if TYPE_CHECKING:
     from rhis_ts.types.stats import TestResults
@@ -21,6 +25,7 @@ def mann_whitney(  # noqa: PLR0913
         *,
         continuity: bool=True,
         ties: bool=True,
+        exact: bool | str=False,
         ) -> TestResults:
     """
     Compare two independent groups of data using the Mann-Whitney U test.
@@ -70,6 +75,10 @@ def mann_whitney(  # noqa: PLR0913
             If True, applies correction for continuity.
         ties
             If True, applies correction for ties.
+        exact
+            If 'auto' (or True), the p-value of groups without ties and with up
+            to 20 elements each comes from the exact distribution of U instead
+            of the normal approximation.
 
     Returns
     -------
@@ -83,25 +92,24 @@ def mann_whitney(  # noqa: PLR0913
         x = data[0]
         y = data[1]
 
-    g1 = x[:] if isinstance(x, list) else x[:].tolist()
-    g2 = y[:] if isinstance(y, list) else y[:].tolist()
-
-    gs_concat = g1 + g2
-    gs_sorted = np.sort(gs_concat)
+    g1 = np.asarray(x, dtype=float)
+    g2 = np.asarray(y, dtype=float)
+    gs_concat = np.concatenate([g1, g2])
 
     Results = namedtuple('MannWhitney', ['statistic', 'p_value', 'reject', 'alternative'])  # noqa: PYI024
-    if np.all(gs_sorted == gs_sorted[0]):
+    if np.all(gs_concat == gs_concat[0]):
         reject = False
         return Results(0, 1., reject, alternative)
 
     n = len(gs_concat)
-    ranks = np.sort(ranks_ties_corrected(gs_concat)) if ties else [i + 1 for i in range(n)]
-    ranks_dict = dict(zip(gs_sorted, ranks))
-    g1_ranks = [ ranks_dict[value] for value in g1 ]
-    g2_ranks = [ ranks_dict[value] for value in g2 ]
+    if ties:
+        ranks = rank_ties(gs_concat, indexes=False).ranks
+    else:
+        # Equal values share the highest of their ordinal ranks
+        ranks = np.searchsorted(np.sort(gs_concat), gs_concat, side='right')
 
-    rank_sum1 = sum(g1_ranks)
-    rank_sum2 = sum(g2_ranks)
+    rank_sum1 = np.sum(ranks[:len(g1)])
+    rank_sum2 = np.sum(ranks[len(g1):])
 
     n1 = len(g1)
     n2 = len(g2)
@@ -114,7 +122,7 @@ def mann_whitney(  # noqa: PLR0913
     var = (n1 * n2 * (n1 + n2 + 1)) / 12
 
     if ties:
-        var = ((n1 * n2) / ((n) * (n - 1))) * np.sum(np.array(ranks) ** 2) \
+        var = ((n1 * n2) / ((n) * (n - 1))) * np.sum(ranks ** 2) \
             - ((n1 * n2 * (n + 1) ** 2) / (4 * (n - 1)))
 
     z = abs(stat - mean_stat) / np.sqrt(var)
@@ -122,10 +130,13 @@ def mann_whitney(  # noqa: PLR0913
     if continuity:
         z = (abs(stat - mean_stat) - 0.5) / np.sqrt(var)
 
-    p = (1 - sts.norm.cdf(z))
+    p = float(normal_sf(z))
+    use_exact = exact and max(n1, n2) <= MW_MAX_N and len(np.unique(gs_concat)) == n
+    if use_exact:
+        p = float(mann_whitney_exact(u1, n1, n2, alternative))
 
     if alternative == 'two-sided':
-        p = p * 2
+        p = p if use_exact else p * 2
         reject = p < alpha
     if alternative == 'less':
         reject = rank_sum1 < rank_sum2 and p < alpha
@@ -135,10 +146,267 @@ def mann_whitney(  # noqa: PLR0913
     return Results(stat, round(p, 4), reject, alternative)
 
 
+class MannWhitneyIncremental:
+    """
+    Running state of the Mann-Whitney test on the two halves of a series that
+    grows one observation at a time.
+
+    The first half holds the ceil(n / 2) oldest observations, as in
+    break_list_in_equal_parts. Each half has its own counter (a RankCounter
+    over dense ranks, or a ValueCounter over the values themselves), so the
+    U statistic of the first half and the ties statistic sum(t^3 - t) are
+    updated in O(log n) per appended or removed observation and per shift of
+    the boundary between the halves.
+
+    Parameters
+    ----------
+        first
+            An empty counter for the first half.
+        second
+            An empty counter for the second half.
+    """
+
+    def __init__(self, first: RankCounter | ValueCounter, second: RankCounter | ValueCounter):
+        self.first = first
+        self.second = second
+        self.history = []
+        self.start = 0
+        self.n = 0
+        self.u_first = 0.
+        self.ties_sum = 0
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> MannWhitneyIncremental:
+        """
+        The state after appending the given values (not ranks), computed at
+        once, with ValueCounters.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        n1 = (len(values) + 1) // 2
+        second = np.sort(values[n1:])
+        state = cls(ValueCounter.from_values(values[:n1]), ValueCounter.from_values(second))
+        state.history = values.tolist()
+        state.n = len(values)
+
+        # Pairs with the higher observation in the first half, plus half of the tied pairs
+        less = np.searchsorted(second, values[:n1], side='left')
+        equal = np.searchsorted(second, values[:n1], side='right') - less
+        state.u_first = float(np.sum(less) + 0.5 * np.sum(equal))
+        t = np.unique(values, return_counts=True)[1].astype(np.int64)
+        state.ties_sum = int(np.sum(t ** 3 - t))
+        return state
+
+    def append(self, rank: float):
+        """Add an observation, given by its rank or value, to the end of the second half."""
+        self.history.append(rank)
+        equal = self.first.count_equal(rank) + self.second.count_equal(rank)
+        # t^3 - t grows by 3t(t + 1) when a tie group goes from t to t + 1
+        self.ties_sum += 3 * equal * (equal + 1)
+
+        self.u_first += self.first.count_greater(rank) + 0.5 * self.first.count_equal(rank)
+        self.second.add(rank)
+        self.n += 1
+
+        if self.first.total < (self.n + 1) // 2:
+            self._shift_boundary()
+
+    def remove_first(self):
+        """
+        Remove the oldest observation from the first half. The boundary is
+        restored on the next append, as in a sliding window.
+        """
+        rank = self.history[self.start]
+        self.first.add(rank, -1)
+        self.u_first -= self.second.count_less(rank) + 0.5 * self.second.count_equal(rank)
+
+        equal = self.first.count_equal(rank) + self.second.count_equal(rank)
+        # t^3 - t shrinks by 3t(t - 1) when a tie group goes from t to t - 1
+        self.ties_sum -= 3 * (equal + 1) * equal
+        self.start += 1
+        self.n -= 1
+
+    def _shift_boundary(self):
+        """Move the oldest observation of the second half to the first half."""
+        rank = self.history[self.start + self.first.total]
+        self.u_first -= self.first.count_greater(rank) + 0.5 * self.first.count_equal(rank)
+        self.second.add(rank, -1)
+
+        self.u_first += self.second.count_less(rank) + 0.5 * self.second.count_equal(rank)
+        self.first.add(rank)
+
+
+@profiled('p_values')
+def mann_whitney_p_values(  # noqa: PLR0913
+        u_first: np.ndarray,
+        n1: np.ndarray,
+        n2: np.ndarray,
+        ties_sum: np.ndarray,
+        alternative: str='two-sided',*,
+        continuity: bool=True,
+        exact: bool | str=False,
+        ) -> np.ndarray:
+    """
+    Vectorized Mann-Whitney p-values, corrected for ties, from the U statistic
+    of the first group, the size of each group and sum(t^3 - t) over the tie
+    groups of many pairs of groups. With exact, the pairs without ties and
+    with up to MW_MAX_N elements in each group get exact p-values.
+
+    Return
+    ------
+        An array with the p-values, in the same order as the inputs.
+    """
+    u_first = np.asarray(u_first, dtype=float)
+    n1 = np.asarray(n1, dtype=float)
+    n2 = np.asarray(n2, dtype=float)
+    n = n1 + n2
+
+    stat = np.minimum(u_first, n1 * n2 - u_first)
+    mean_stat = (n1 * n2) / 2
+
+    # Sum of the squared average ranks: sum(i^2) minus the ties correction
+    ranks_sq_sum = n * (n + 1) * (2 * n + 1) / 6 - np.asarray(ties_sum, dtype=float) / 12
+    var = ((n1 * n2) / (n * (n - 1))) * ranks_sq_sum - ((n1 * n2 * (n + 1) ** 2) / (4 * (n - 1)))
+
+    num = np.abs(stat - mean_stat) - 0.5 if continuity else np.abs(stat - mean_stat)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = num / np.sqrt(var)
+
+    p = normal_sf(z)
+    p = p * 2 if alternative == 'two-sided' else p
+
+    if exact:
+        small = np.broadcast_to(
+            (np.asarray(ties_sum) == 0) & (n1 <= MW_MAX_N) & (n2 <= MW_MAX_N) & (n1 > 0) & (n2 > 0), np.shape(p))
+        if np.any(small):
+            p = np.array(p, dtype=float)
+            u_first, n1, n2 = np.broadcast_arrays(u_first, n1, n2)
+            p[small] = mann_whitney_exact(u_first[small], n1[small], n2[small], alternative)
+
+    return p
+
+
+def mann_whitney_evol(  # noqa: PLR0913
+        ts: list[int | float] | np.ndarray[int | float],
+        sli_init: int,
+        alternative: str='two-sided',*,
+        continuity: bool=True,
+        ranks: np.ndarray | None=None,
+        exact: bool | str=False,
+        ) -> np.ndarray:
+    """
+    Apply the Mann-Whitney test to the two halves of every prefix of a time
+    series, from the one with sli_init elements to the complete series.
+
+    The prefixes are not split and re-ranked one by one. Each observation is
+    appended to a MannWhitneyIncremental state, so the whole evolution costs
+    O(n log n) instead of O(n^2 log n). Ranks are always corrected for ties.
+    Constant prefixes have p-value 1, as in mann_whitney.
+
+    Parameters
+    ----------
+        ts
+            A time series to be tested.
+        sli_init
+            The number of elements of the first prefix (at least 2).
+        alternative
+            'two-sided', 'greater', or 'less'.
+        continuity
+            If True, applies correction for continuity.
+        ranks
+            The dense ranks of ts (e.g., rank_ties(ts).groups), if already
+            computed.
+        exact
+            If 'auto' (or True), the prefixes without ties and with up to 20
+            elements in each half get exact p-values.
+
+    Return
+    ------
+        An array with the p-values of each prefix (not rounded).
+    """
+    arr = np.asarray(ts, dtype=float)
+    if ranks is None:
+        ranks = rank_ties(arr, indexes=False).groups
+    size = int(ranks.max()) + 1 if len(ranks) else 0
+    state = MannWhitneyIncremental(RankCounter(size), RankCounter(size))
+
+    n_prefixes = len(arr) - sli_init + 1
+    u_first = np.zeros(n_prefixes)
+    n1 = np.zeros(n_prefixes)
+    ties_sum = np.zeros(n_prefixes)
+    for i, rank in enumerate(ranks.tolist()):
+        state.append(rank)
+        k = i - sli_init + 1
+        if k >= 0:
+            u_first[k] = state.u_first
+            n1[k] = state.first.total
+            ties_sum[k] = state.ties_sum
+
+    n = np.arange(sli_init, len(arr) + 1)
+    p = mann_whitney_p_values(u_first, n1, n - n1, ties_sum, alternative, continuity=continuity, exact=exact)
+
+    # A prefix is constant while it does not reach the first value different from ts[0]
+    not_constant = np.flatnonzero(arr != arr[0])
+    constant_until = not_constant[0] if len(not_constant) else len(arr)
+
+    return np.where(n <= constant_until, 1., p)
+
+
+def mann_whitney_window(
+        ts: list[int | float] | np.ndarray[int | float],
+        window: int,
+        alternative: str='two-sided',*,
+        continuity: bool=True,
+        ) -> np.ndarray:
+    """
+    Apply the Mann-Whitney test to the two halves of every window of a fixed
+    number of consecutive elements, from the first to the last one.
+
+    Each step removes the oldest observation from a MannWhitneyIncremental
+    state and appends the newest, which also moves the boundary between the
+    halves, so the whole curve costs O(n log n). Ranks are always corrected
+    for ties. Constant windows have p-value 1, as in mann_whitney.
+
+    Parameters
+    ----------
+        ts
+            A time series to be tested.
+        window
+            The number of elements of each window (at least 2).
+        alternative
+            'two-sided', 'greater', or 'less'.
+        continuity
+            If True, applies correction for continuity.
+
+    Return
+    ------
+        An array with the p-values of each window (not rounded).
+    """
+    arr = np.asarray(ts, dtype=float)
+    ranks = rank_ties(arr, indexes=False).groups
+    size = int(ranks.max()) + 1 if len(ranks) else 0
+    state = MannWhitneyIncremental(RankCounter(size), RankCounter(size))
+
+    n_windows = len(arr) - window + 1
+    u_first = np.zeros(n_windows)
+    ties_sum = np.zeros(n_windows)
+    for i, rank in enumerate(ranks.tolist()):
+        if i >= window:
+            state.remove_first()
+        state.append(rank)
+        k = i - window + 1
+        if k >= 0:
+            u_first[k] = state.u_first
+            ties_sum[k] = state.ties_sum
+
+    n1 = (window + 1) // 2
+    p = mann_whitney_p_values(u_first, n1, window - n1, ties_sum, alternative, continuity=continuity)
+
+    return np.where(constant_windows(arr, window), 1., p)
+
+
 if __name__ == "__main__":
-    from rhis_ts.utils.data import slices_to_evol
+    from rhis_ts.utils.data import iter_prefixes
 
     data = [2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 4, 2, 5, 3, 10, 9, 9.5, 3.4, 5.7, 2.5, 7, 4.3, 11]
-    tss = slices_to_evol(data)
-    for ts in tss:
+    for ts in iter_prefixes(data, 5):
         print(mann_whitney(ts).p_value)
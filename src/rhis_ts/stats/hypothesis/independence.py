@@ -4,14 +4,25 @@ from collections import namedtuple
 from typing import TYPE_CHECKING
 
 import numpy as np
-import scipy.stats as sts
 
+from rhis_ts.stats.utils.p_value import p_value_normal, p_values_normal
 from rhis_ts.stats.utils.ranks import ranks_ties_corrected, to_ranks
+from rhis_ts.utils.arrays import constant_windows
+from rhis_ts.utils.data import iter_prefixes
+from rhis_ts.utils.profiling import profiled
 
 if TYPE_CHECKING:
     from rhis_ts.types.data import TimeSeriesFlex
     from rhis_ts.types.stats import TestResults
 
+# The prefixes or windows whose n * mean^2 (from their shift) exceed this many times
+# their sum of squared deviations lose digits in c2 and c4, so they are centred again
+CENTRING_RATIO = 100.
+# The same ratio for the groups of prefixes shifted by a common mean in wald_wolfowitz_evol.
+# It is lower because a single dominant value (e.g., an outlying first one) makes the
+# variance of the statistic cancel, which amplifies any digit lost in c2 and c4
+PREFIX_CENTRING_RATIO = 2.
+
 
 def wald_wolfowitz(
         ts: TimeSeriesFlex,
@@ -81,17 +92,349 @@ def wald_wolfowitz(
         return Results(0, 0., reject)
 
     z = abs((r - e_r) / np.sqrt(var_r))
-    p = 2 * (1 - sts.norm.cdf(z))
+    p = 2 * p_value_normal(z)
 
     reject = p < alpha
 
     return Results(r, round(p, 4), reject)
 
-if __name__ == "__main__":
-    from rhis_ts.utils.data import slices_to_evol
 
+def wald_wolfowitz_evol(
+        ts: TimeSeriesFlex,
+        sli_init: int,*,
+        on_ranks: bool = False,
+        ties: bool = True,
+        ) -> np.ndarray:
+    """
+    Apply the Wald & Wolfowitz test to every prefix of a time series, from
+    the one with sli_init elements to the complete series.
+
+    The mean, the lag-1 products (plus the wrap-around term), s2 and s4 of
+    every prefix are derived from running sums of x, x^2, x^3, x^4 and
+    x[i] * x[i + 1], so the whole evolution is O(n) vectorized NumPy. The
+    series is shifted by its first value beforehand to limit cancellation in the
+    power sums. The prefixes whose mean is far from that shift, relative to
+    their spread (e.g., after an outlying first value), are shifted again by
+    their mean (see _recentred_prefix_sums), as in wald_wolfowitz. Constant
+    prefixes and prefixes with near-zero variance are rejected with p-value 0,
+    as in wald_wolfowitz.
+
+    Parameters
+    ----------
+        ts
+            A time series to be tested.
+        sli_init
+            The number of elements of the first prefix (at least 3).
+        on_ranks
+            If True, the test will be applied on the ranks. The ranks change
+            with every prefix, so each prefix is tested with wald_wolfowitz.
+        ties
+            If True and on_ranks is True, the ranks will be corrected for ties.
+
+    Return
+    ------
+        An array with the p-values of each prefix (not rounded).
+    """
+    arr = np.asarray(ts, dtype=float)
+    n_total = len(arr)
+
+    if on_ranks:
+        ps = [wald_wolfowitz(sli, on_ranks=True, ties=ties).p_value for sli in iter_prefixes(arr, sli_init)]
+        return np.array(ps, dtype=float)
+
+    x = arr - arr[0]
+    x2 = x ** 2
+    sums = (
+        np.cumsum(x)[sli_init - 1:],
+        np.cumsum(x2)[sli_init - 1:],
+        np.cumsum(x2 * x)[sli_init - 1:],
+        np.cumsum(x2 ** 2)[sli_init - 1:],
+        )
+    lag_products = np.cumsum(x[:-1] * x[1:])[sli_init - 2:]
+    n = np.arange(sli_init, n_total + 1, dtype=float)
+
+    # A prefix is constant while it does not reach the first value different from ts[0]
+    not_constant = np.flatnonzero(arr != arr[0])
+    constant_until = not_constant[0] if len(not_constant) else n_total
+    constant = n <= constant_until
+
+    first = np.full(len(n), x[0])
+    last = x[sli_init - 1:].copy()
+    mean_squares = sums[0] ** 2 / n
+    idxs = np.flatnonzero(~constant & (mean_squares > PREFIX_CENTRING_RATIO * (sums[1] - mean_squares)))
+    if len(idxs):
+        recentred = _recentred_prefix_sums(arr, idxs + sli_init)
+        for values, shifted in zip((*sums, lag_products, first, last), recentred):
+            values[idxs] = shifted
+
+    return wald_wolfowitz_p_values(n, sums, lag_products, first, last, constant=constant)
+
+
+def _recentred_prefix_sums(arr: np.ndarray, lengths: np.ndarray) -> tuple:
+    """
+    The sums of x, x^2, x^3, x^4 and x[i] * x[i + 1], and the first and last
+    x, of the prefixes with the given (increasing) lengths, with x the prefix
+    shifted by a mean close to its own.
+
+    The lengths are split into groups of up to twice the shortest one, and
+    each group is shifted by the mean of its longest prefix, so the groups
+    cost O(n) in total. The prefixes still far from their shift are centred on
+    their own mean one by one.
+    """
+    recentred = tuple(np.empty(len(lengths)) for _ in range(7))
+    lo = 0
+    while lo < len(lengths):
+        hi = max(int(np.searchsorted(lengths, 2 * lengths[lo])), lo + 1)
+        group = lengths[lo:hi]
+        x = arr[:group[-1]] - arr[:group[-1]].mean()
+        x2 = x ** 2
+        lags = np.zeros(len(x))
+        np.cumsum(x[:-1] * x[1:], out=lags[1:])
+        powers = (x, x2, x2 * x, x2 ** 2)
+        group_sums = (*(np.cumsum(power)[group - 1] for power in powers), lags[group - 1], x[0], x[group - 1])
+        for values, group_values in zip(recentred, group_sums):
+            values[lo:hi] = group_values
+        lo = hi
+
+    mean_squares = recentred[0] ** 2 / lengths
+    for i in np.flatnonzero(mean_squares > CENTRING_RATIO * (recentred[1] - mean_squares)):
+        x = arr[:lengths[i]] - arr[:lengths[i]].mean()
+        x2 = x ** 2
+        centred = (x.sum(), x2.sum(), (x2 * x).sum(), (x2 ** 2).sum(), np.dot(x[:-1], x[1:]), x[0], x[-1])
+        for values, value in zip(recentred, centred):
+            values[i] = value
+
+    return recentred
+
+
+@profiled('p_values')
+def wald_wolfowitz_p_values(  # noqa: PLR0913
+        n: np.ndarray,
+        sums: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        lag_products: np.ndarray,
+        first: np.ndarray,
+        last: np.ndarray,*,
+        constant: np.ndarray,
+        ) -> np.ndarray:
+    """
+    Vectorized Wald & Wolfowitz p-values from the running sums of many series.
+
+    Parameters
+    ----------
+        n
+            The number of observations of each series.
+        sums
+            The sums of x, x^2, x^3 and x^4 of each series.
+        lag_products
+            The sums of x[i] * x[i + 1] of each series.
+        first, last
+            The first and the last observation of each series.
+        constant
+            Whether each series is constant (rejected with p-value 0).
+
+    Return
+    ------
+        An array with the p-values, in the same order as the inputs.
+    """
+    s1, s2, s3, s4 = sums
+    avg = s1 / n
+
+    # sum((x[i] - avg) * (x[i + 1] - avg)) over i < n - 1, plus (x[0] - avg) * (x[-1] - avg)
+    r = lag_products - avg * (2 * s1 - first - last) + (n - 1) * avg ** 2 \
+        + (first - avg) * (last - avg)
+
+    c2 = s2 - n * avg ** 2
+    c4 = s4 - 4 * avg * s3 + 6 * avg ** 2 * s2 - 3 * n * avg ** 4
+
+    e_r = - c2 / (n - 1)
+
+    a = (c2 ** 2 - c4) / (n - 1)
+    b = (c2 ** 2 - 2 * c4) / ((n - 1) * (n - 2))
+
+    c = c2 ** 2 / (n - 1) ** 2
+    var_r = a + b - c
+    var_lim = 0.00001
+    rejected = (np.abs(var_r) < var_lim) | constant
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.abs((r - e_r) / np.sqrt(var_r))
+    p = p_values_normal(z)
+
+    return np.where(rejected, 0., p)
+
+
+class WaldWolfowitzIncremental:
+    """
+    Running sums of the Wald & Wolfowitz test for a series that grows one
+    observation at a time, updated in O(1) per appended observation.
+
+    The observations are shifted by the first one, as in wald_wolfowitz_evol.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.shift = 0.
+        self.sums = [0., 0., 0., 0.]
+        self.lag_products = 0.
+        self.last = 0.
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> WaldWolfowitzIncremental:
+        """The state after appending the given values, computed at once."""
+        values = np.asarray(values, dtype=np.float64)
+        state = cls()
+        state.n = len(values)
+        if state.n:
+            state.shift = float(values[0])
+            x = values - state.shift
+            x2 = x ** 2
+            state.sums = [float(np.sum(power)) for power in (x, x2, x2 * x, x2 ** 2)]
+            state.lag_products = float(np.dot(x[:-1], x[1:]))
+            state.last = float(x[-1])
+        return state
+
+    def append(self, value: float):
+        """Add an observation to the end of the series."""
+        if self.n == 0:
+            self.shift = value
+        x = value - self.shift
+        x2 = x ** 2
+
+        self.lag_products += self.last * x
+        for i, power in enumerate((x, x2, x2 * x, x2 ** 2)):
+            self.sums[i] += power
+        self.last = x
+        self.n += 1
+
+    def p_value(self,*, constant: bool) -> float:
+        """The p-value of the series so far (not rounded)."""
+        return float(wald_wolfowitz_p_values(
+            np.float64(self.n), tuple(self.sums), self.lag_products, 0., self.last, constant=constant))
+
+
+def _block_window_sums(arr: np.ndarray, window: int) -> tuple:
+    """
+    The sums of x, x^2, x^3, x^4 and x[i] * x[i + 1] of every window, with x
+    the window shifted by the median of the block of window elements where it
+    starts, and the shifted first and last elements.
+
+    Each window is the suffix of one block plus the prefix of the next one, so
+    its sums only add its own elements: unlike differences of running sums, a
+    large value outside of a window does not cancel its sums.
+    """
+    n = len(arr)
+    n_blocks = -(-n // window)
+    padded = np.zeros(n_blocks * window + 1)
+    padded[:n] = arr
+    blocks = padded[:-1].reshape(n_blocks, window)
+    # The element after each one (the next block for the last element of a block)
+    nexts = padded[1:].reshape(n_blocks, window)
+    # The block after each block, zero after the last one (no window reaches it)
+    following = np.vstack((blocks[1:], np.zeros(window)))
+
+    shifts = np.empty(n_blocks)
+    shifts[:-1] = np.median(blocks[:-1], axis=1)
+    shifts[-1] = np.median(arr[(n_blocks - 1) * window:])
+    x = blocks - shifts[:, None]
+    y = following - shifts[:, None]
+
+    starts = np.arange(n - window + 1)
+    k, offset = starts // window, starts % window
+
+    def suffix(values: np.ndarray) -> np.ndarray:
+        return np.cumsum(values[:, ::-1], axis=1)[:, ::-1][k, offset]
+
+    def prefix(values: np.ndarray) -> np.ndarray:
+        cum = np.zeros((n_blocks, window + 1))
+        np.cumsum(values, axis=1, out=cum[:, 1:])
+        return cum[k, offset]
+
+    x2, y2 = x ** 2, y ** 2
+    sums = tuple(
+        suffix(x_power) + prefix(y_power)
+        for x_power, y_power in ((x, y), (x2, y2), (x2 * x, y2 * y), (x2 ** 2, y2 ** 2))
+        )
+
+    # The lag products inside each block, the one across its end (only in the windows
+    # that do not start a block) and the ones inside the prefix of the next block
+    inner = np.zeros((n_blocks, window))
+    inner[:, :-1] = x[:, :-1] * x[:, 1:]
+    across = x[:, -1] * (nexts[:, -1] - shifts)
+    following_lags = np.zeros((n_blocks, window))
+    following_lags[:, 1:] = y[:, :-1] * y[:, 1:]
+    lag_products = suffix(inner) + np.where(offset > 0, across[k], 0.) \
+        + prefix(following_lags)
+
+    first = arr[starts] - shifts[k]
+    last = arr[starts + window - 1] - shifts[k]
+
+    return sums, lag_products, first, last
+
+
+def _centred_window_sums(arr: np.ndarray, window: int, idxs: np.ndarray) -> tuple:
+    """
+    The sums of _block_window_sums of the windows starting at idxs, each
+    centred on its own mean, in chunks of about 2^22 elements.
+    """
+    views = np.lib.stride_tricks.sliding_window_view(arr, window)
+    chunk = max(1, 2 ** 22 // window)
+    parts = []
+    for pos in range(0, len(idxs), chunk):
+        x = views[idxs[pos:pos + chunk]]
+        x = x - x.mean(axis=1, keepdims=True)
+        x2 = x ** 2
+        parts.append((
+            x.sum(axis=1), x2.sum(axis=1), (x2 * x).sum(axis=1), (x2 ** 2).sum(axis=1),
+            (x[:, :-1] * x[:, 1:]).sum(axis=1), x[:, 0], x[:, -1],
+            ))
+
+    return tuple(np.concatenate(part) for part in zip(*parts))
+
+
+def wald_wolfowitz_window(ts: TimeSeriesFlex, window: int) -> np.ndarray:
+    """
+    Apply the Wald & Wolfowitz test to every window of a fixed number of
+    consecutive elements, from the first to the last one.
+
+    The sums of each window are added from the running sums of two blocks of
+    window elements (see _block_window_sums), shifted by the median of the
+    first one, so the whole curve is O(n) vectorized NumPy and the sums of a
+    window never include the elements outside of it. The few windows whose
+    mean is far from the shift, relative to their spread (e.g., right after a
+    level shift), are centred on their own mean, as in wald_wolfowitz.
+    Constant windows and windows with near-zero variance are rejected with
+    p-value 0, as in wald_wolfowitz.
+
+    Parameters
+    ----------
+        ts
+            A time series to be tested.
+        window
+            The number of elements of each window (at least 3).
+
+    Return
+    ------
+        An array with the p-values of each window (not rounded).
+    """
+    arr = np.asarray(ts, dtype=float)
+    constant = constant_windows(arr, window)
+    sums, lag_products, first, last = _block_window_sums(arr, window)
+
+    mean_squares = sums[0] ** 2 / window
+    deviations = sums[1] - mean_squares
+    idxs = np.flatnonzero(~constant & (mean_squares > CENTRING_RATIO * deviations))
+    if len(idxs):
+        s1, s2, s3, s4, lags, firsts, lasts = _centred_window_sums(arr, window, idxs)
+        for values, centred in zip((*sums, lag_products, first, last), (s1, s2, s3, s4, lags, firsts, lasts)):
+            values[idxs] = centred
+
+    n = np.full(len(sums[0]), float(window))
+
+    return wald_wolfowitz_p_values(n, sums, lag_products, first, last, constant=constant)
+
+
+if __name__ == "__main__":
     data = [2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 4, 2, 5, 3, 10, 9, 9.5, 3.4, 5.7, 2.5, 7, 4.3, 11]
-    tss = slices_to_evol(data)
-    for ts in tss:
+    for ts in iter_prefixes(data, 5):
         print(wald_wolfowitz(ts, on_ranks=False).p_value)
 
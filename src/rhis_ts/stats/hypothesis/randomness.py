@@ -5,14 +5,23 @@ from typing import TYPE_CHECKING
 
 import numpy as np
 
-from rhis_ts.stats.utils.p_value import test_decision_normal
+from rhis_ts.stats.utils.exact import WM_MAX_N, wallis_moore_exact
+from rhis_ts.stats.utils.p_value import p_values_normal, test_decision_normal
+from rhis_ts.utils.arrays import constant_windows
+from rhis_ts.utils.profiling import profiled
 
 if TYPE_CHECKING:
     from rhis_ts.types.data import TimeSeriesFlex
     from rhis_ts.types.stats import TestResults
 
+# Built once, instead of on every call
+_RunsTestResults = namedtuple('Runs_Test', ['statistic', 'p_value', 'reject', 'alternative'])  # noqa: PYI024
+_WallisMooreResults = namedtuple('WallisMooreResult', ['statistic', 'p_value', 'reject', 'alternative'])  # noqa: PYI024
+_WallisMooreEvolResults = namedtuple('WallisMooreEvol', ['statistic', 'p_value'])  # noqa: PYI024
+_WallisMooreWindowResults = namedtuple('WallisMooreWindow', ['statistic', 'p_value'])  # noqa: PYI024
 
-def runs_test(  # noqa: C901
+
+def runs_test(
         ts: TimeSeriesFlex,
         alpha: float=0.05,
         alternative: str = 'two-sided',*,
@@ -63,48 +72,19 @@ def runs_test(  # noqa: C901
             The parameter 'reject' is of type bool. 'True' means the null hypothesis
             was reject.
     """
-    ts = np.array(ts) if isinstance(ts, list) else ts
-
-    median = np.median(np.array(ts))
-    up_runs_ones = []
-    down_runs_ones = []
-    signs = [] # +1 (higher than median); -1 (lower than median)
-    runs_per_group = []
-    for element in ts:
-        # Values equal to the median do not count
-        if element > median:
-            signs.append(1)
-        if element < median:
-            signs.append(-1)
-
-    Results = namedtuple('Runs_Test', ['statistic', 'p_value', 'reject', 'alternative'])  # noqa: PYI024
-    if not signs:
-        reject = True
-        return Results(0, 0.0, reject, alternative)
-
-    for i in range(1, len(signs)):
-        el = signs[i]
-        next_el = signs[i - 1]
-        if el < next_el:
-            up_runs_ones.append(1)
-        if el > next_el:
-            down_runs_ones.append(1)
-
-    if signs[0] > 0:
-        runs_per_group.append(np.sum(up_runs_ones))
-        runs_per_group.append(np.sum(down_runs_ones) + 1)
-    if signs[0] < 0:
-        runs_per_group.append(np.sum(up_runs_ones) + 1)
-        runs_per_group.append(np.sum(down_runs_ones))
-
-    signs1 = np.array(signs)
+    ts_arr = np.asarray(ts)
+    # +1 (higher than the median), -1 (lower than the median); values equal to the median do not count
+    signs = np.sign(ts_arr - np.median(ts_arr))
+    signs = signs[np.abs(signs) == 1]
 
-    positives = signs1[signs1 > 0]
-    negatives = signs1[signs1 < 0]
+    if not signs.size:
+        reject = True
+        return _RunsTestResults(0, 0.0, reject, alternative)
 
-    n1 = float(len(positives))
-    n2 = float(len(negatives))
-    stat = float(np.sum(runs_per_group))
+    n1 = float(np.count_nonzero(signs > 0))
+    n2 = float(len(signs)) - n1
+    # A run ends at every change of sign
+    stat = float(np.count_nonzero(np.diff(signs)) + 1)
 
     try:
         stat_mean = (((2. * n1 * n2) / (n1 + n2)) + 1.)
@@ -114,16 +94,17 @@ def runs_test(  # noqa: C901
         z = num_z / ((var_num / var_den) ** 0.5)
     except ZeroDivisionError:
         reject = True
-        return Results(0, 0.0, reject, alternative)
+        return _RunsTestResults(0, 0.0, reject, alternative)
 
     decision = test_decision_normal(stat, stat_mean, z, alternative, alpha)
-    return Results(stat, round(decision.p_value, 4), decision.reject, alternative)
+    return _RunsTestResults(stat, round(decision.p_value, 4), decision.reject, alternative)
 
 
 def wallismoore(
         ts: TimeSeriesFlex,
         alpha: float = 0.05,
-        alternative: str = 'two-sided',
+        alternative: str = 'two-sided',*,
+        exact: bool | str = False,
     ) -> TestResults:
     """
     Applies the Wallis and Moore (1941) runtest for randomness.
@@ -143,6 +124,10 @@ def wallismoore(
             sample number.
         alpha
             The significance level for the test.
+        exact
+            If 'auto' (or True), the p-value of a series without equal
+            neighbours and with up to 40 elements comes from the exact
+            distribution of the runs instead of the normal approximation.
 
     Return
     -------
@@ -151,73 +136,237 @@ def wallismoore(
             The parameter 'reject' is of type bool. 'True' means the null hypothesis
             was reject.
     """
-    ts_arr = np.array(ts)
-    Results = namedtuple('WallisMooreResult', ['statistic', 'p_value', 'reject', 'alternative'])  # noqa: PYI024
+    ts_arr = np.asarray(ts)
     if np.all(ts_arr == ts_arr[0]):
         reject = True
-        return Results(0, 0., reject, alternative)
-
-    #Group 1 (pluses for zeros)
-    signs1 = []
-    pluses1 = []
-    minuses1 = []
-    up_runs_ones = []
-
-    #Group 2 (minuses for zeros)
-    signs2 = []
-    pluses2 = []
-    minuses2 = []
-    down_runs_ones = []
-
-    for i in range(1, len(ts)):
-
-        if ts[i] < ts[i - 1]:
-            signs1.append(-1)
-            signs2.append(-1)
-            minuses1.append(1)
-            minuses2.append(1)
-
-        if ts[i] > ts[i - 1]:
-            signs1.append(1)
-            signs2.append(1)
-            pluses1.append(1)
-            pluses2.append(1)
-
-        if ts[i] == ts[i - 1]:
-            signs1.append(1)
-            signs2.append(-1)
-            pluses1.append(1)
-            minuses2.append(1)
-
-    for i in range(1, len(ts) - 1):
-        if signs1[i] != signs1[i - 1]:
-            up_runs_ones.append(1)
-        if signs2[i] != signs2[i - 1]:
-            down_runs_ones.append(1)
-
-    #Group 1
-    up_runs_ones_arr = np.array(up_runs_ones)
-    up_runs_ones_sum = np.sum(up_runs_ones_arr) + 1
-
-    #Group 2
-    down_runs_ones_arr = np.array(down_runs_ones)
-    down_runs_ones_sum = np.sum(down_runs_ones_arr) + 1
-
-    runs = (up_runs_ones_sum + down_runs_ones_sum) / 2.
-
-    n = len(ts)
+        return _WallisMooreResults(0, 0., reject, alternative)
+
+    diffs = np.diff(ts_arr)
+    runs = _wallismoore_runs(diffs)
+
+    n = len(ts_arr)
     expected_runs = (2. * n - 1.) / 3.
+    if exact and n <= WM_MAX_N and np.all(diffs != 0):
+        p = float(wallis_moore_exact(runs, n, alternative))
+        reject = p < alpha
+        if alternative == 'less':
+            reject = runs < expected_runs and reject
+        if alternative == 'greater':
+            reject = runs > expected_runs and reject
+        return _WallisMooreResults(runs, round(p, 4), reject, alternative)
+
     sigma = ((16. * n - 29.) / 90.) ** 0.5
     z = (runs - expected_runs) / sigma
 
     decision = test_decision_normal(runs, expected_runs, z, alternative, alpha)
-    return Results(runs, round(decision.p_value, 4), decision.reject, alternative)
+    return _WallisMooreResults(runs, round(decision.p_value, 4), decision.reject, alternative)
+
+
+def _wallismoore_runs(diffs: np.ndarray) -> float:
+    """
+    Average number of runs up and down, with ties counted as pluses in one
+    group and as minuses in the other.
+    """
+    # Group 1 (pluses for zeros) and Group 2 (minuses for zeros)
+    signs1 = diffs >= 0
+    signs2 = diffs > 0
+    up_runs = np.count_nonzero(signs1[1:] != signs1[:-1]) + 1
+    down_runs = np.count_nonzero(signs2[1:] != signs2[:-1]) + 1
+
+    return (up_runs + down_runs) / 2.
+
+
+def wallismoore_evol(
+        ts: TimeSeriesFlex,
+        sli_init: int,
+        alternative: str = 'two-sided',*,
+        exact: bool | str = False,
+    ) -> TestResults:
+    """
+    Apply the Wallis and Moore runtest to every prefix of a time series, from
+    the one with sli_init elements to the complete series.
+
+    The signs of the differences of a prefix do not change when the series is
+    extended, so the runs of every prefix come from cumulative sums of the
+    sign changes, in O(n). Constant prefixes are rejected with p-value 0, as
+    in wallismoore.
+
+    Parameters
+    ----------
+        ts
+            1D list or numpy array.
+        sli_init
+            The number of elements of the first prefix (at least 2).
+        alternative
+            'two-sided', 'greater', or 'less'.
+        exact
+            If 'auto' (or True), the prefixes without equal neighbours and with
+            up to 40 elements get exact p-values.
+
+    Return
+    ------
+        A namedtuple
+            ('WallisMooreEvol', ['statistic', 'p_value'])
+            Arrays with the runs and the p-values (not rounded) of each prefix.
+    """
+    ts_arr = np.asarray(ts, dtype=float)
+    n_total = len(ts_arr)
+    diffs = np.diff(ts_arr)
+
+    # Group 1 (pluses for zeros) and Group 2 (minuses for zeros)
+    signs1 = diffs >= 0
+    signs2 = diffs > 0
+    changes = (signs1[1:] != signs1[:-1]).astype(np.int64) + (signs2[1:] != signs2[:-1])
+    # The prefix with m elements has m - 1 signs, so its changes are in changes[:m - 2]
+    changes_cum = np.concatenate(([0], np.cumsum(changes)))[sli_init - 2:]
+    runs = changes_cum / 2. + 1.
+
+    n = np.arange(sli_init, n_total + 1, dtype=float)
+    # The prefix with m elements has a tie between neighbours if any of its m - 1 differences is 0
+    zero_diffs = np.concatenate(([0], np.cumsum(diffs == 0)))[sli_init - 1:]
+    p = wallismoore_p_values(runs, n, alternative, exact=exact, zero_diffs=zero_diffs)
+
+    # A prefix is constant while it does not reach the first value different from ts[0]
+    not_constant = np.flatnonzero(ts_arr != ts_arr[0])
+    constant_until = not_constant[0] if len(not_constant) else n_total
+    constant = n <= constant_until
+
+    return _WallisMooreEvolResults(np.where(constant, 0., runs), np.where(constant, 0., p))
+
+
+def wallismoore_window(
+        ts: TimeSeriesFlex,
+        window: int,
+        alternative: str = 'two-sided',
+    ) -> TestResults:
+    """
+    Apply the Wallis and Moore runtest to every window of a fixed number of
+    consecutive elements, from the first to the last one.
+
+    The runs of each window are differences of the cumulative sums of the
+    sign changes used in wallismoore_evol, so the whole curve is O(n).
+    Constant windows are rejected with p-value 0, as in wallismoore.
+
+    Parameters
+    ----------
+        ts
+            1D list or numpy array.
+        window
+            The number of elements of each window (at least 2).
+        alternative
+            'two-sided', 'greater', or 'less'.
+
+    Return
+    ------
+        A namedtuple
+            ('WallisMooreWindow', ['statistic', 'p_value'])
+            Arrays with the runs and the p-values (not rounded) of each window.
+    """
+    ts_arr = np.asarray(ts, dtype=float)
+    diffs = np.diff(ts_arr)
+
+    # Group 1 (pluses for zeros) and Group 2 (minuses for zeros)
+    signs1 = diffs >= 0
+    signs2 = diffs > 0
+    changes = (signs1[1:] != signs1[:-1]).astype(np.int64) + (signs2[1:] != signs2[:-1])
+    # A window with w elements has w - 1 signs and w - 2 sign changes
+    changes_cum = np.concatenate(([0], np.cumsum(changes)))
+    runs = (changes_cum[window - 2:] - changes_cum[:len(changes_cum) - window + 2]) / 2. + 1.
+
+    p = wallismoore_p_values(runs, np.full(len(runs), window), alternative)
+    constant = constant_windows(ts_arr, window)
+
+    return _WallisMooreWindowResults(np.where(constant, 0., runs), np.where(constant, 0., p))
+
+
+@profiled('p_values')
+def wallismoore_p_values(
+        runs: np.ndarray,
+        n: np.ndarray,
+        alternative: str='two-sided',*,
+        exact: bool | str=False,
+        zero_diffs: np.ndarray | int=0,
+        ) -> np.ndarray:
+    """
+    Vectorized Wallis and Moore p-values from the runs and the number of
+    observations of many series. With exact, the series without differences
+    equal to 0 (zero_diffs counts them) and with up to WM_MAX_N elements get
+    exact p-values.
+
+    Return
+    ------
+        An array with the p-values, in the same order as the inputs.
+    """
+    n = np.asarray(n, dtype=float)
+    expected_runs = (2. * n - 1.) / 3.
+    sigma = np.sqrt((16. * n - 29.) / 90.)
+    z = (runs - expected_runs) / sigma
+    p = p_values_normal(z, alternative)
+
+    if exact:
+        small = np.broadcast_to((np.asarray(zero_diffs) == 0) & (n <= WM_MAX_N), np.shape(p))
+        if np.any(small):
+            p = np.array(p, dtype=float)
+            runs, n = np.broadcast_arrays(runs, n)
+            p[small] = wallis_moore_exact(runs[small], n[small], alternative)
+
+    return p
+
+
+class WallisMooreIncremental:
+    """
+    Running state of the Wallis and Moore runtest for a series that grows one
+    observation at a time, updated in O(1) per appended observation.
+
+    Only the last observation, the signs of the last difference (ties as
+    pluses and as minuses) and the count of sign changes are kept.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.last = None
+        self.signs = None
+        self.changes = 0
+        self.zero_diffs = 0
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> WallisMooreIncremental:
+        """The state after appending the given values, computed at once."""
+        values = np.asarray(values, dtype=np.float64)
+        state = cls()
+        state.n = len(values)
+        if state.n:
+            state.last = float(values[-1])
+        diffs = np.diff(values)
+        if len(diffs):
+            # Group 1 (pluses for zeros) and Group 2 (minuses for zeros)
+            groups = (diffs >= 0, diffs > 0)
+            state.signs = tuple(bool(group[-1]) for group in groups)
+            state.changes = sum(int(np.count_nonzero(group[1:] != group[:-1])) for group in groups)
+            state.zero_diffs = int(np.count_nonzero(diffs == 0))
+        return state
+
+    def append(self, value: float):
+        """Add an observation to the end of the series."""
+        if self.last is not None:
+            # Group 1 (pluses for zeros) and Group 2 (minuses for zeros)
+            signs = (value >= self.last, value > self.last)
+            self.zero_diffs += value == self.last
+            if self.signs is not None:
+                self.changes += (signs[0] != self.signs[0]) + (signs[1] != self.signs[1])
+            self.signs = signs
+        self.last = value
+        self.n += 1
+
+    @property
+    def statistic(self) -> float:
+        """The average number of runs of the two groups."""
+        return self.changes / 2. + 1.
 
 
 if __name__ == "__main__":
-    from rhis_ts.utils.data import slices_to_evol
+    from rhis_ts.utils.data import iter_prefixes
 
     data = [2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 4, 2, 5, 3, 10, 9, 9.5, 3.4, 5.7, 2.5, 7, 4.3, 11]
-    tss = slices_to_evol(data)
-    for ts in tss:
+    for ts in iter_prefixes(data, 5):
         print(wallismoore(ts).p_value)
@@ -4,9 +4,12 @@ from collections import namedtuple
 from typing import TYPE_CHECKING
 
 import numpy as np
-import scipy.stats as sts
 
-from rhis_ts.stats.utils.ranks import ranks_ties_corrected
+from rhis_ts.stats.utils.exact import MK_MAX_N, mann_kendall_exact
+from rhis_ts.stats.utils.order_stats import RankCounter, ValueCounter, count_inversions
+from rhis_ts.stats.utils.p_value import normal_sf, p_value_normal
+from rhis_ts.stats.utils.ranks import rank_ties, ranks_ties_corrected
+from rhis_ts.utils.profiling import profiled
 
 if TYPE_CHECKING:
     from rhis_ts.types.stats import TestResults
@@ -15,7 +18,9 @@ if TYPE_CHECKING:
 def mann_kendall(
         ts: list[int|float] | np.ndarray[int|float],
         alpha: float=0.05,
-        alternative: str = 'two-sided',
+        alternative: str = 'two-sided',*,
+        method: str = 'mergesort',
+        exact: bool | str = False,
     ) -> TestResults:
     """
     Apply the Mann-Kendall test using the normal approximation,
@@ -41,6 +46,16 @@ def mann_kendall(
         alpha
             The significance level for the test. Default is 0.05.
 
+        method
+            'mergesort' (default) computes S by counting inversions with a
+            merge sort, in O(n log n). 'pairwise' builds every pairwise sign
+            difference, in O(n^2), and is kept as a reference implementation.
+
+        exact
+            If 'auto' (or True), the p-value of a series without ties and with
+            up to 40 elements comes from the exact distribution of S instead of
+            the normal approximation.
+
     Return
     ------
         namedtuple
@@ -50,20 +65,11 @@ def mann_kendall(
     """
     n = len(ts)
     ts = np.array(ts)
-    signs = []
 
-    for i in range(n - 1):
-        s = ts[i + 1] - ts[:i + 1]
-        signs.extend(np.sign(s))
-
-    signs_array = np.array(signs)
-    test_s = float(len(signs_array[signs_array > 0]) - len(signs_array[signs_array < 0]))
-
-    ties_data = ranks_ties_corrected(ts, ties_data=True)['ties_groups_count']
-
-    ties_factor = 0
-    for value in ties_data:
-        ties_factor += (value * (value - 1) * (2 * value + 5))
+    if method == 'pairwise':
+        test_s, ties_factor = _mann_kendall_s_pairwise(ts)
+    else:
+        test_s, ties_factor = _mann_kendall_s_mergesort(ts)
 
     sigma = ((1 / 18) * ((n * (n - 1.) * (2. * n + 5.)) - ties_factor)) ** 0.5
 
@@ -75,10 +81,13 @@ def mann_kendall(
     if test_s < condition_value:
         z = abs((test_s + 1.)/sigma)
 
-    p = (1 - sts.norm.cdf(z))
+    p = p_value_normal(z)
+    use_exact = exact and ties_factor == 0 and n <= MK_MAX_N
+    if use_exact:
+        p = float(mann_kendall_exact(test_s, n, alternative))
 
     if alternative == 'two-sided':
-        p = p * 2
+        p = p if use_exact else p * 2
         reject = p < alpha
     if alternative == 'less':
         reject = test_s < condition_value and p < alpha
@@ -88,3 +97,231 @@ def mann_kendall(
     Results = namedtuple('Mann_Kendall', ['statistic', 'p_value', 'reject', 'alternative'])  # noqa: PYI024
     return Results(test_s, round(p, 4), reject, alternative)
 
+
+def _mann_kendall_s_pairwise(ts: np.ndarray) -> tuple[float, int]:
+    """Mann-Kendall S and ties factor from every pairwise sign difference."""
+    n = len(ts)
+    signs = []
+
+    for i in range(n - 1):
+        s = ts[i + 1] - ts[:i + 1]
+        signs.extend(np.sign(s))
+
+    signs_array = np.array(signs)
+    test_s = float(len(signs_array[signs_array > 0]) - len(signs_array[signs_array < 0]))
+
+    ties_data = ranks_ties_corrected(ts, ties_data=True)['ties_groups_count']
+
+    ties_factor = 0
+    for value in ties_data:
+        ties_factor += (value * (value - 1) * (2 * value + 5))
+
+    return test_s, ties_factor
+
+
+def _mann_kendall_s_mergesort(ts: np.ndarray) -> tuple[float, int]:
+    """Mann-Kendall S and ties factor from the inversions of the series."""
+    n = len(ts)
+    rt = rank_ties(ts, indexes=False)
+    t = rt.ties_groups_count.astype(np.int64)
+
+    # Pairs are either increasing, decreasing (inversions) or tied
+    n_pairs = n * (n - 1) // 2
+    tied_pairs = int(np.sum(t * (t - 1) // 2))
+    test_s = float(n_pairs - tied_pairs - 2 * count_inversions(rt.groups))
+
+    ties_factor = int(np.sum(t * (t - 1) * (2 * t + 5)))
+
+    return test_s, ties_factor
+
+
+class MannKendallIncremental:
+    """
+    Running state of the Mann-Kendall test for a series that grows one
+    observation at a time.
+
+    The statistic S, the ties factor and the number of observations are
+    updated in O(log n) per appended or removed observation, using a
+    RankCounter over the dense ranks of the values.
+
+    Parameters
+    ----------
+        counter
+            A RankCounter sized to hold every rank that will be appended.
+    """
+
+    def __init__(self, counter: RankCounter):
+        self.counter = counter
+        self.n = 0
+        self.statistic = 0
+        self.ties_factor = 0
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> MannKendallIncremental:
+        """
+        The state after appending the given values (not ranks), computed at
+        once, with a ValueCounter.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        state = cls(ValueCounter.from_values(values))
+        state.n = len(values)
+        if state.n:
+            test_s, state.ties_factor = _mann_kendall_s_mergesort(values)
+            state.statistic = int(test_s)
+        return state
+
+    def append(self, rank: int):
+        """Add an observation, given by its dense rank, to the end of the series."""
+        less = self.counter.count_less(rank)
+        equal = self.counter.count_equal(rank)
+        greater = self.n - less - equal
+
+        self.statistic += less - greater
+        # t(t - 1)(2t + 5) grows by 6t(t + 2) when a tie group goes from t to t + 1
+        self.ties_factor += 6 * equal * (equal + 2)
+        self.counter.add(rank)
+        self.n += 1
+
+    def remove_first(self, rank: int):
+        """Remove the oldest observation, given by its dense rank, from the series."""
+        self.counter.add(rank, -1)
+        self.n -= 1
+        less = self.counter.count_less(rank)
+        equal = self.counter.count_equal(rank)
+        greater = self.n - less - equal
+
+        self.statistic -= greater - less
+        self.ties_factor -= 6 * equal * (equal + 2)
+
+
+@profiled('p_values')
+def mann_kendall_p_values(
+        test_s: np.ndarray,
+        n: np.ndarray,
+        ties_factor: np.ndarray,
+        alternative: str='two-sided',*,
+        exact: bool | str = False,
+        ) -> np.ndarray:
+    """
+    Vectorized Mann-Kendall p-values from the statistic, the number of
+    observations and the ties factor of many series. With exact, the series
+    without ties and with up to MK_MAX_N elements get exact p-values.
+
+    Return
+    ------
+        An array with the p-values, in the same order as the inputs.
+    """
+    test_s = np.asarray(test_s, dtype=float)
+    n = np.asarray(n, dtype=float)
+    sigma = np.sqrt((1 / 18) * ((n * (n - 1.) * (2. * n + 5.)) - ties_factor))
+
+    num = np.where(test_s > 0, test_s - 1., np.where(test_s < 0, test_s + 1., 0.))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(num == 0, 0., np.abs(num / sigma))
+
+    p = normal_sf(z)
+    p = p * 2 if alternative == 'two-sided' else p
+
+    if exact:
+        small = np.broadcast_to((np.asarray(ties_factor) == 0) & (n <= MK_MAX_N), np.shape(p))
+        if np.any(small):
+            p = np.array(p, dtype=float)
+            test_s, n = np.broadcast_arrays(test_s, n)
+            p[small] = mann_kendall_exact(test_s[small], n[small], alternative)
+
+    return p
+
+
+def mann_kendall_evol(
+        ts: list[int|float] | np.ndarray[int|float],
+        sli_init: int,
+        alternative: str='two-sided',*,
+        ranks: np.ndarray | None=None,
+        exact: bool | str = False,
+        ) -> np.ndarray:
+    """
+    Apply the Mann-Kendall test to every prefix of a time series, from the
+    one with sli_init elements to the complete series.
+
+    The prefixes are not tested one by one. Each observation is appended to a
+    MannKendallIncremental state, so the whole evolution costs O(n log n)
+    instead of O(n^3).
+
+    Parameters
+    ----------
+        ts
+            A time series to be tested.
+        sli_init
+            The number of elements of the first prefix.
+        alternative
+            'two-sided', 'greater', or 'less'.
+        ranks
+            The dense ranks of ts (e.g., rank_ties(ts).groups), if already
+            computed. Any order-preserving integer ranks are valid.
+        exact
+            If 'auto' (or True), the prefixes without ties and with up to 40
+            elements get exact p-values.
+
+    Return
+    ------
+        An array with the p-values of each prefix (not rounded).
+    """
+    if ranks is None:
+        ranks = rank_ties(ts, indexes=False).groups
+    state = MannKendallIncremental(RankCounter(int(ranks.max()) + 1 if len(ranks) else 0))
+
+    n_prefixes = len(ranks) - sli_init + 1
+    test_s = np.zeros(n_prefixes)
+    ties_factor = np.zeros(n_prefixes)
+    for i, rank in enumerate(ranks.tolist()):
+        state.append(rank)
+        k = i - sli_init + 1
+        if k >= 0:
+            test_s[k] = state.statistic
+            ties_factor[k] = state.ties_factor
+
+    n = np.arange(sli_init, len(ranks) + 1)
+    return mann_kendall_p_values(test_s, n, ties_factor, alternative, exact=exact)
+
+
+def mann_kendall_window(
+        ts: list[int|float] | np.ndarray[int|float],
+        window: int,
+        alternative: str='two-sided',
+        ) -> np.ndarray:
+    """
+    Apply the Mann-Kendall test to every window of a fixed number of
+    consecutive elements, from the first to the last one.
+
+    Each step appends the newest observation to a MannKendallIncremental
+    state and removes the oldest, so the whole curve costs O(n log n).
+
+    Parameters
+    ----------
+        ts
+            A time series to be tested.
+        window
+            The number of elements of each window.
+        alternative
+            'two-sided', 'greater', or 'less'.
+
+    Return
+    ------
+        An array with the p-values of each window (not rounded).
+    """
+    ranks = rank_ties(ts, indexes=False).groups.tolist()
+    state = MannKendallIncremental(RankCounter(max(ranks) + 1 if ranks else 0))
+
+    n_windows = len(ranks) - window + 1
+    test_s = np.zeros(n_windows)
+    ties_factor = np.zeros(n_windows)
+    for i, rank in enumerate(ranks):
+        state.append(rank)
+        if i >= window:
+            state.remove_first(ranks[i - window])
+        k = i - window + 1
+        if k >= 0:
+            test_s[k] = state.statistic
+            ties_factor[k] = state.ties_factor
+
+    return mann_kendall_p_values(test_s, np.full(n_windows, window), ties_factor, alternative)
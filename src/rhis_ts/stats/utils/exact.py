@@ -0,0 +1,155 @@
+"""
+Exact null distributions of the Mann-Kendall S, the Mann-Whitney U and the
+Wallis and Moore runs for small series without ties.
+
+The tables are shipped as float32 .npy files in the 'tables' directory and
+memory mapped on first use (float32 keeps about 7 significant digits).
+They are rebuilt from the recursions below with:
+
+    python -m rhis_ts.stats.utils.exact
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+TABLES_DIR = Path(__file__).parent / 'tables'
+
+# The largest series (or group, for Mann-Whitney) with an exact distribution
+MK_MAX_N = 40
+MW_MAX_N = 20
+WM_MAX_N = 40
+
+
+def build_mann_kendall_table(max_n: int=MK_MAX_N) -> np.ndarray:
+    """
+    P(S >= s) for s = 0, ..., max_n(max_n - 1)/2, for every series with n <= max_n
+    elements (rows), from the distribution of the number of inversions of a
+    random permutation, S = n(n - 1)/2 - 2 * inversions.
+    """
+    max_pairs = max_n * (max_n - 1) // 2
+    table = np.zeros((max_n + 1, max_pairs + 1))
+    inversions = np.ones(1)
+    for n in range(1, max_n + 1):
+        # The n-th element adds 0 to n - 1 inversions, with equal probability
+        inversions = np.convolve(inversions, np.full(n, 1. / n))
+        pairs = n * (n - 1) // 2
+        inversions_cdf = np.minimum(np.cumsum(inversions), 1.)
+        s = np.arange(pairs + 1)
+        table[n, :pairs + 1] = inversions_cdf[(pairs - s) // 2]
+    table[0, 0] = 1.
+
+    return table
+
+
+def build_mann_whitney_table(max_n: int=MW_MAX_N) -> np.ndarray:
+    """
+    P(U <= u) for u = 0, ..., max_n^2 / 2, for every pair of groups with n1, n2 <= max_n
+    elements (the first two axes). The distribution is symmetric, so the lower
+    half is enough for min(U, n1 n2 - U).
+    """
+    max_u = max_n * max_n
+    probs = np.zeros((max_n + 1, max_n + 1, max_u + 1))
+    probs[0, :, 0] = 1.
+    probs[:, 0, 0] = 1.
+    for n1 in range(1, max_n + 1):
+        for n2 in range(1, max_n + 1):
+            # The largest value is either in the first group (adding n2 to U) or in the second
+            probs[n1, n2, n2:] = n1 / (n1 + n2) * probs[n1 - 1, n2, :max_u + 1 - n2]
+            probs[n1, n2] += n2 / (n1 + n2) * probs[n1, n2 - 1]
+
+    return np.minimum(np.cumsum(probs, axis=2), 1.)[:, :, :max_u // 2 + 1]
+
+
+def build_wallis_moore_table(max_n: int=WM_MAX_N) -> np.ndarray:
+    """
+    P(runs <= r) (first row) and P(runs >= r) (second row) for r = 0, ..., max_n,
+    for every series with n <= max_n elements, from the number of runs up and
+    down of a random permutation.
+    """
+    probs = np.zeros((max_n + 1, max_n + 1))
+    probs[:3, 1] = 1.
+    for n in range(3, max_n + 1):
+        r = np.arange(1, n)
+        # N(n, r) = r N(n - 1, r) + 2 N(n - 1, r - 1) + (n - r) N(n - 1, r - 2)
+        probs[n, 1:n] = (r * probs[n - 1, 1:n] + 2 * probs[n - 1, :n - 1]
+                         + (n - r) * np.concatenate(([0.], probs[n - 1, :n - 2]))) / n
+
+    lower = np.minimum(np.cumsum(probs, axis=1), 1.)
+    upper = np.minimum(np.cumsum(probs[:, ::-1], axis=1)[:, ::-1], 1.)
+
+    return np.stack([lower, upper])
+
+
+BUILDERS = {
+    'mann_kendall': build_mann_kendall_table,
+    'mann_whitney': build_mann_whitney_table,
+    'wallis_moore': build_wallis_moore_table,
+}
+
+
+@lru_cache(maxsize=None)
+def load_table(name: str) -> np.ndarray:
+    """The table of one test, memory mapped from the tables directory (or built, if missing)."""
+    path = TABLES_DIR / f'{name}.npy'
+    if path.exists():
+        return np.load(path, mmap_mode='r')
+    return BUILDERS[name]()
+
+
+def mann_kendall_exact(test_s: np.ndarray, n: np.ndarray, alternative: str='two-sided') -> np.ndarray:
+    """
+    Exact Mann-Kendall p-values of series without ties and with n <= MK_MAX_N,
+    from the upper tail of abs(S), as in mann_kendall_p_values.
+    """
+    table = load_table('mann_kendall')
+    n = np.asarray(n, dtype=np.int64)
+    s = np.abs(np.asarray(test_s)).astype(np.int64)
+    p = table[n, s].astype(float)
+
+    return np.minimum(p * 2, 1.) if alternative == 'two-sided' else p
+
+
+def mann_whitney_exact(u_first: np.ndarray, n1: np.ndarray, n2: np.ndarray, alternative: str='two-sided') \
+    -> np.ndarray:
+    """
+    Exact Mann-Whitney p-values of groups without ties and with n1, n2 <= MW_MAX_N,
+    from the lower tail of min(U, n1 n2 - U), as in mann_whitney_p_values.
+    """
+    table = load_table('mann_whitney')
+    n1 = np.asarray(n1, dtype=np.int64)
+    n2 = np.asarray(n2, dtype=np.int64)
+    u_first = np.asarray(u_first, dtype=float)
+    stat = np.floor(np.minimum(u_first, n1 * n2 - u_first)).astype(np.int64)
+    p = table[n1, n2, stat].astype(float)
+
+    return np.minimum(p * 2, 1.) if alternative == 'two-sided' else p
+
+
+def wallis_moore_exact(runs: np.ndarray, n: np.ndarray, alternative: str='two-sided') -> np.ndarray:
+    """
+    Exact Wallis and Moore p-values of series without tied neighbours and with
+    n <= WM_MAX_N, from the tail of the runs on the side of their deviation from
+    the expected runs, as in wallismoore_p_values.
+    """
+    table = load_table('wallis_moore')
+    n = np.asarray(n, dtype=np.int64)
+    runs = np.asarray(runs, dtype=float)
+    r = np.rint(runs).astype(np.int64)
+    upper = runs >= (2. * n - 1.) / 3.
+    p = np.where(upper, table[1, n, r], table[0, n, r]).astype(float)
+
+    return np.minimum(p * 2, 1.) if alternative == 'two-sided' else p
+
+
+def write_tables(directory: Path=TABLES_DIR):
+    """Build every table and save it as .npy in directory."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, build in BUILDERS.items():
+        np.save(directory / f'{name}.npy', build().astype(np.float32))
+
+
+if __name__ == '__main__':
+    write_tables()
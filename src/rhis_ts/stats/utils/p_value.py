@@ -1,8 +1,58 @@
 from __future__ import annotations
 
+import math
 from collections import namedtuple
 
-import scipy.stats as sts
+import numpy as np
+
+
+def normal_sf(z: float | np.ndarray) -> np.float64 | np.ndarray:
+    """
+    Calculate the survival function, 1 - cdf(z), of the standard normal
+    distribution for a number or an array.
+
+    It is computed as erfc(z / sqrt(2)) / 2, which keeps its precision in the
+    upper tail, where 1 - cdf(z) underflows to 0 (e.g., z > 8.3). A number only
+    needs the standard library; scipy (ndtr) is imported at the first array.
+
+    Parameters
+    ----------
+        z
+            A number or an array of z values.
+
+    Returns
+    -------
+        The probabilities of exceeding each z value (an np.float64 for a number).
+    """
+    if np.ndim(z) == 0:
+        return np.float64(0.5 * math.erfc(float(z) / math.sqrt(2.)))
+
+    from scipy import special  # noqa: PLC0415
+
+    return special.ndtr(np.negative(z))
+
+
+def p_values_normal(z: float | np.ndarray, alternative: str='two-sided') -> float | np.ndarray:
+    """
+    Calculate the p-values from the normal distribution for a number or an
+    array of z values in a single call.
+
+    Parameters
+    ----------
+        z
+            A number or an array of z values from a test that uses normal
+            approximation.
+        alternative
+            'two-sided', 'greater', or 'less'. The one-sided p-values are
+            the upper tail of abs(z).
+
+    Returns
+    -------
+        The p-values.
+    """
+    p = normal_sf(np.abs(z))
+
+    return p * 2 if alternative == 'two-sided' else p
 
 
 def p_value_normal(z: float) -> float:
@@ -19,7 +69,7 @@ def p_value_normal(z: float) -> float:
         The p_value.
     """
     z_abs = abs(z)
-    p_value = 1 - sts.norm.cdf(z_abs)
+    p_value = float(normal_sf(z_abs))
 
     return p_value
 
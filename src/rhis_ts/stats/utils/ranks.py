@@ -1,14 +1,74 @@
 """Methods for ties correction."""
 from __future__ import annotations
 
+from collections import namedtuple
 from typing import TYPE_CHECKING
 
 import numpy as np
 
+from rhis_ts.utils.profiling import profiled
+
 if TYPE_CHECKING:
     from rhis_ts.types.data import TimeSeriesFlex
 
 
+RankTies = namedtuple('RankTies', ['ranks', 'groups', 'ties_groups_count', 'ties_indexes'])  # noqa: PYI024
+
+
+@profiled('rank')
+def rank_ties(ts: TimeSeriesFlex,*, indexes: bool=True) -> RankTies:
+    """
+    Rank a series with a single stable sort, averaging the ranks of ties.
+
+    Everything is derived from the boundaries between groups of equal values
+    in the sorted series, so the cost is O(n log n) with no Python-level
+    loops over the elements.
+
+    Parameters
+    ----------
+        ts
+            A list or array with numbers.
+        indexes
+            If False, the ranks of each tie group are not built (ties_indexes
+            is None).
+
+    Return
+    ------
+        A namedtuple
+            ('RankTies', ['ranks', 'groups', 'ties_groups_count', 'ties_indexes'])
+            'ranks' are the ranks corrected for ties, in the original order.
+            'groups' are the dense, 0-based indexes of each element's value
+            among the sorted unique values. 'ties_groups_count' is how many
+            elements each unique value has, in ascending order of value.
+            'ties_indexes' is a list with the ordinal ranks (1-based) of each
+            group with two or more elements.
+    """
+    arr = np.asarray(ts)
+    n = len(arr)
+    order = np.argsort(arr, kind='stable')
+    arr_sorted = arr[order]
+
+    is_start = np.empty(n, dtype=bool)
+    is_start[:1] = True
+    np.not_equal(arr_sorted[1:], arr_sorted[:-1], out=is_start[1:])
+    starts = np.flatnonzero(is_start)
+    ties_groups_count = np.diff(np.append(starts, n))
+
+    groups = np.empty(n, dtype=np.int64)
+    groups[order] = np.cumsum(is_start) - 1
+    avg_ranks = starts + (ties_groups_count + 1) / 2.
+    ranks = avg_ranks[groups]
+
+    ties_indexes = None
+    if indexes:
+        ordinal = np.arange(1, n + 1)
+        in_tie = np.repeat(ties_groups_count > 1, ties_groups_count)
+        tie_sizes = ties_groups_count[ties_groups_count > 1]
+        ties_indexes = np.split(ordinal[in_tie], np.cumsum(tie_sizes)[:-1]) if len(tie_sizes) else []
+
+    return RankTies(ranks, groups, ties_groups_count, ties_indexes)
+
+
 def get_ties_index(ts: TimeSeriesFlex, start: int=0) -> list[int]:
     """
     Check if there equal numbers in sequence and get their ranks.
@@ -42,7 +102,7 @@ def get_ties_index(ts: TimeSeriesFlex, start: int=0) -> list[int]:
     return tie_ranks
 
 def ranks_ties_corrected(ts: TimeSeriesFlex,*, ties_data: bool=False) \
-      -> list[int | float] | dict[str, str | int]:  # noqa: C901
+      -> list[int | float] | dict[str, str | int]:
     """
     Apply correction for ties.
 
@@ -60,43 +120,15 @@ def ranks_ties_corrected(ts: TimeSeriesFlex,*, ties_data: bool=False) \
         information about ties, including the list with ranks. The
         ranks will be in the original time series order.
     """
-    ranks = np.array(to_ranks(ts), dtype=float)
-
-    ts_sorted = np.sort(ts)
-    ties_index = []
-    m = 0
-    while m < len(ts) - 1:
-        if m == 0:
-            tie_ind = get_ties_index(ts, m)
-            if len(tie_ind) > 0:
-                ties_index.append(tie_ind)
-        if m > 0:
-            if ts_sorted[m] == ts_sorted[m + 1]:
-                if ts_sorted[m] != ts_sorted[m - 1]:
-                    new_index = m
-                    new_tie_ind = get_ties_index(ts, new_index)
-                    ties_index.append(new_tie_ind)
-        m += 1
-
-    if len(ties_index) > 0:
-
-        for index in ties_index:
-            mean = np.mean(index)
-            for ind in index:
-                ranks[ranks == ind] = mean
+    rt = rank_ties(ts, indexes=ties_data)
+    ranks = rt.ranks
 
     if ties_data:
-        ties_group_counts = []
-        unique_ranks = np.unique(ranks)
-        for rank in unique_ranks:
-            count = np.count_nonzero(np.array(ranks) == rank)
-            ties_group_counts.append(count if count > 0 else 1)
-
         ties_data = {
             'ranks': ranks,
-            'ties_indexes': ties_index, # The indexes where ties are present.
-            'ties_count': len(ties_group_counts), # How many groups of ties.
-            'ties_groups_count': ties_group_counts, # How many elements in each tie group.
+            'ties_indexes': [index.tolist() for index in rt.ties_indexes], # The indexes where ties are present.
+            'ties_count': len(rt.ties_groups_count), # How many groups of ties.
+            'ties_groups_count': rt.ties_groups_count.tolist(), # How many elements in each tie group.
         }
 
         return ties_data
@@ -115,17 +147,8 @@ def to_ranks(ts: TimeSeriesFlex) -> TimeSeriesFlex:
     ------
         A list with the original data replaced by their ranks.
     """
-    ts_unique = np.unique(ts)
-    ts_sorted = np.sort(ts)
-    ranks_dict = {}
-    for el in ts_unique:
-        index = np.where(ts_sorted == el)[0]
-        ranks_dict[el] = list(index)
-
-    ranks = []
-    for el in np.array(ts):
-        rank = ranks_dict[el].pop(0)
-        ranks.append(rank + 1)
-
-    return ranks
+    arr = np.asarray(ts)
+    ranks = np.empty(len(arr), dtype=np.int64)
+    ranks[np.argsort(arr, kind='stable')] = np.arange(1, len(arr) + 1)
 
+    return ranks.tolist()
@@ -18,3 +18,30 @@ def nans_nums_from_array(ps: TimeSeriesFlex,*, only_nums: bool=True) -> TimeSeri
     ps_nan = ps[ps_mask]
 
     return ps_nums, ps_nan
+
+
+def constant_windows(arr: np.ndarray, window: int) -> np.ndarray:
+    """
+    Check which windows of a fixed number of consecutive elements are
+    constant, in O(n), from the length of the run of equal values ending
+    at each element.
+
+    Parameters
+    ----------
+        arr
+            A 1D array.
+        window
+            The number of elements of each window.
+
+    Return
+    ------
+        A boolean array with one element per window, from the first to the last one.
+    """
+    n = len(arr)
+    idx = np.arange(n)
+    is_start = np.ones(n, dtype=bool)
+    np.not_equal(arr[1:], arr[:-1], out=is_start[1:])
+    run_start = np.maximum.accumulate(np.where(is_start, idx, 0))
+
+    return (idx - run_start + 1)[window - 1:] >= window
+
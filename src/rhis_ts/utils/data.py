@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 import numpy as np
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
 
     from rhis_ts.types.data import TimeSeriesFlex
 
@@ -36,12 +37,40 @@ def slice_init(n: int) -> int:
     limit = 100
     return 10 if n > limit else 5
 
-def slices_to_evol(ts: TimeSeriesFlex, init: int) -> list[list[int | float]]:
+def iter_prefixes(ts: TimeSeriesFlex, init: int) -> Iterator[np.ndarray]:
     """
-    Break a flat list into a list of lists (2D).
+    Iterate over the prefixes of a series, from the one with init elements to
+    the complete series.
 
-    Each list will have an increasing number of elements.
+    The series is converted once to a contiguous array (not copied if it
+    already is one) and every prefix is a read-only view of it, so the
+    iteration needs no extra memory whatever the input type.
+
+    Parameters
+    ----------
+        ts
+            A list or array with integers or floats.
+        init
+            The number of elements of the first prefix.
+
+    Returns
+    -------
+        A generator of read-only array views with increasing number of elements,
+        so that the last is the complete timeseries.
+    """
+    arr = np.ascontiguousarray(ts).view()
+    arr.flags.writeable = False
+    for end in range(init, len(arr) + 1):
+        yield arr[:end]
+
+
+def slices_to_evol(ts: TimeSeriesFlex, init: int) -> list[np.ndarray]:
+    """
+    Break a flat list into a list of prefixes (2D).
+
+    Each prefix will have an increasing number of elements.
     The element with index n will have one more element than element with index n-1.
+    The prefixes are read-only views from iter_prefixes, so the data is not copied.
 
     Parameters
     ----------
@@ -50,13 +79,8 @@ def slices_to_evol(ts: TimeSeriesFlex, init: int) -> list[list[int | float]]:
 
     Returns
     -------
-        A 2D list of lists. The lists are slices with increasing number of elements,
+        A list of arrays. The arrays are slices with increasing number of elements,
         so that the last is the complete timeseries.
     """
-    start = init
-    slices = []
-    for i in range(len(ts) - (start - 1)):
-        slices.append(ts[: i + start])
-
-    return slices
+    return list(iter_prefixes(ts, init))
 
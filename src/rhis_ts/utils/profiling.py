@@ -0,0 +1,169 @@
+"""
+Opt-in timing and memory instrumentation of the evolution pipeline.
+
+The instrumented code marks its stages with stage(name) (or the profiled
+decorator). While no Profiler is active, a stage is a shared no-op context
+manager, so the instrumentation costs one context variable lookup per stage.
+
+    with Profiler() as prof:
+        rhis.evol(stat='min')
+    prof.to_frame()
+
+The stages are nested, so each record has a path, e.g., 'evol/H/p_values' for
+the p-values of the homogeneity test of the evolution of a column.
+"""
+from __future__ import annotations
+
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from pandas import DataFrame
+
+_ACTIVE: ContextVar[Profiler | None] = ContextVar('rhis_profiler', default=None)
+_NULL = nullcontext()
+
+
+class Profiler:
+    """
+    Record the wall time, the number of calls and the peak memory of each
+    stage, by column, while active (as a context manager).
+
+    The peak memory is the largest increase of the memory traced by
+    tracemalloc (NumPy arrays included) from the start of a stage. Tracing
+    slows the allocations down, so it can be turned off with memory=False.
+
+    Parameters
+    ----------
+        memory
+            If True, tracemalloc is started while the profiler is active (if it
+            is not tracing already) and the peak memory of each stage is recorded.
+    """
+
+    def __init__(self,*, memory: bool=True):
+        self.memory = memory
+        self.records = {}
+        self._column = None
+        self._frames = []
+        self._token = None
+        self._started_tracing = False
+
+    def __enter__(self) -> Profiler:  # noqa: PYI034
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._token = _ACTIVE.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        _ACTIVE.reset(self._token)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def column(self, name: str|None) -> Iterator[None]:
+        """Assign the stages inside to the column name."""
+        outer, self._column = self._column, name
+        try:
+            yield
+        finally:
+            self._column = outer
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the stage name (nested in the stages already open)."""
+        tracing = self.memory and tracemalloc.is_tracing()
+        # [name, traced memory at the start, largest traced memory seen by the stages inside]
+        frame = [name, 0, 0]
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._frames:
+                self._frames[-1][2] = max(self._frames[-1][2], peak)
+            tracemalloc.reset_peak()
+            frame[1:] = [current, current]
+        self._frames.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            path = '/'.join(open_frame[0] for open_frame in self._frames)
+            self._frames.pop()
+            peak_bytes = 0
+            if tracing:
+                peak = max(frame[2], tracemalloc.get_traced_memory()[1])
+                peak_bytes = peak - frame[1]
+                if self._frames:
+                    self._frames[-1][2] = max(self._frames[-1][2], peak)
+
+            record = self.records.setdefault((self._column, path), [0, 0., 0])
+            record[0] += 1
+            record[1] += wall
+            record[2] = max(record[2], peak_bytes)
+
+    def report(self) -> list[dict]:
+        """
+        One dict per column (None for the stages of all the columns) and stage,
+        with the calls, the total wall time (wall_s) and the peak memory
+        (peak_bytes), sorted by column and stage.
+        """
+        return [
+            {'column': column, 'stage': path, 'calls': calls, 'wall_s': wall, 'peak_bytes': peak}
+            for (column, path), (calls, wall, peak) in sorted(
+                self.records.items(), key=lambda item: (str(item[0][0]), item[0][1]))
+        ]
+
+    def to_frame(self) -> DataFrame:
+        """The report as a DataFrame."""
+        import pandas as pd  # noqa: PLC0415
+
+        return pd.DataFrame(self.report(), columns=['column', 'stage', 'calls', 'wall_s', 'peak_bytes'])
+
+    def log(self):
+        """Emit one loguru record per row of the report, with the row bound as 'profile'."""
+        from loguru import logger  # noqa: PLC0415
+
+        for row in self.report():
+            logger.bind(profile=row).info(
+                f"Profile of {row['column']} / {row['stage']}: {row['calls']} calls, "
+                f"{row['wall_s']:.4f} s, peak {row['peak_bytes'] / 2**20:.2f} MiB")
+
+
+def active_profiler() -> Profiler | None:
+    """The active Profiler, or None."""
+    return _ACTIVE.get()
+
+
+def stage(name: str):
+    """The stage name of the active Profiler, or a no-op context manager."""
+    profiler = _ACTIVE.get()
+    return _NULL if profiler is None else profiler.stage(name)
+
+
+def profile_column(name: str|None):
+    """Assign the stages inside to the column name in the active Profiler, if any."""
+    profiler = _ACTIVE.get()
+    return _NULL if profiler is None else profiler.column(name)
+
+
+def profiled(name: str) -> Callable:
+    """Decorator that records every call of a function as the stage name."""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _ACTIVE.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
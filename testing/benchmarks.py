@@ -0,0 +1,204 @@
+"""
+Benchmarks for the hypothesis tests and the RHIS evolution.
+
+Run the suite and save the timings as JSON:
+
+    python -m testing.benchmarks run --output bench.json
+
+Compare a run against a stored baseline, flagging regressions:
+
+    python -m testing.benchmarks compare baseline.json bench.json --threshold 0.2
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from rhis_ts.evol.rhis import Rhis
+from rhis_ts.stats.hypothesis import (
+    mann_kendall,
+    mann_kendall_evol,
+    mann_kendall_window,
+    mann_whitney,
+    mann_whitney_evol,
+    mann_whitney_window,
+    runs_test,
+    wald_wolfowitz,
+    wald_wolfowitz_evol,
+    wald_wolfowitz_window,
+    wallismoore,
+    wallismoore_evol,
+    wallismoore_window,
+)
+from rhis_ts.utils.data import slice_init
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+SIZES = (100, 1000, 10000, 100000)
+REGIMES = ('tie-free', 'tie-heavy', 'constant')
+# The number of elements of each window of the sliding window cases (at most the whole series)
+WINDOW = 50
+
+
+def make_series(regime: str, n: int, seed: int=42) -> np.ndarray:
+    """
+    Build a synthetic series for one regime: normal values without ties,
+    integers from 0 to 4 (mostly ties), or a constant.
+    """
+    rng = np.random.default_rng(seed)
+    if regime == 'tie-free':
+        return rng.normal(size=n)
+    if regime == 'tie-heavy':
+        return rng.integers(0, 5, n).astype(float)
+    return np.full(n, 3.)
+
+
+def _rhis_evol(ts: np.ndarray):
+    Rhis(pd.DataFrame({'x': ts})).evol(stat='min')
+
+
+def _rhis_window(ts: np.ndarray):
+    Rhis(pd.DataFrame({'x': ts})).evol(stat='min', window=min(WINDOW, len(ts)))
+
+
+def _rhis_repr(ts: np.ndarray):
+    rhis = Rhis(pd.DataFrame({'x': ts}))
+    rhis.evol(stat='min')
+    rhis.add_repr_cols_to_df()
+
+
+def cases() -> dict[str, Callable[[np.ndarray], object]]:
+    """The benchmarked functions, by name, each taking only the series."""
+    return {
+        'mann_kendall': mann_kendall,
+        'mann_kendall_evol': lambda ts: mann_kendall_evol(ts, slice_init(len(ts))),
+        'mann_kendall_window': lambda ts: mann_kendall_window(ts, min(WINDOW, len(ts))),
+        'mann_whitney': mann_whitney,
+        'mann_whitney_evol': lambda ts: mann_whitney_evol(ts, slice_init(len(ts))),
+        'mann_whitney_window': lambda ts: mann_whitney_window(ts, min(WINDOW, len(ts))),
+        'runs_test': runs_test,
+        'wald_wolfowitz': wald_wolfowitz,
+        'wald_wolfowitz_evol': lambda ts: wald_wolfowitz_evol(ts, slice_init(len(ts))),
+        'wald_wolfowitz_window': lambda ts: wald_wolfowitz_window(ts, min(WINDOW, len(ts))),
+        'wallismoore': wallismoore,
+        'wallismoore_evol': lambda ts: wallismoore_evol(ts, slice_init(len(ts))),
+        'wallismoore_window': lambda ts: wallismoore_window(ts, min(WINDOW, len(ts))),
+        'Rhis.evol': _rhis_evol,
+        'Rhis.evol(window)': _rhis_window,
+        'Rhis.add_repr_cols_to_df': _rhis_repr,
+    }
+
+
+def time_call(func: Callable[[np.ndarray], object], ts: np.ndarray, repeat: int) -> float:
+    """The best time, in seconds, among repeat calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(ts)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def run(sizes: tuple[int], regimes: tuple[str], repeat: int, names: list[str] | None=None) -> dict:
+    """
+    Time every case for every regime and size.
+
+    Return
+    ------
+        A dict with the environment ('meta') and the timings in seconds
+        ('results'), keyed by 'name[regime-n]'.
+    """
+    # The logs of every call would be timed too; they are restored for the code run after
+    logger.disable('rhis_ts')
+    try:
+        selected = {name: func for name, func in cases().items() if names is None or name in names}
+
+        results = {}
+        for regime in regimes:
+            for n in sizes:
+                ts = make_series(regime, n)
+                for name, func in selected.items():
+                    key = f'{name}[{regime}-{n}]'
+                    results[key] = time_call(func, ts, repeat)
+                    print(f'{key}: {results[key]:.6f} s')
+    finally:
+        logger.enable('rhis_ts')
+
+    meta = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'repeat': repeat,
+    }
+    return {'meta': meta, 'results': results}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[tuple[str, float, float]]:
+    """
+    Find the cases that got slower than the baseline by more than threshold
+    (e.g., 0.2 for 20%). Cases missing from either run are ignored.
+
+    Return
+    ------
+        A list with (name, baseline seconds, current seconds) of each regression.
+    """
+    regressions = []
+    for key, base_time in baseline['results'].items():
+        cur_time = current['results'].get(key)
+        if cur_time is not None and cur_time > base_time * (1 + threshold):
+            regressions.append((key, base_time, cur_time))
+
+    return regressions
+
+
+def main(argv: list[str] | None=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m testing.benchmarks', description=__doc__.split('\n')[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run the benchmarks and save them as JSON.')
+    run_parser.add_argument('--output', default='bench.json')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    run_parser.add_argument('--regimes', nargs='+', choices=REGIMES, default=list(REGIMES))
+    run_parser.add_argument('--cases', nargs='+', choices=list(cases()), default=None)
+    run_parser.add_argument('--repeat', type=int, default=3)
+
+    compare_parser = commands.add_parser('compare', help='Flag regressions against a baseline JSON.')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.2)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        bench = run(tuple(args.sizes), tuple(args.regimes), args.repeat, args.cases)
+        with open(args.output, 'w') as f:
+            json.dump(bench, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    regressions = compare(baseline, current, args.threshold)
+    for key, base_time, cur_time in regressions:
+        print(f'REGRESSION {key}: {base_time:.6f} s -> {cur_time:.6f} s ({cur_time / base_time:.2f}x)')
+    if not regressions:
+        print('No regressions.')
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from rhis_ts.evol.rhis import Rhis
+from testing.benchmarks import compare, run
+
+
+def test_benchmarks_compare():
+    bench = run((20,), ('tie-free', 'constant'), 1, ['mann_kendall', 'wallismoore_evol'])
+    assert set(bench['results']) == {
+        'mann_kendall[tie-free-20]', 'wallismoore_evol[tie-free-20]',
+        'mann_kendall[constant-20]', 'wallismoore_evol[constant-20]',
+    }
+
+    bench = run((20,), ('tie-heavy',), 1, ['wald_wolfowitz_window', 'Rhis.evol(window)'])
+    assert set(bench['results']) == {'wald_wolfowitz_window[tie-heavy-20]', 'Rhis.evol(window)[tie-heavy-20]'}
+
+    baseline = {'results': {'a[tie-free-10]': 1.0, 'b[tie-free-10]': 1.0, 'c[tie-free-10]': 1.0}}
+    current = {'results': {'a[tie-free-10]': 1.1, 'b[tie-free-10]': 1.5}}
+    assert compare(baseline, current, 0.2) == [('b[tie-free-10]', 1.0, 1.5)]
+
+
+def test_benchmarks_run_restores_logs():
+    """Test that the logs of rhis_ts are emitted again after a run."""
+    messages = []
+    sink = logger.add(messages.append, level='INFO')
+    try:
+        run((20,), ('tie-free',), 1, ['mann_kendall'])
+        Rhis(pd.DataFrame({'a': np.arange(20.)})).evol(stat='min')
+    finally:
+        logger.remove(sink)
+
+    assert any('RHIS evolution successfully complete' in message for message in messages)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from rhis_ts.cli import main
+from rhis_ts.evol.rhis import Rhis
+
+
+def test_cli_batch(tmp_path):
+    """
+    Test that the runner writes the curves and the representative intervals
+    of every group of every file, equal to the ones of Rhis.
+    """
+    rng = np.random.default_rng(3)
+    frames = []
+    for point in ['P1', 'P2']:
+        frames.append(pd.DataFrame({
+            'DATA': pd.date_range('2000-01-01', periods=40, freq='D').astype(str),
+            'PONTO': point,
+            'a': np.append(np.linspace(0, 3, 20), rng.normal(size=20)),
+            'b': rng.normal(size=40),
+        }))
+    for k, df in enumerate(frames):
+        df.to_csv(tmp_path / f'input{k}.csv', index=False)
+    out_dir = tmp_path / 'out'
+
+    code = main([
+        str(tmp_path / 'input*.csv'), '--index', 'DATA', '--parse-dates', '--group-by', 'PONTO',
+        '--stat', 'min', '--output-dir', str(out_dir), '--format', 'csv'])
+
+    assert code == 0
+    for k, df in enumerate(frames):
+        curves = pd.read_csv(out_dir / f'input{k}.curves.csv')
+        intervals = pd.read_csv(out_dir / f'input{k}.repr.csv')
+        series = df.set_index('DATA')[['a', 'b']]
+        expected = Rhis(series.copy())
+        expected_evol = expected.evol(stat='min')
+        expected.add_repr_cols_to_df()
+        point = df['PONTO'].iloc[0]
+
+        for col in ['a', 'b']:
+            got = curves[(curves['group'] == point) & (curves['parameter'] == col)]
+            assert np.allclose(got['p_value'], expected_evol[(col, 'ba')], equal_nan=True)
+            start, stop = intervals.loc[intervals['parameter'] == col, ['start', 'stop']].iloc[0]
+            assert (start, stop) == expected.repr_spans[col]
+
+    assert main([str(tmp_path / 'missing*.csv')]) == 1
+
+
+def test_cli_skips_short_series(tmp_path):
+    """
+    Test that the columns without values and the groups shorter than their
+    first slice are skipped, and that a bad file does not stop the others.
+    """
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({
+        'PONTO': ['P1'] * 40 + ['P2'] * 3 + ['P3'] * 5,
+        'a': rng.normal(size=48),
+        'b': np.nan,
+    })
+    df.loc[df['PONTO'] == 'P3', 'a'] = np.nan
+    df.to_csv(tmp_path / 'input.csv', index=False)
+    (tmp_path / 'broken.parquet').write_text('not a parquet file')
+    out_dir = tmp_path / 'out'
+
+    messages = []
+    sink = logger.add(messages.append, level='WARNING')
+    try:
+        code = main([
+            str(tmp_path / 'broken.parquet'), str(tmp_path / 'input.csv'), '--group-by', 'PONTO',
+            '--output-dir', str(out_dir), '--format', 'csv'])
+    finally:
+        logger.remove(sink)
+
+    assert code == 1
+    curves = pd.read_csv(out_dir / 'input.curves.csv')
+    assert set(curves['group']) == {'P1'}
+    assert set(curves['parameter']) == {'a'}
+    assert np.allclose(curves['p_value'], Rhis(df.iloc[:40][['a']].copy()).evol(stat='mean')[('a', 'ba')], equal_nan=True)
+    assert any('PONTO=P2' in message and 'skipped' in message for message in messages)
+    assert any('PONTO=P3' in message and 'no values' in message for message in messages)
+    assert any('broken.parquet' in message for message in messages)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from rhis_ts.utils.data import iter_prefixes, slices_to_evol
+
+
+def test_iter_prefixes():
+    """
+    Test that the prefixes are read-only views of a single buffer, for list
+    and array inputs.
+    """
+    ts = [2., 4., 1., 3., 5., 7.]
+    arr = np.array(ts)
+
+    prefixes = list(iter_prefixes(arr, 3))
+    assert [len(prefix) for prefix in prefixes] == [3, 4, 5, 6]
+    assert all(np.shares_memory(prefix, arr) for prefix in prefixes)
+    with pytest.raises(ValueError, match='read-only'):
+        prefixes[0][0] = 0.
+
+    from_list = slices_to_evol(ts, 3)
+    assert all(np.shares_memory(prefix, from_list[-1]) for prefix in from_list)
+    assert [prefix.tolist() for prefix in from_list] == [ts[:end] for end in range(3, 7)]
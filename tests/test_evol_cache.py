@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rhis_ts.evol.rhis import Rhis
+from rhis_ts.evol.utils import cache as cache_module
+from rhis_ts.evol.utils.cache import EvolCache
+
+N_ENTRIES = 4
+
+
+@pytest.mark.parametrize('stat', ['min', None])
+def test_rhis_evol_cache(tmp_path, stat):
+    """
+    Test that the evolution served from the cache matches the computed one,
+    for both directions.
+    """
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({'a': rng.normal(size=80), 'b': rng.integers(0, 4, 80).astype(float)})
+
+    expected = Rhis(df).evol(stat=stat, direction='both')
+    first = Rhis(df, cache=EvolCache(tmp_path)).evol(stat=stat, direction='both')
+    second = Rhis(df, cache=EvolCache(tmp_path)).evol(stat=stat, direction='both')
+
+    for col in expected.columns:
+        assert np.allclose(first[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float), equal_nan=True)
+        assert np.allclose(second[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float), equal_nan=True)
+    assert len(list(tmp_path.glob('*.npz'))) == N_ENTRIES
+
+
+def test_evol_cache_prefix(tmp_path, monkeypatch):
+    """
+    Test that the forward evolution of an extended series only computes the
+    slices after the cached prefix.
+    """
+    rng = np.random.default_rng(4)
+    ts = rng.normal(size=120)
+    cache = EvolCache(tmp_path)
+    Rhis(pd.DataFrame({'a': ts[:100]}), cache=cache).evol(stat='mean', backwards=False)
+
+    calls = []
+    rhis_evol_raw = cache_module.rhis_evol_raw
+    monkeypatch.setattr(
+        cache_module, 'rhis_evol_raw', lambda *args, **kwargs: calls.append(args[2]) or rhis_evol_raw(*args, **kwargs))
+    result = Rhis(pd.DataFrame({'a': ts}), cache=cache).evol(stat='mean', backwards=False)
+
+    expected = Rhis(pd.DataFrame({'a': ts})).evol(stat='mean', backwards=False)
+    assert calls == [101]
+    assert np.allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float), equal_nan=True)
+
+
+@pytest.mark.parametrize('ties', [False, True])
+def test_evol_cache_prefix_streamed(tmp_path, monkeypatch, ties):
+    """
+    Test that a short tail after a cached prefix is streamed through the
+    running state of the tests, without evaluating the whole series again.
+    """
+    rng = np.random.default_rng(7)
+    ts = np.concatenate([rng.normal(size=200), rng.normal(2., size=10)])
+    if ties:
+        ts = np.round(ts)
+    cache = EvolCache(tmp_path)
+    Rhis(pd.DataFrame({'a': ts[:200]}), cache=cache).evol(stat='mean', backwards=False)
+
+    calls = []
+    monkeypatch.setattr(cache_module, 'rhis_evol_raw', lambda *args, **_: calls.append(args[2]))
+    result = Rhis(pd.DataFrame({'a': ts}), cache=cache).evol(stat='mean', backwards=False)
+    monkeypatch.undo()
+
+    expected = Rhis(pd.DataFrame({'a': ts})).evol(stat='mean', backwards=False)
+    assert calls == []
+    assert np.allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float), equal_nan=True)
+
+
+def test_evol_cache_eviction(tmp_path):
+    """Test that the least recently used entries are removed beyond max_bytes."""
+    rng = np.random.default_rng(5)
+    series = [rng.normal(size=50) for _ in range(3)]
+    cache = EvolCache(tmp_path, max_bytes=1)
+    for ts in series:
+        Rhis(pd.DataFrame({'a': ts}), cache=cache).evol(stat='min')
+
+    assert cache.get(series[0], 5, 'ba') is None
+    assert len(list(tmp_path.glob('*.npz'))) <= 1
+
+
+def test_evol_cache_keeps_other_files(tmp_path):
+    """Test that rebuilding the index only removes the cache's own entry files."""
+    rng = np.random.default_rng(6)
+    ts = rng.normal(size=50)
+    np.savez(tmp_path / 'results.npz', a=ts)
+    Rhis(pd.DataFrame({'a': ts}), cache=EvolCache(tmp_path)).evol(stat='min')
+    assert len(list(tmp_path.glob('*.npz'))) > 1
+
+    index_path = tmp_path / 'index.json'
+    index_path.write_text(index_path.read_text().replace(cache_module.ENGINE_VERSION, 'old'))
+    EvolCache(tmp_path)
+    assert [path.name for path in tmp_path.glob('*.npz')] == ['results.npz']
+
+    Rhis(pd.DataFrame({'a': ts}), cache=EvolCache(tmp_path)).evol(stat='min')
+    index_path.unlink()
+    EvolCache(tmp_path)
+    assert [path.name for path in tmp_path.glob('*.npz')] == ['results.npz']
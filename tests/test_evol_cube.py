@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rhis_ts.evol.methods import Curve
+from rhis_ts.evol.utils.cube import EvolCube
+
+KEYS = [('fo', 'R'), ('fo', 'H')]
+
+
+def make_cube() -> EvolCube:
+    """A cube of 2 columns over 4 positions, with one empty curve."""
+    cube = EvolCube(['a', 'b'], KEYS, pd.RangeIndex(4))
+    cube[('a', 'fo', 'R')] = Curve(1, np.array([.1, .2, .3]))
+    cube[('a', 'fo', 'H')] = Curve(2, np.array([.4, .5]))
+    cube[('b', 'fo', 'R')] = Curve(3, np.array([.6]))
+    return cube
+
+
+def test_evol_cube_append_empty_curves():
+    """
+    Test that an empty curve starts at its first appended p-value, and stays
+    empty while only NaN are appended to it.
+    """
+    cube = make_cube()
+    nan = np.nan
+    cube.append(pd.RangeIndex(4, 7), np.array([
+        [[.7, .8, .9], [1., 1., 1.]],
+        [[.1, .2, .3], [nan, nan, nan]],
+    ]))
+    assert cube.curve(('b', 'fo', 'H')) == (7, pytest.approx([]))
+
+    cube.append(pd.RangeIndex(7, 9), np.array([
+        [[.1, .2], [.3, .4]],
+        [[.5, .6], [nan, .7]],
+    ]))
+    assert list(cube.index) == list(range(9))
+    assert cube.curve(('a', 'fo', 'R')) == (1, pytest.approx([.1, .2, .3, .7, .8, .9, .1, .2]))
+    assert cube.curve(('b', 'fo', 'H')) == (8, pytest.approx([.7]))
+    assert np.allclose(cube[('b', 'fo', 'H')], [nan] * 8 + [.7], equal_nan=True)
+    assert np.allclose(cube.frame[('b', 'fo', 'R')], [nan] * 3 + [.6, .1, .2, .3, .5, .6], equal_nan=True)
+
+    # A curve that does not end at the last position (as a backward one) cannot be extended
+    cube[('a', 'fo', 'H')] = Curve(0, np.array([.1]))
+    with pytest.raises(ValueError, match='end at the last position'):
+        cube.append(pd.RangeIndex(9, 10), np.full((2, 2, 1), .5))
+
+
+def test_evol_cube_select_keys():
+    """
+    Test that selecting keys keeps the order of the cube, and copies the
+    curves, offsets and lengths of the selected ones.
+    """
+    cube = make_cube()
+    selected = cube.select_keys([('fo', 'H'), ('ba', 'R')])
+
+    assert selected.keys == [('fo', 'H')]
+    assert selected.curve(('a', 'fo', 'H')) == (2, pytest.approx([.4, .5]))
+    assert selected.curve(('b', 'fo', 'H')) == (0, pytest.approx([]))
+    pd.testing.assert_frame_equal(selected.frame, cube.frame[[('a', 'fo', 'H'), ('b', 'fo', 'H')]])
+
+    selected[('a', 'fo', 'H')] = Curve(0, np.zeros(4))
+    assert cube.curve(('a', 'fo', 'H')) == (2, pytest.approx([.4, .5]))
+
+
+def test_evol_cube_ensure_after_widening():
+    """
+    Test that adding columns and keys to a cube widened by append keeps its
+    curves and bookkeeping, and that the new curves are empty and can be
+    extended.
+    """
+    cube = make_cube()
+    cube.append(pd.RangeIndex(4, 5), np.full((2, 2, 1), .5))
+    width = cube.data.shape[2]
+    # Grown geometrically, beyond the longest curve
+    assert width > cube.lengths.max()
+
+    cube.ensure(['a', 'c'], [('fo', 'R'), ('fo', 'I')], np.float32)
+    assert cube.dtype == np.float32
+    assert cube.data.shape == (3, 3, width)
+    assert cube.cols == ['a', 'b', 'c']
+    assert cube.keys == [*KEYS, ('fo', 'I')]
+    assert cube.offsets.tolist() == [[1, 2, 0], [3, 4, 0], [0, 0, 0]]
+    assert cube.lengths.tolist() == [[4, 3, 0], [2, 1, 0], [0, 0, 0]]
+    assert cube.curve(('a', 'fo', 'H')) == (2, pytest.approx([.4, .5, .5]))
+    assert np.isnan(cube[('c', 'fo', 'I')]).all()
+
+    cube.append(pd.RangeIndex(5, 6), np.full((3, 3, 1), .25))
+    assert cube.curve(('c', 'fo', 'I')) == (5, pytest.approx([.25]))
+    assert cube.curve(('b', 'fo', 'R')) == (3, pytest.approx([.6, .5, .25]))
+    assert cube.frame.shape == (6, 9)
+
+
+def test_evol_cube_drop_before():
+    """Test that dropping the first positions shortens only the curves that start before them."""
+    cube = make_cube()
+    cube.drop_before(2)
+
+    assert cube.curve(('a', 'fo', 'R')) == (2, pytest.approx([.2, .3]))
+    assert cube.curve(('a', 'fo', 'H')) == (2, pytest.approx([.4, .5]))
+    assert cube.curve(('b', 'fo', 'R')) == (3, pytest.approx([.6]))
+    assert np.allclose(cube.frame[('a', 'fo', 'R')], [np.nan, np.nan, .2, .3], equal_nan=True)
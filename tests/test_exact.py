@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import numpy as np
+import scipy.stats as sts
+
+from rhis_ts.stats.hypothesis import (
+    mann_kendall,
+    mann_kendall_evol,
+    mann_whitney,
+    mann_whitney_evol,
+    wallismoore,
+    wallismoore_evol,
+)
+from rhis_ts.stats.utils import exact
+
+
+def test_exact_tables_match_builders():
+    """Test that the shipped tables are the ones built by the recursions."""
+    for name, build in exact.BUILDERS.items():
+        assert np.allclose(exact.load_table(name), build(), rtol=1e-6, atol=1e-12)
+
+
+def test_exact_p_values_against_scipy():
+    """
+    Test the exact Mann-Kendall and Mann-Whitney p-values of small series
+    without ties against scipy's exact Kendall tau and Mann-Whitney U.
+    """
+    rng = np.random.default_rng(12)
+    for n in (5, 8, 13, 40):
+        ts = rng.permutation(n).astype(float)
+        expected_mk = sts.kendalltau(np.arange(n), ts, method='exact').pvalue
+        assert np.isclose(mann_kendall(ts, exact='auto').p_value, round(expected_mk, 4))
+
+        half = (n + 1) // 2
+        expected_mw = sts.mannwhitneyu(ts[:half], ts[half:], method='exact').pvalue
+        assert np.isclose(mann_whitney(ts, exact='auto').p_value, round(expected_mw, 4))
+
+
+def test_exact_evol_matches_single_calls():
+    """
+    Test that the exact p-values of every prefix match the single calls, and
+    that the prefixes with ties or beyond the tables keep the normal
+    approximation.
+    """
+    rng = np.random.default_rng(13)
+    ts = np.concatenate([rng.permutation(30).astype(float), rng.integers(0, 5, 30).astype(float)])
+    sli_init = 5
+
+    evols = {
+        'S': mann_kendall_evol(ts, sli_init, exact='auto'),
+        'H': mann_whitney_evol(ts, sli_init, exact='auto'),
+        'R': wallismoore_evol(ts, sli_init, exact='auto').p_value,
+    }
+    for k, n in enumerate(range(sli_init, len(ts) + 1)):
+        prefix = ts[:n]
+        assert np.isclose(round(evols['S'][k], 4), mann_kendall(prefix, exact='auto').p_value)
+        assert np.isclose(round(evols['H'][k], 4), mann_whitney(prefix, exact='auto').p_value)
+        assert np.isclose(round(evols['R'][k], 4), wallismoore(prefix, exact='auto').p_value)
+
+    assert np.isclose(round(evols['S'][-1], 4), mann_kendall(ts).p_value)
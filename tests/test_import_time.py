@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+# Cumulative microseconds of 'import rhis_ts.stats', numpy included (about 0.12 s when written)
+IMPORT_BUDGET_US = 500_000
+HEAVY_MODULES = ('matplotlib', 'pandas', 'scipy', 'loguru')
+
+
+def test_stats_import_time():
+    """
+    Test that rhis_ts.stats is imported with NumPy only, within the budget,
+    from the output of 'python -X importtime'.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import rhis_ts.stats'],
+        capture_output=True, text=True, check=True)
+    rows = [
+        line.split('|') for line in result.stderr.splitlines()
+        if line.startswith('import time:') and 'cumulative' not in line
+        ]
+    cumulative = {name.strip(): int(cum) for _, cum, name in rows}
+
+    assert not [name for name in cumulative if name.split('.')[0] in HEAVY_MODULES]
+    assert cumulative['rhis_ts.stats'] <= IMPORT_BUDGET_US
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import numpy as np
 import scipy.stats as sts
 
-from src.rhis_ts.hypothesis_tests.mann_kendall import mann_kendall
+from rhis_ts.stats.hypothesis import mann_kendall, mann_kendall_evol, mann_kendall_window
+from rhis_ts.utils.data import slices_to_evol
 
 
 def test_mann_kendall():
@@ -20,9 +22,65 @@ def test_mann_kendall():
 
     expected_z = 3.1
     accepted_error = 0.02
-    result = mann_kendall(ts, 'greater')
+    result = mann_kendall(ts, alternative='greater')
     z = abs(sts.norm.ppf(result.p_value))
     error = abs(z - expected_z) / expected_z
 
     assert error <= accepted_error
     assert result.reject
+
+
+def test_mann_kendall_evol():
+    """
+    Test the incremental Mann-Kendall evolution against the test applied
+    to every slice, for series with and without ties.
+    """
+    rng = np.random.default_rng(42)
+    series = [
+        rng.normal(size=60),
+        np.round(rng.normal(size=60)),
+        np.append(np.ones(10), rng.integers(0, 3, 40)),
+    ]
+    sli_init = 5
+
+    for ts in series:
+        expected = [mann_kendall(sli).p_value for sli in slices_to_evol(ts, sli_init)]
+        result = mann_kendall_evol(ts, sli_init)
+
+        assert len(result) == len(ts) - sli_init + 1
+        assert np.allclose(np.round(result, 4), expected)
+
+
+def test_mann_kendall_mergesort_parity():
+    """
+    Test the default merge-sort Mann-Kendall against the pairwise reference
+    implementation.
+    """
+    rng = np.random.default_rng(7)
+    series = [
+        rng.normal(size=200),
+        rng.integers(0, 4, 150),
+        np.full(20, 3.5),
+        [1, 2],
+    ]
+
+    for ts in series:
+        result = mann_kendall(ts)
+        expected = mann_kendall(ts, method='pairwise')
+
+        assert result.statistic == expected.statistic
+        assert result.p_value == expected.p_value
+        assert result.reject == expected.reject
+
+
+def test_mann_kendall_window():
+    """
+    Test the sliding-window Mann-Kendall against the test applied to every
+    window, for series with and without ties.
+    """
+    rng = np.random.default_rng(11)
+    window = 20
+
+    for ts in [rng.normal(size=80), rng.integers(0, 3, 80)]:
+        expected = [mann_kendall(ts[i:i + window]).p_value for i in range(len(ts) - window + 1)]
+        assert np.allclose(np.round(mann_kendall_window(ts, window), 4), expected)
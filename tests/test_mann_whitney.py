@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import numpy as np
 
-from src.rhis_ts.hypothesis_tests.mann_whitney import mann_whitney
+from rhis_ts.stats.hypothesis import mann_whitney, mann_whitney_evol, mann_whitney_window
+from rhis_ts.utils.data import slices_to_evol
 
 
 def test_mann_whitney():
@@ -25,7 +26,7 @@ def test_mann_whitney():
     expected_stat = 23.5
     expected_p = 0.0246
 
-    result = mann_whitney(x, y, alternative='greater')
+    result = mann_whitney(x, y=y, alternative='greater')
 
     assert np.median(np.array(x)) == median_x
     assert np.median(np.array(y)) == median_y
@@ -33,3 +34,38 @@ def test_mann_whitney():
     assert result.p_value == expected_p
 
 
+def test_mann_whitney_evol():
+    """
+    Test the incremental half-split Mann-Whitney evolution against the test
+    applied to every slice, for series with ties and constant starts.
+    """
+    rng = np.random.default_rng(42)
+    series = [
+        rng.normal(size=61),
+        rng.integers(0, 4, 60),
+        np.append(np.full(10, 2.), rng.integers(0, 3, 40)),
+        np.full(15, 3.5),
+    ]
+    sli_init = 5
+
+    for ts in series:
+        for alternative in ['two-sided', 'greater']:
+            expected = [mann_whitney(sli, alternative=alternative).p_value for sli in slices_to_evol(ts, sli_init)]
+            result = mann_whitney_evol(ts, sli_init, alternative)
+
+            assert len(result) == len(ts) - sli_init + 1
+            assert np.allclose(np.round(result, 4), expected)
+
+
+def test_mann_whitney_window():
+    """
+    Test the sliding-window Mann-Whitney against the test applied to every
+    window, for odd and even windows and constant stretches.
+    """
+    rng = np.random.default_rng(11)
+    series = [rng.normal(size=80), np.append(np.full(30, 2.), rng.integers(0, 3, 50))]
+
+    for ts in series:
+        for window in [20, 21]:
+            expected = [mann_whitney(ts[i:i + window]).p_value for i in range(len(ts) - window + 1)]
+            assert np.allclose(np.round(mann_whitney_window(ts, window), 4), expected)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import numpy as np
+
+from rhis_ts.stats.utils.order_stats import ValueCounter
+
+
+def test_value_counter():
+    """
+    Test that the counts of a ValueCounter match the ones of a plain list
+    while values are added and removed, with buckets small enough to be split
+    and emptied many times.
+    """
+    rng = np.random.default_rng(0)
+    counter = ValueCounter(load=4)
+    values = []
+    for _ in range(2000):
+        if values and rng.random() < 0.35:  # noqa: PLR2004
+            value = values.pop(rng.integers(len(values)))
+            counter.add(value, -1)
+        else:
+            value = float(rng.integers(0, 30))
+            counter.add(value)
+            values.append(value)
+
+        query = float(rng.integers(-1, 31))
+        arr = np.array(values)
+        assert counter.total == len(values)
+        assert counter.count_less(query) == np.count_nonzero(arr < query)
+        assert counter.count_equal(query) == np.count_nonzero(arr == query)
+        assert counter.count_greater(query) == np.count_nonzero(arr > query)
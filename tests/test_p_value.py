@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import numpy as np
+import scipy.stats as sts
+
+from rhis_ts.stats.utils import p_value
+
+
+def test_p_values_normal():
+    """
+    Test the array p-value kernel against scipy, including extreme tails
+    where 1 - cdf(z) underflows to 0.
+    """
+    z = np.array([-3., -0.5, 0., 1.96, 10., 20., 30.])
+
+    result = p_value.p_values_normal(z)
+    expected = 2 * sts.norm.sf(np.abs(z))
+
+    assert np.allclose(result, expected, rtol=1e-12, atol=0)
+    assert np.all(result[-3:] > 0)
+    assert result[-2] > result[-1]
+    assert np.allclose(p_value.p_values_normal(z, 'less'), result / 2)
+    assert p_value.p_value_normal(-1.96) == p_value.p_values_normal(1.96, 'greater')
+    assert p_value.normal_sf(1.96).shape == ()
+
+
+def test_decision_normal_semantics():
+    alpha = 0.05
+    expected_p = 0.0574
+
+    decision = p_value.test_decision_normal(12., 10., 1.9, 'two-sided', alpha)
+    assert round(decision.p_value, 4) == expected_p
+    assert not decision.reject
+
+    decision = p_value.test_decision_normal(12., 10., 2.5, 'less', alpha)
+    assert decision.p_value < alpha
+    assert not decision.reject
+
+    decision = p_value.test_decision_normal(12., 10., 2.5, 'greater', alpha)
+    assert decision.reject
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import re
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from rhis_ts.evol.plot.decimate import alpha_crossings, decimate_idxs, minmax_idxs
+from rhis_ts.evol.rhis import Rhis
+
+
+def test_plot_headless(tmp_path):
+    """
+    Test that the headless modes write one file per column (also from a pool of
+    processes) or one PDF page per column, without leaving pyplot figures open.
+    """
+    rng = np.random.default_rng(8)
+    df = pd.DataFrame({'a': rng.normal(size=40), 'b': rng.normal(size=40)})
+    rhis = Rhis(df)
+    rhis.evol(stat='min')
+    rhis.add_repr_cols_to_df()
+    n_figures = len(plt.get_fignums())
+
+    rhis.plot(save_dir_path=f'{tmp_path}/', headless=True)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['rhis_evol_a.png', 'rhis_evol_b.png']
+
+    rhis.plot(save_dir_path=f'{tmp_path}/', save_format='svg', workers=2)
+    assert (tmp_path / 'rhis_evol_a.svg').exists()
+    assert (tmp_path / 'rhis_evol_b.svg').exists()
+
+    rhis.plot(pdf_path=str(tmp_path / 'all.pdf'))
+    assert len(re.findall(rb'/Type /Page[^s]', (tmp_path / 'all.pdf').read_bytes())) == len(rhis.evol_cube.cols)
+    assert len(plt.get_fignums()) == n_figures
+
+
+def test_decimate_idxs():
+    """
+    Test that the decimation keeps the extremes of each pixel column, every
+    crossing of alpha and the forced positions, and leaves short series whole.
+    """
+    rng = np.random.default_rng(12)
+    ps = np.append(np.full(9, np.nan), rng.uniform(size=100_000) ** 4)
+    bins = 640
+    keep = [20_000, 80_000]
+    crossings = alpha_crossings(ps, 0.05)
+
+    idxs = decimate_idxs(ps, bins, np.append(crossings, keep))
+    kept = np.zeros(len(ps), dtype=bool)
+    kept[idxs] = True
+    size = -(-len(ps) // bins)
+
+    assert len(idxs) <= 2 * bins + len(crossings) + len(keep) + 4
+    assert np.all(kept[crossings])
+    assert np.all(kept[keep])
+    assert kept[9]
+    assert kept[-1]
+    for start in range(0, len(ps), size):
+        block = ps[start:start + size]
+        if not np.all(np.isnan(block)):
+            assert kept[start + np.nanargmin(block)]
+            assert kept[start + np.nanargmax(block)]
+    assert np.array_equal(minmax_idxs(ps[:1000], bins), np.arange(1000))
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from rhis_ts.evol.rhis import Rhis
+from rhis_ts.stats.hypothesis import mann_whitney_evol
+from rhis_ts.utils.profiling import Profiler, active_profiler
+
+
+def test_rhis_evol_profile():
+    """
+    Test that the profile of the evolution has the stages of every hypothesis
+    of every column, and that the curves are the same as without it.
+    """
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({'a': rng.normal(size=60), 'b': rng.normal(size=60)})
+
+    expected = Rhis(df.copy()).evol(stat='min')
+    rhis = Rhis(df.copy())
+    evol_df = rhis.evol(stat='min', profile=True, workers=2)
+
+    assert np.allclose(evol_df.to_numpy(dtype=float), expected.to_numpy(dtype=float), equal_nan=True)
+    stages = {(row['column'], row['stage']) for row in rhis.profile_report}
+    for col in ('a', 'b'):
+        for hyp in ('R', 'H', 'I', 'S'):
+            assert (col, f'evol/{hyp}/p_values') in stages
+        assert (col, 'evol/H/rank') in stages
+        assert (col, 'assembly') in stages
+    assert (None, 'frame') in stages
+    assert all(row['calls'] > 0 and row['wall_s'] >= 0 and row['peak_bytes'] >= 0 for row in rhis.profile_report)
+    assert active_profiler() is None
+
+
+def test_profiler_inactive():
+    """Test that nothing is recorded outside of a Profiler and that the stages add up the calls."""
+    ts = np.random.default_rng(6).normal(size=40)
+    with Profiler(memory=False) as prof:
+        mann_whitney_evol(ts, 5)
+        mann_whitney_evol(ts, 5)
+    mann_whitney_evol(ts, 5)
+
+    report = {row['stage']: row for row in prof.report()}
+    assert report['p_values']['calls'] == 2  # noqa: PLR2004
+    assert report['rank']['calls'] == 2  # noqa: PLR2004
+    assert all(row['peak_bytes'] == 0 for row in report.values())
+    assert list(prof.to_frame().columns) == ['column', 'stage', 'calls', 'wall_s', 'peak_bytes']
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import numpy as np
+
+from rhis_ts.stats.utils.ranks import rank_ties, ranks_ties_corrected, to_ranks
+
+
+def test_rank_ties():
+    """
+    Test the sort-based ranking kernel on a series with two tie groups.
+    """
+    ts = [3.1, 1.2, 3.1, 0.5, 1.2, 1.2, 7.0]
+
+    result = rank_ties(ts)
+
+    assert np.array_equal(result.ranks, [5.5, 3, 5.5, 1, 3, 3, 7])
+    assert np.array_equal(result.groups, [2, 1, 2, 0, 1, 1, 3])
+    assert np.array_equal(result.ties_groups_count, [1, 3, 2, 1])
+    assert [index.tolist() for index in result.ties_indexes] == [[2, 3, 4], [5, 6]]
+
+    assert to_ranks(ts) == [5, 2, 6, 1, 3, 4, 7]
+    ties_data = ranks_ties_corrected(ts, ties_data=True)
+    assert ties_data['ties_indexes'] == [[2, 3, 4], [5, 6]]
+    assert ties_data['ties_count'] == len([1, 3, 2, 1])
+    assert ties_data['ties_groups_count'] == [1, 3, 2, 1]
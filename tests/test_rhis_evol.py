@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from loguru import logger
+
+from rhis_ts.evol.rhis import Rhis
+from rhis_ts.stats.hypothesis import mann_kendall
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+@pytest.mark.parametrize('stat', [None, 'min'])
+def test_rhis_evol_parallel(executor, stat):
+    """
+    Test that evaluating the columns concurrently gives the same evolution,
+    in the same column order, as evaluating them sequentially.
+    """
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        'a': rng.normal(size=120),
+        'b': np.round(rng.normal(size=120)),
+        'c': np.linspace(0, 1, 120) + rng.normal(scale=0.1, size=120),
+    })
+
+    expected = Rhis(df).evol(stat=stat)
+    result = Rhis(df).evol(stat=stat, workers=2, executor=executor)
+
+    assert list(result.columns) == list(expected.columns)
+    assert np.allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float), equal_nan=True)
+
+
+@pytest.mark.parametrize('exact', [False, 'auto'])
+@pytest.mark.parametrize('stat', [None, 'min'])
+def test_rhis_append(stat, exact):
+    """
+    Test that appending observations to a forward evolution gives the same
+    evolution and representative data as running it on the complete data,
+    also with exact p-values for the short slices and past the length where
+    slice_init grows.
+    """
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        'a': np.append(np.linspace(0, 3, 50), rng.normal(size=100)),
+        'b': rng.integers(0, 3, 150).astype(float),
+    })
+
+    expected = Rhis(df.copy())
+    expected.evol(stat=stat, backwards=False, exact=exact)
+
+    # Appended from 30 rows, so some appended slices are short enough for exact p-values
+    rhis = Rhis(df.iloc[:30].copy())
+    rhis.evol(stat=stat, backwards=False, exact=exact)
+    if stat is not None:
+        expected.add_repr_cols_to_df(backwards=False)
+        rhis.add_repr_cols_to_df(backwards=False)
+    assert rhis.append(df.iloc[30:31]) is None
+    assert rhis.append(df.iloc[31:120]) is None
+    assert rhis.append(df.iloc[120:]) is None
+
+    assert rhis.slice_init == expected.slice_init
+    result_df = rhis.evol_df_rhis if stat is None else rhis.evol_df
+    expected_df = expected.evol_df_rhis if stat is None else expected.evol_df
+    assert list(result_df.columns) == list(expected_df.columns)
+    assert np.allclose(result_df.to_numpy(dtype=float), expected_df.to_numpy(dtype=float), equal_nan=True)
+    assert np.allclose(
+        rhis.orig_df.to_numpy(dtype=float), expected.orig_df.to_numpy(dtype=float), equal_nan=True)
+
+
+def test_rhis_append_after_backward_repr():
+    """
+    Test that appending after a backward add_repr_cols_to_df drops the backward
+    representative data, instead of moving it as a forward one, and keeps the
+    forward representative data in step with a new evolution.
+    """
+    rng = np.random.default_rng(8)
+    df = pd.DataFrame({
+        'a': np.append(np.linspace(0, 3, 40), rng.normal(size=40)),
+        'b': rng.normal(size=80),
+    })
+
+    rhis = Rhis(df.iloc[:60].copy())
+    rhis.evol(stat='mean', direction='both')
+    rhis.add_repr_cols_to_df(backwards=True)
+    assert rhis.append(df.iloc[60:]) is None
+
+    assert rhis.repr_spans == {}
+    assert list(rhis.orig_df.columns) == ['a', 'b']
+    assert list(rhis.evol_df.columns) == [('a', 'fo'), ('b', 'fo')]
+
+    rhis = Rhis(df.iloc[:60].copy())
+    rhis.evol(stat='mean', direction='both')
+    rhis.find_repr(cols=['a'], direction='ba', stat='mean')
+    rhis.find_repr(cols=['b'], direction='fo', stat='mean')
+    assert rhis.append(df.iloc[60:]) is None
+
+    expected = Rhis(df.copy())
+    expected.evol(stat='mean', backwards=False)
+    expected.add_repr_cols_to_df(backwards=False)
+    assert rhis.repr_spans == {'b': expected.repr_spans['b']}
+    assert rhis.repr_directions == {'b': 'fo'}
+    assert np.allclose(rhis.orig_df['b_repr'], expected.orig_df['b_repr'], equal_nan=True)
+    assert 'a_repr' not in rhis.orig_df.columns
+
+
+@pytest.mark.parametrize('stat', [None, 'mean'])
+def test_rhis_evol_both(stat):
+    """
+    Test that the evolution in both directions gives the same columns as
+    running the backward and the forward evolution separately.
+    """
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({'a': rng.normal(size=80), 'b': rng.integers(0, 4, 80).astype(float)})
+
+    ba = Rhis(df).evol(stat=stat, backwards=True)
+    fo = Rhis(df).evol(stat=stat, backwards=False)
+    rhis = Rhis(df)
+    both = rhis.evol(stat=stat, direction='both')
+
+    for col in ba.columns:
+        assert np.allclose(both[col].to_numpy(dtype=float), ba[col].to_numpy(dtype=float), equal_nan=True)
+    for col in fo.columns:
+        assert np.allclose(both[col].to_numpy(dtype=float), fo[col].to_numpy(dtype=float), equal_nan=True)
+    assert len(both.columns) == len(ba.columns) + len(fo.columns)
+
+    if stat is not None:
+        rhis.add_repr_cols_to_df(backwards=False)
+        assert 'a_repr' in rhis.orig_df.columns
+
+
+def test_rhis_evol_window():
+    """
+    Test that the sliding window mode places the p-values of each window at
+    its last element.
+    """
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({'a': rng.normal(size=60)})
+    window = 15
+
+    rhis = Rhis(df)
+    result = rhis.evol(stat=None, window=window)
+
+    assert rhis.direction == 'wi'
+    ps = result[('a', 'wi', 'S')].to_numpy(dtype=float)
+    assert np.all(np.isnan(ps[:window - 1]))
+    assert round(ps[-1], 4) == mann_kendall(df['a'].to_numpy()[-window:]).p_value
+    assert rhis.evol(window=len(df) + 1) is None
+
+
+@pytest.mark.parametrize('stat', ['min', None])
+def test_rhis_from_long_frame(stat):
+    """
+    Test that the evolution of a long table matches, for every group and
+    parameter, the evolution of the group's wide dataframe.
+    """
+    rng = np.random.default_rng(11)
+    frames = []
+    for station, n in (('IG5', 40), ('IG1', 25)):
+        dates = pd.date_range('2000-01-01', periods=n, freq='D')
+        frames.append(pd.DataFrame({
+            'PONTO': station, 'DATA': dates, 'NT': rng.normal(size=n), 'T': rng.normal(size=n)}))
+    long_df = pd.concat(frames).sample(frac=1, random_state=0)
+    long_df.loc[long_df.index[:3], 'T'] = np.nan
+
+    result = Rhis.from_long_frame(long_df, 'PONTO', 'DATA', ['NT', 'T'], stat=stat, workers=2, executor='thread')
+
+    assert result.index.names == ['PONTO', 'parameter', 'DATA']
+    for (station, param), group in result.groupby(level=['PONTO', 'parameter']):
+        wide = long_df.loc[long_df['PONTO'] == station, ['DATA', param]].dropna().set_index('DATA').sort_index()
+        expected = Rhis(wide).evol(stat=stat)
+        assert len(group) == len(wide)
+        for col in expected.columns:
+            got = group[col[1:] if stat is None else col[1]].to_numpy(dtype=float)
+            assert np.allclose(got, expected[col].to_numpy(dtype=float), equal_nan=True)
+
+
+def test_rhis_from_long_frame_short_group():
+    """
+    Test that a group shorter than its first slice gets NaN p-values and a
+    warning, and does not stop the evolution of the other groups.
+    """
+    rng = np.random.default_rng(13)
+    long_df = pd.DataFrame({
+        'PONTO': ['IG5'] * 30 + ['IG9'] * 3,
+        'DATA': np.arange(33),
+        'NT': rng.normal(size=33),
+        })
+    messages = []
+    sink = logger.add(messages.append, level='WARNING')
+    try:
+        result = Rhis.from_long_frame(long_df, 'PONTO', 'DATA', ['NT'], stat='min')
+    finally:
+        logger.remove(sink)
+
+    expected = Rhis(long_df.loc[long_df['PONTO'] == 'IG5', ['NT']]).evol(stat='min')
+    assert np.allclose(
+        result.loc['IG5', 'ba'].to_numpy(dtype=float), expected[('NT', 'ba')].to_numpy(dtype=float), equal_nan=True)
+    assert result.loc['IG9', 'ba'].isna().all()
+    assert len(result.loc['IG9']) == 3  # noqa: PLR2004
+    assert any("'IG9'" in message for message in messages)
+
+
+def test_rhis_evol_cube():
+    """
+    Test that the evolution is stored in one (columns x curves x time) array,
+    in the requested dtype, and that the dataframe is built from it.
+    """
+    rng = np.random.default_rng(9)
+    df = pd.DataFrame({'a': rng.normal(size=50), 'b': rng.normal(size=50)})
+
+    expected = Rhis(df).evol(stat=None, direction='both')
+    rhis = Rhis(df)
+    result = rhis.evol(stat=None, direction='both', dtype='float32')
+
+    # The curves are stored without the padding of the first slice (slice_init - 1 positions)
+    assert rhis.evol_cube_rhis.data.shape == (2, 8, 46)
+    assert rhis.evol_cube_rhis.dtype == np.float32
+    assert list(result.columns) == list(expected.columns)
+    assert np.allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float), equal_nan=True, atol=1e-6)
+    assert rhis.evol_df_rhis is rhis.evol_df_rhis
+
+
+@pytest.mark.parametrize('exact', [False, 'auto'])
+@pytest.mark.parametrize('backwards', [True, False])
+def test_rhis_find_repr(backwards, exact):
+    """
+    Test that the lazy search writes the same representative data as the
+    complete evolution followed by add_repr_cols_to_df, also with exact
+    p-values for the short slices.
+    """
+    rng = np.random.default_rng(21)
+    df = pd.DataFrame({
+        'a': np.append(np.linspace(0, 4, 60) + rng.normal(scale=0.3, size=60), rng.normal(size=60)),
+        'b': rng.normal(size=120),
+        'c': rng.integers(0, 3, 120).astype(float),
+    })
+    direction = 'ba' if backwards else 'fo'
+
+    expected = Rhis(df.copy())
+    expected.evol(stat='mean', backwards=backwards, exact=exact)
+    expected.add_repr_cols_to_df(backwards=backwards)
+    rhis = Rhis(df.copy())
+    result = rhis.find_repr(alpha=0.05, direction=direction, stat='mean', exact=exact)
+
+    assert rhis.evol_df is None
+    assert rhis.repr_spans == expected.repr_spans
+    assert np.allclose(result.to_numpy(dtype=float), expected.orig_df.to_numpy(dtype=float), equal_nan=True)
+
+
+def test_rhis_evol_not_rounded():
+    """
+    Test that the p-values of the strongly rejected slices are not rounded to
+    zero, so the minimum is still taken among distinct p-values.
+    """
+    ts = np.linspace(0, 1, 200) + np.random.default_rng(1).normal(scale=0.01, size=200)
+    df = pd.DataFrame({'a': ts})
+
+    curves = Rhis(df).evol(backwards=False).iloc[-1].to_numpy(dtype=float)
+    result = Rhis(df).evol(stat='min', backwards=False).iloc[-1, 0]
+
+    rejected = curves[curves < 5e-5]  # noqa: PLR2004
+    assert len(rejected) == 3  # noqa: PLR2004
+    assert np.all(rejected > 0)
+    assert len(set(rejected)) == len(rejected)
+    assert result == curves.min()
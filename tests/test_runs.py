@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from src.rhis_ts.hypothesis_tests.runs import runs_test, wallismoore
+from itertools import groupby
+
+import numpy as np
+
+from rhis_ts.stats.hypothesis import runs_test, wallismoore, wallismoore_evol, wallismoore_window
+from rhis_ts.utils.data import slices_to_evol
 
 
 def test_randomness():
@@ -39,3 +44,61 @@ def test_randomness():
         assert stat_err <= accepted_stat_err
         assert p_err <= accepted_p_err
         assert expected_reject[i] == tests[i].reject
+
+
+def test_runs_test_runs():
+    """
+    Test that the runs around the median are counted as the groups of equal
+    signs, skipping the values equal to the median.
+    """
+    rng = np.random.default_rng(5)
+    series = [rng.normal(size=101), rng.integers(0, 4, 80)]
+
+    for ts in series:
+        median = np.median(ts)
+        signs = [value > median for value in ts if value != median]
+        result = runs_test(ts)
+
+        assert result.statistic == len(list(groupby(signs)))
+        assert 0. <= result.p_value <= 1.
+
+
+def test_wallismoore_evol():
+    """
+    Test the cumulative Wallis-Moore evolution against the test applied
+    to every slice, for series with ties and constant starts.
+    """
+    rng = np.random.default_rng(42)
+    series = [
+        rng.normal(size=60),
+        rng.integers(0, 3, 60),
+        np.append(np.full(10, 2.), rng.integers(0, 3, 40)),
+        np.full(15, 3.5),
+    ]
+    sli_init = 5
+
+    for ts in series:
+        for alternative in ['two-sided', 'less']:
+            expected = [wallismoore(sli, alternative=alternative) for sli in slices_to_evol(ts, sli_init)]
+            result = wallismoore_evol(ts, sli_init, alternative)
+
+            assert len(result.p_value) == len(ts) - sli_init + 1
+            assert np.allclose(result.statistic, [res.statistic for res in expected])
+            assert np.allclose(np.round(result.p_value, 4), [res.p_value for res in expected])
+
+
+def test_wallismoore_window():
+    """
+    Test the sliding-window Wallis-Moore against the test applied to every
+    window, including constant stretches.
+    """
+    rng = np.random.default_rng(11)
+    series = [rng.normal(size=80), np.append(np.full(30, 2.), rng.integers(0, 3, 50))]
+    window = 20
+
+    for ts in series:
+        expected = [wallismoore(ts[i:i + window]) for i in range(len(ts) - window + 1)]
+        result = wallismoore_window(ts, window)
+
+        assert np.allclose(result.statistic, [res.statistic for res in expected])
+        assert np.allclose(np.round(result.p_value, 4), [res.p_value for res in expected])
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from rhis_ts.hypothesis_tests.wald_wolfowitz import wald_wolfowitz
+import numpy as np
+
+from rhis_ts.stats.hypothesis import wald_wolfowitz, wald_wolfowitz_evol, wald_wolfowitz_window
+from rhis_ts.utils.data import slices_to_evol
 
 
 def test_wald_wolfowitz():
@@ -39,3 +42,92 @@ def test_wald_wolfowitz():
     assert stat_err <= accepted_stat_err
     assert p_err <= accepted_p_err
     assert expected_reject == result.reject
+
+
+def test_wald_wolfowitz_evol():
+    """
+    Test the prefix-sum Wald-Wolfowitz evolution against the test applied
+    to every slice, including constant starts and near-zero variance.
+    """
+    rng = np.random.default_rng(42)
+    series = [
+        rng.normal(100, 20, size=60),
+        np.round(rng.normal(size=60)),
+        np.append(np.full(10, 2.), rng.integers(0, 3, 40)),
+        np.full(15, 3.5),
+    ]
+    sli_init = 5
+
+    for ts in series:
+        expected = [wald_wolfowitz(sli).p_value for sli in slices_to_evol(ts, sli_init)]
+        result = wald_wolfowitz_evol(ts, sli_init)
+
+        assert len(result) == len(ts) - sli_init + 1
+        assert np.allclose(np.round(result, 4), expected)
+
+    ts = series[1]
+    expected = [wald_wolfowitz(sli, on_ranks=True).p_value for sli in slices_to_evol(ts, sli_init)]
+    assert np.allclose(wald_wolfowitz_evol(ts, sli_init, on_ranks=True), expected)
+
+
+def test_wald_wolfowitz_window():
+    """
+    Test the sliding-window Wald-Wolfowitz against the test applied to every
+    window, including constant stretches.
+    """
+    rng = np.random.default_rng(11)
+    series = [rng.normal(100, 20, size=200), np.append(np.full(30, 2.), rng.integers(0, 3, 50))]
+    window = 20
+
+    for ts in series:
+        expected = [wald_wolfowitz(ts[i:i + window]).p_value for i in range(len(ts) - window + 1)]
+        assert np.allclose(np.round(wald_wolfowitz_window(ts, window), 4), expected)
+
+
+def test_wald_wolfowitz_evol_adversarial():
+    """
+    Test the Wald-Wolfowitz evolution against the test applied to every prefix
+    of series whose prefix sums lose digits when shifted by the first value:
+    an outlying first value, a large level followed by noise, a spike, a
+    level shift and a steep trend. The expected p-values are rounded, so the
+    curve only has to be within half of their last digit (plus the float error).
+    """
+    rng = np.random.default_rng(13)
+    spike = rng.normal(size=1500)
+    spike[700] = 1e4
+    series = [
+        np.append(1e6, rng.normal(size=1500)),
+        np.append(1e5 + rng.normal(size=50), rng.normal(size=1500)),
+        spike,
+        np.concatenate([rng.normal(size=400), 1e5 + rng.normal(size=400), rng.normal(size=400)]),
+        np.linspace(0, 1e6, 1500) + rng.normal(size=1500),
+    ]
+
+    for ts in series:
+        result = wald_wolfowitz_evol(ts, 5)
+        expected = [wald_wolfowitz(ts[:k]).p_value for k in range(5, len(ts) + 1)]
+        assert not np.any(np.isnan(result))
+        assert np.allclose(result, expected, rtol=0, atol=6e-5)
+
+
+def test_wald_wolfowitz_window_adversarial():
+    """
+    Test the sliding-window Wald-Wolfowitz against the test applied to every
+    window of series whose sums lose digits when taken across the whole
+    series: a large level followed by noise, a spike and a steep trend.
+    """
+    rng = np.random.default_rng(12)
+    spike = rng.normal(size=1500)
+    spike[700] = 1e4
+    series = [
+        (np.append(np.full(50, 1e5), rng.normal(size=1500)), 120),
+        (spike, 120),
+        (np.concatenate([rng.normal(size=400), 1e5 + rng.normal(size=400), rng.normal(size=400)]), 50),
+        (np.linspace(0, 1e6, 1500) + rng.normal(size=1500), 120),
+    ]
+
+    for ts, window in series:
+        result = wald_wolfowitz_window(ts, window)
+        expected = [wald_wolfowitz(ts[i:i + window]).p_value for i in range(len(ts) - window + 1)]
+        assert not np.any(np.isnan(result))
+        assert np.allclose(np.round(result, 4), expected)